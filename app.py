@@ -1,29 +1,47 @@
 """
 MalgeunTube - 광고 없는 깨끗한 유튜브 경험
 """
+import time
+
+# 임포트 시작 시각 - create_app()에서 준비 완료까지 걸린 시간 측정에 사용
+IMPORT_STARTED_AT = time.perf_counter()
+
 import os
+import sys
+import copy
 import json
 import random
 import uuid
 import glob
 import re
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import zipfile
+import cProfile
+import zlib
+import gzip
+import hashlib
+import urllib.error
+import urllib.parse
+import urllib.request
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime, timedelta
-from functools import lru_cache, wraps
-from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial, wraps
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, session, send_file, after_this_request
+from flask import Flask, Response, render_template, stream_template, request, jsonify, redirect, url_for, session, send_file, after_this_request, g
+from flask import before_render_template, has_request_context, template_rendered
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
-import yt_dlp
 
 # 환경변수 로드
 load_dotenv()
 
 # Flask 확장 모듈 임포트
 try:
-    from flask_sqlalchemy import SQLAlchemy
     from flask_caching import Cache
     from flask_limiter import Limiter
     from flask_limiter.util import get_remote_address
@@ -31,23 +49,105 @@ try:
 except ImportError:
     EXTENSIONS_AVAILABLE = False
 
+# sqlite:// Rate Limit 저장소 등록 (워커 프로세스 간 공유)
+import ratelimit_storage  # noqa: F401
+
+# 메모리 진단 (/admin/memory)
+import diagnostics
+
+# Prometheus 메트릭 (/metrics)
+import metrics
+from metrics import observe_extraction
+
+# 추출기 백엔드 (yt-dlp / 픽스처 재생 / 기록)
+from extractors import ExtractorError, canonical_video_id, canonical_video_url, classify_error, create_extractor
+
+# 추출 결과 캐시 (성공/실패를 나눠 저장, 실패는 오류 종류별 짧은 TTL)
+from result_cache import CachedFailure, ResultCache
+
+# 선택적 Brotli 압축
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # 설정 로드
 from config import get_config
 
-# Flask 앱 초기화
+# Flask 앱 생성 - 로깅, 확장, 디렉토리, 백그라운드 작업 초기화는 create_app()에서 수행
 app = Flask(__name__)
 config_obj = get_config()
 app.config.from_object(config_obj)
-config_obj.init_app(app)
 
 # 시크릿 키는 config에서 이미 설정됨 - 별도 설정 불필요
 
+# 시작 단계별 소요 시간 (초)
+startup_timings = {}
+
 # ============== 로깅 설정 ==============
 
+# 파일/콘솔 출력을 맡는 백그라운드 스레드 (setup_logging에서 시작)
+log_listener = None
+
+class RequestContextFilter(logging.Filter):
+    """로그 레코드에 요청 ID와 프로필 ID 추가 (요청 밖에서는 '-')"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id', '-')
+            record.profile_id = session.get('profile_id') or '-'
+        else:
+            record.request_id = record.profile_id = '-'
+        return True
+
+class LogQueueHandler(QueueHandler):
+    """요청 스레드에서는 메시지만 만들어 큐에 넣음 - 포맷, 파일 쓰기, 로테이션은 백그라운드 스레드에서"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # 트레이스백 객체를 다른 스레드로 넘기지 않도록 문자열로 변환
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class JsonLogFormatter(logging.Formatter):
+    """JSON Lines 로그 형식 (LOG_FORMAT = 'json')"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'profile_id': getattr(record, 'profile_id', '-'),
+            'thread': record.threadName,
+        }
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+def stop_logging():
+    """남은 로그를 모두 쓰고 출력 스레드 종료"""
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        log_listener = None
+
+atexit.register(stop_logging)
+
 def setup_logging():
-    """애플리케이션 로깅 설정"""
+    """애플리케이션 로깅 설정 (app.logger는 큐에만 넣고 출력은 백그라운드 스레드가 처리)"""
+    global log_listener
+    stop_logging()
+
     log_level = getattr(logging, app.config.get('LOG_LEVEL', 'INFO'))
     log_dir = app.config.get('LOGS_DIR', 'logs')
+    json_format = app.config.get('LOG_FORMAT', 'text') == 'json'
     
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
@@ -60,21 +160,26 @@ def setup_logging():
         encoding='utf-8'
     )
     file_handler.setLevel(log_level)
-    file_handler.setFormatter(logging.Formatter(
+    file_handler.setFormatter(JsonLogFormatter() if json_format else logging.Formatter(
         '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
     ))
     
     # 콘솔 핸들러
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
-    console_handler.setFormatter(logging.Formatter(
+    console_handler.setFormatter(JsonLogFormatter() if json_format else logging.Formatter(
         '%(asctime)s [%(levelname)s] %(message)s'
     ))
     
     # 앱 로거 설정
+    queue_handler = LogQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(RequestContextFilter())
+    log_listener = QueueListener(queue_handler.queue, file_handler, console_handler,
+                                 respect_handler_level=True)
+    log_listener.start()
+
     app.logger.handlers.clear()
-    app.logger.addHandler(file_handler)
-    app.logger.addHandler(console_handler)
+    app.logger.addHandler(queue_handler)
     app.logger.setLevel(log_level)
 
     app.logger.info("=" * 60)
@@ -85,59 +190,258 @@ def setup_logging():
     app.logger.info("  비밀번호: Tube2024!@Secure")
     app.logger.info("=" * 60)
 
-setup_logging()
+@app.before_request
+def assign_request_id():
+    """요청 ID (프록시가 준 X-Request-ID가 있으면 그대로 사용) - 로그와 응답 헤더에 포함"""
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex[:16]
+
+@app.after_request
+def add_request_id_header(response):
+    if 'request_id' in g:
+        response.headers.setdefault('X-Request-ID', g.request_id)
+    return response
 
 # ============== Flask 확장 초기화 ==============
 
-# 캐싱 설정
-cache = Cache(app, config={
-    'CACHE_TYPE': app.config.get('CACHE_TYPE', 'SimpleCache'),
-    'CACHE_DEFAULT_TIMEOUT': app.config.get('CACHE_DEFAULT_TIMEOUT', 300)
-})
-
-# Rate Limiting 설정
-if app.config.get('RATELIMIT_ENABLED', True):
-    limiter = Limiter(
-        key_func=get_remote_address,
-        app=app,
-        default_limits=[app.config.get('RATELIMIT_DEFAULT', '200 per day')],
-        storage_uri=app.config.get('RATELIMIT_STORAGE_URL', 'memory://'),
-        strategy=app.config.get('RATELIMIT_STRATEGY', 'fixed-window')
-    )
-else:
-    # Rate limiting 비활성화 시 더미 limiter
-    class DummyLimiter:
-        def limit(self, limit_value):
-            def decorator(f):
-                return f
-            return decorator
-    limiter = DummyLimiter()
+# 확장 객체는 데코레이터에서 쓰이므로 먼저 만들고, 앱 연결은 create_app()에서 수행
+cache = Cache()
+limiter = Limiter(key_func=get_remote_address)
+result_cache = ResultCache(cache, app.config)
+
+def init_extensions():
+    """캐시와 Rate Limiting을 앱에 연결"""
+    cache.init_app(app, config={
+        'CACHE_TYPE': app.config.get('CACHE_TYPE', 'SimpleCache'),
+        'CACHE_DEFAULT_TIMEOUT': app.config.get('CACHE_DEFAULT_TIMEOUT', 300)
+    })
+    # 다운로드/선반 백그라운드 스레드는 앱 컨텍스트 없이 캐시를 사용
+    cache.app = app
+
+    # RATELIMIT_ENABLED가 False면 limiter가 제한 검사를 건너뜀
+    app.config.setdefault('RATELIMIT_STORAGE_URI', app.config.get('RATELIMIT_STORAGE_URL', 'memory://'))
+    limiter.init_app(app)
 
 # ============== 디렉토리 및 파일 설정 ==============
 
-DATA_DIR = app.config.get('DATA_DIR')
-DOWNLOAD_DIR = app.config.get('DOWNLOAD_DIR')
-UPLOAD_FOLDER = app.config.get('UPLOAD_FOLDER')
-ALLOWED_EXTENSIONS = app.config.get('ALLOWED_EXTENSIONS', {'png', 'jpg', 'jpeg', 'gif', 'webp'})
+def configure_storage_paths():
+    """설정에서 데이터/다운로드/업로드 경로 읽기 (create_app()에서 설정을 바꾸면 다시 호출)"""
+    global DATA_DIR, DOWNLOAD_DIR, UPLOAD_FOLDER, ALLOWED_EXTENSIONS
+    global HISTORY_FILE, CHANNELS_FILE, PLAYLISTS_FILE, PROFILES_FILE
+
+    DATA_DIR = app.config.get('DATA_DIR')
+    DOWNLOAD_DIR = app.config.get('DOWNLOAD_DIR')
+    UPLOAD_FOLDER = app.config.get('UPLOAD_FOLDER')
+    ALLOWED_EXTENSIONS = app.config.get('ALLOWED_EXTENSIONS', {'png', 'jpg', 'jpeg', 'gif', 'webp'})
+
+    HISTORY_FILE = os.path.join(DATA_DIR, 'history.json')
+    CHANNELS_FILE = os.path.join(DATA_DIR, 'channels.json')
+    PLAYLISTS_FILE = os.path.join(DATA_DIR, 'playlists.json')
+    PROFILES_FILE = os.path.join(DATA_DIR, 'profiles.json')
 
-HISTORY_FILE = os.path.join(DATA_DIR, 'history.json')
-CHANNELS_FILE = os.path.join(DATA_DIR, 'channels.json')
-PLAYLISTS_FILE = os.path.join(DATA_DIR, 'playlists.json')
-PROFILES_FILE = os.path.join(DATA_DIR, 'profiles.json')
+    app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+configure_storage_paths()
 
-# 필요한 디렉토리 생성
-for directory in [DATA_DIR, DOWNLOAD_DIR, UPLOAD_FOLDER]:
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+def ensure_directories():
+    """필요한 디렉토리 생성"""
+    for directory in [DATA_DIR, DOWNLOAD_DIR, UPLOAD_FOLDER]:
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+# ============== yt-dlp 지연 로딩 ==============
+
+def load_yt_dlp():
+    """yt-dlp는 수백 개의 extractor 모듈을 불러오므로 처음 필요할 때 임포트"""
+    already_loaded = 'yt_dlp' in sys.modules
+    started = time.perf_counter()
+    import yt_dlp  # 다른 스레드가 임포트 중이면 끝날 때까지 대기
+    if not already_loaded:
+        startup_timings.setdefault('yt_dlp_import', time.perf_counter() - started)
+        app.logger.info("yt-dlp loaded in %.0fms", startup_timings['yt_dlp_import'] * 1000)
+    return yt_dlp
+
+def configure_extractor():
+    """EXTRACTOR_BACKEND 설정에 맞는 추출기 선택 (create_app에서 설정이 바뀌면 다시 호출)"""
+    global extractor
+    extractor = create_extractor(app.config, load_yt_dlp)
+
+configure_extractor()
 
 # ============== 다운로드 관리 ==============
 
 # 다운로드 진행률 및 작업 추적
 download_progress = {}
-download_tasks = {}  # {download_id: Future}
-executor = ThreadPoolExecutor(max_workers=3)  # 최대 3개 동시 다운로드
+download_tasks = {}  # {download_id: Future} - 현재 단계의 Future
+# 작업이 끝날 때(완료/실패/취소) 기다리는 쪽(일괄 다운로드 ZIP 스트림)을 깨움
+download_finished = threading.Condition()
+
+# 다운로드 파이프라인: 네트워크 전송(I/O)과 ffmpeg 후처리(CPU)를 별도 풀에서 실행
+# 단계별 풀과 대역폭 분배는 configure_download_pipeline()에서 설정으로 만듦
+pipeline_lock = threading.Lock()
+pipeline_stages = {}
+
+def publish_stage_metrics(stage_name):
+    """단계별 대기/실행 수를 메트릭 게이지에 반영 (pipeline_lock 안에서 호출)"""
+    stage = pipeline_stages[stage_name]
+    metrics.DOWNLOAD_STAGE_QUEUED.labels(stage_name).set(stage['queued'])
+    metrics.DOWNLOAD_STAGE_ACTIVE.labels(stage_name).set(stage['active'])
+
+def submit_to_stage(stage_name, fn, *args):
+    """파이프라인 단계의 풀에 작업 제출 (대기/실행 수 추적)"""
+    stage = pipeline_stages[stage_name]
+
+    def run_stage():
+        with pipeline_lock:
+            stage['queued'] -= 1
+            stage['active'] += 1
+            publish_stage_metrics(stage_name)
+        try:
+            return fn(*args)
+        finally:
+            with pipeline_lock:
+                stage['active'] -= 1
+                publish_stage_metrics(stage_name)
+
+    def on_done(future):
+        # 실행 전에 취소된 작업은 대기열에서만 빠짐
+        if future.cancelled():
+            with pipeline_lock:
+                stage['queued'] -= 1
+                publish_stage_metrics(stage_name)
+
+    with pipeline_lock:
+        stage['queued'] += 1
+        publish_stage_metrics(stage_name)
+    future = stage['executor'].submit(run_stage)
+    future.add_done_callback(on_done)
+    return future
+
+class BandwidthBudget:
+    """노드 전체 다운로드 대역폭을 활성 작업 간에 max-min 공정 분배
+
+    작업마다 최근 구간의 실제 속도를 재고, 몫보다 느린 작업은 측정 속도(+여유)만큼만 배정한 뒤
+    남는 대역폭을 나머지 작업에 나눕니다. yt-dlp 진행률 훅에서 배정량을 초과한
+    다운로드 스레드를 잠시 멈추게 합니다.
+    """
+
+    # 속도 측정 구간 (초) - 구간이 끝날 때마다 측정 속도와 배정량을 갱신
+    RATE_WINDOW = 2.0
+    # 느린 작업에 측정 속도보다 더 주는 비율 - 빨라질 여지를 남겨 구간마다 최대 이만큼 늘어남
+    RATE_HEADROOM = 1.25
+
+    def __init__(self, limit):
+        self.limit = limit or 0
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def allocate(self, job_id, now=None):
+        """작업을 분배 대상에 추가 - 측정 전인 작업은 공평한 몫을 모두 쓸 수 있다고 봄"""
+        with self._lock:
+            self._jobs[job_id] = {'files': {}, 'rate': None,
+                                  'window_start': time.monotonic() if now is None else now, 'window_bytes': 0}
+
+    def release(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def allocations(self):
+        """{작업 ID: 허용 속도(bytes/s)} (제한이 없으면 빈 dict)"""
+        with self._lock:
+            return self._allocations()
+
+    def _allocations(self):
+        # 느린 작업부터 min(남은 몫, 측정 속도 x 여유)을 배정 (lock 안에서 호출)
+        if not self.limit or not self._jobs:
+            return {}
+        demands = sorted(
+            ((state['rate'] * self.RATE_HEADROOM if state['rate'] is not None else float('inf'), job_id)
+             for job_id, state in self._jobs.items()),
+            key=lambda item: item[0]
+        )
+        remaining = self.limit
+        allocations = {}
+        for index, (demand, job_id) in enumerate(demands):
+            share = min(remaining / (len(demands) - index), demand)
+            allocations[job_id] = share
+            remaining -= share
+        return allocations
+
+    def delay(self, job_id, filename, downloaded_bytes, now=None):
+        """진행률을 기록하고, 작업이 배정량을 넘었으면 기다려야 할 시간(초) 반환"""
+        if not self.limit:
+            return 0
+        with self._lock:
+            state = self._jobs.get(job_id)
+            if state is None:
+                return 0
+            last = state['files'].get(filename, 0)
+            state['files'][filename] = max(last, downloaded_bytes)
+            state['window_bytes'] += max(0, downloaded_bytes - last)
+            now = time.monotonic() if now is None else now
+            elapsed = now - state['window_start']
+            if elapsed >= self.RATE_WINDOW:
+                # 구간이 끝나면 측정 속도를 갱신하고 새 구간 시작
+                state['rate'] = state['window_bytes'] / elapsed
+                state['window_start'] = now
+                state['window_bytes'] = 0
+                return 0
+            share = self._allocations().get(job_id)
+            if not share:
+                return 0
+            return max(0, state['window_bytes'] / share - elapsed)
+
+    def throttle(self, job_id, filename, downloaded_bytes):
+        """작업이 배정량을 넘었으면 호출한 다운로드 스레드를 재움"""
+        sleep_time = self.delay(job_id, filename, downloaded_bytes)
+        if sleep_time > 0:
+            # 배정량 변경에 빨리 반응하도록 한 번에 최대 1초만 대기
+            time.sleep(min(sleep_time, 1.0))
+
+    def snapshot(self):
+        with self._lock:
+            allocations = self._allocations()
+            return {
+                'limit': self.limit or None,
+                'active_jobs': len(self._jobs),
+                'per_job': {job_id: int(share) for job_id, share in allocations.items()} or None,
+            }
+
+def configure_download_pipeline():
+    """단계별 풀과 대역폭 분배를 설정으로 생성 (create_app에서 설정이 바뀌면 다시 호출)
+
+    아직 작업을 받지 않은 풀은 스레드가 없으므로 이전 풀은 기다리지 않고 종료
+    """
+    global bandwidth_budget
+    workers = {
+        'network': app.config.get('DOWNLOAD_NETWORK_WORKERS', 3),
+        'postprocess': app.config.get('DOWNLOAD_POSTPROCESS_WORKERS') or os.cpu_count() or 1,
+    }
+    with pipeline_lock:
+        for stage_name, count in workers.items():
+            previous = pipeline_stages.get(stage_name)
+            if previous:
+                previous['executor'].shutdown(wait=False)
+            pipeline_stages[stage_name] = {
+                'executor': ThreadPoolExecutor(max_workers=count, thread_name_prefix=f'download-{stage_name}'),
+                'workers': count,
+                'active': 0,
+                'queued': 0,
+            }
+    bandwidth_budget = BandwidthBudget(app.config.get('DOWNLOAD_BANDWIDTH_LIMIT', 0))
+
+configure_download_pipeline()
+
+def get_pipeline_snapshot():
+    """단계별 동시 작업 한도, 실행 중/대기 중 작업 수"""
+    with pipeline_lock:
+        return {
+            name: {
+                'workers': stage['workers'],
+                'active': stage['active'],
+                'queued': stage['queued'],
+            }
+            for name, stage in pipeline_stages.items()
+        }
 
 # yt-dlp 공통 설정 (봇 방지 우회)
 def get_ydl_base_opts():
@@ -160,11 +464,48 @@ def get_ydl_base_opts():
         }
     }
 
+def resolved_info_key(video_id):
+    """해석된 yt-dlp info dict 캐시 키"""
+    return f"resolved_info:{video_id}"
+
+def remember_resolved_info(info, video_id=None):
+    """yt-dlp가 해석한 info dict를 다운로드 재사용을 위해 캐시"""
+    video_id = video_id or (info.get('id') if info else None)
+    if not video_id:
+        return
+    try:
+        cache.set(resolved_info_key(video_id), {
+            'resolved_at': time.time(),
+            'info': extractor.sanitize_info(info),
+        }, timeout=app.config.get('DOWNLOAD_INFO_REUSE_TTL', 600))
+    except Exception as e:
+        app.logger.debug("Could not cache resolved info for %s: %s", video_id, e)
+
+def get_resolved_info(video_id):
+    """스트림 URL이 아직 유효한 캐시된 info dict 반환 (없으면 None)"""
+    entry = cache.get(resolved_info_key(video_id))
+    max_age = app.config.get('DOWNLOAD_INFO_REUSE_TTL', 600)
+    fresh = bool(entry) and time.time() - entry.get('resolved_at', 0) <= max_age
+    metrics.record_cache_lookup('resolved_info', fresh)
+    return entry.get('info') if fresh else None
+
+def adopt_resolved_info(video_id, entry):
+    """웹 워커가 보낸 resolved_info 캐시 항목을 남은 유효 시간 동안 저장"""
+    if not isinstance(entry, dict) or not isinstance(entry.get('info'), dict):
+        return
+    try:
+        remaining = app.config.get('DOWNLOAD_INFO_REUSE_TTL', 600) - (time.time() - float(entry.get('resolved_at', 0)))
+    except (TypeError, ValueError):
+        return
+    if remaining > 0:
+        cache.set(resolved_info_key(video_id), entry, timeout=int(remaining))
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 # ============== 데이터 관리 함수 ==============
 
+@metrics.span('storage')
 def load_json(filepath):
     """JSON 파일 로드"""
     if os.path.exists(filepath):
@@ -175,10 +516,10 @@ def load_json(filepath):
                     return []
                 return json.loads(content)
         except json.JSONDecodeError as e:
-            app.logger.error(f"Error decoding JSON from {filepath}: {e}")
+            app.logger.error("Error decoding JSON from %s: %s", filepath, e)
             return []
         except Exception as e:
-            app.logger.error(f"Error loading JSON from {filepath}: {e}")
+            app.logger.error("Error loading JSON from %s: %s", filepath, e)
             return []
     return []
 
@@ -186,8 +527,17 @@ def load_json(filepath):
 
 # (Remove download_task and replace api_download and add serve_download)
 
+class DownloadCancelled(Exception):
+    """실행 중인 다운로드에 취소가 요청됨"""
+
+def check_cancelled(download_id):
+    """취소가 요청된 작업이면 DownloadCancelled로 중단"""
+    if download_progress[download_id].get('cancel_requested'):
+        raise DownloadCancelled(download_id)
+
 def progress_hook(d, download_id):
-    """yt-dlp 다운로드 진행률 콜백"""
+    """yt-dlp 다운로드 진행률 콜백 - 취소 요청 시 예외로 전송을 중단"""
+    check_cancelled(download_id)
     if d['status'] == 'downloading':
         try:
             downloaded = d.get('downloaded_bytes', 0)
@@ -207,92 +557,347 @@ def progress_hook(d, download_id):
                     download_progress[download_id]['eta'] = f"{eta}초"
         except:
             pass
+        bandwidth_budget.throttle(download_id, d.get('filename'), d.get('downloaded_bytes') or 0)
     elif d['status'] == 'finished':
-        download_progress[download_id]['status'] = 'processing'
         download_progress[download_id]['progress'] = 100
 
-def download_video_task(video_id, download_type, quality, download_id):
-    """백그라운드에서 실행되는 다운로드 작업"""
+def build_download_format(download_type, quality):
+    """다운로드 유형/화질에 맞는 yt-dlp 포맷 문자열"""
+    if download_type == 'audio':
+        # m4a(AAC)는 그대로 제공, webm(Opus)은 스트림 복사로 정리할 수 있으므로 재인코딩이 필요 없는 순서로 선택
+        return 'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best'
+    if quality == 'best':
+        return 'bestvideo+bestaudio/best'
     try:
-        download_progress[download_id] = {
-            'status': 'starting',
-            'progress': 0,
-            'filename': None,
-            'error': None,
-            'title': None
-        }
+        height = int(quality)
+        return f'bestvideo[height<={height}]+bestaudio/best[height<={height}]'
+    except:
+        return 'bestvideo+bestaudio/best'
+
+# 재인코딩 없이 그대로 제공할 수 있는 오디오 컨테이너
+AUDIO_PASSTHROUGH_EXTS = {'m4a', 'mp3', 'opus', 'ogg', 'flac', 'wav'}
+
+def choose_audio_path(fmt, audio_format):
+    """오디오 처리 경로 결정: passthrough(그대로) / remux(무손실 컨테이너 변경) / transcode(MP3 재인코딩)
+
+    remux는 후처리에서 코덱을 확인해 스트림 복사가 불가능하면 convert(재인코딩)로 바뀜
+    """
+    if audio_format == 'mp3':
+        return 'passthrough' if fmt.get('ext') == 'mp3' else 'transcode'
+    if fmt.get('ext') in AUDIO_PASSTHROUGH_EXTS:
+        return 'passthrough'
+    return 'remux'
+
+# 끝난 작업의 단계별 소요 시간 (최근 작업만 유지)
+download_metrics = deque(maxlen=500)
+
+def mark_download(download_id, event):
+    """작업 타임라인에 이벤트 시각 기록"""
+    download_progress[download_id].setdefault('timings', {})[event] = time.time()
+
+def get_download_phases(progress):
+    """타임라인에서 단계별 소요 시간(초) 계산"""
+    timings = progress.get('timings', {})
+
+    def span(start, end):
+        if start in timings and end in timings:
+            return round(timings[end] - timings[start], 3)
+        return None
+
+    return {
+        'queue_wait': span('queued', 'extract_start'),
+        'extraction': span('extract_start', 'extract_end'),
+        'transfer': span('transfer_start', 'transfer_end'),
+        'postprocess_wait': span('transfer_end', 'postprocess_start'),
+        'postprocess': span('postprocess_start', 'postprocess_end'),
+        'total': span('queued', 'finished'),
+    }
+
+def record_download_metrics(download_id):
+    progress = download_progress[download_id]
+    download_metrics.append({
+        'status': progress['status'],
+        'phases': get_download_phases(progress),
+        'bytes': progress.get('bytes'),
+        'throughput': progress.get('throughput'),
+        'info_reused': progress.get('info_reused', False),
+    })
+    metrics.DOWNLOADS.labels(progress['status']).inc()
+
+def notify_download_finished():
+    with download_finished:
+        download_finished.notify_all()
+
+def wait_for_download(download_id):
+    """작업이 끝날 때까지 대기 후 진행률 dict 반환"""
+    with download_finished:
+        download_finished.wait_for(
+            lambda: download_progress[download_id]['status'] in DOWNLOAD_DONE_STATUSES)
+    return download_progress[download_id]
+
+def fail_download(download_id, message):
+    download_progress[download_id]['status'] = 'error'
+    download_progress[download_id]['error'] = message
+    download_progress[download_id]['stage'] = 'done'
+    mark_download(download_id, 'finished')
+    record_download_metrics(download_id)
+    remove_job_files(download_progress[download_id].get('file_id'))
+    notify_download_finished()
+
+def cancel_download(download_id):
+    download_progress[download_id]['status'] = 'cancelled'
+    download_progress[download_id]['stage'] = 'done'
+    mark_download(download_id, 'finished')
+    record_download_metrics(download_id)
+    remove_job_files(download_progress[download_id].get('file_id'))
+    notify_download_finished()
+    app.logger.info("Download cancelled: %s", download_id)
+
+def complete_download(download_id, filepath, title):
+    download_progress[download_id].update({
+        'status': 'completed',
+        'stage': 'done',
+        'progress': 100,
+        'filename': os.path.basename(filepath),
+        'title': title,
+    })
+    mark_download(download_id, 'finished')
+    record_download_metrics(download_id)
+    notify_download_finished()
+
+def extract_download_info(ydl, video_id):
+    """다운로드용 info 추출 후 캐시 (이후 재사용할 수 있도록 sanitize한 dict 반환)"""
+    info = ydl.extract_info(canonical_video_url(video_id), download=False)
+    remember_video_info(info, video_id)
+    return load_yt_dlp().YoutubeDL.sanitize_info(info, remove_private_keys=True)
+
+def transfer_streams(ydl, info, file_id, download_id):
+    """포맷 선택 후 각 스트림을 내려받음 - (선택된 info, [(경로, 포맷)]), 파일이 없으면 목록 대신 None"""
+    # 포맷 선택만 수행 - 병합/변환은 후처리 단계에서 실행
+    selected = ydl.process_ie_result(info, download=False)
+    requested = selected.get('requested_formats') or [selected]
+    mark_download(download_id, 'extract_end')
+
+    files = []
+    mark_download(download_id, 'transfer_start')
+    bandwidth_budget.allocate(download_id)
+    try:
+        for fmt in requested:
+            fmt_info = dict(selected)
+            fmt_info.pop('requested_formats', None)
+            fmt_info.update(fmt)
+            filepath = os.path.join(DOWNLOAD_DIR, f"{file_id}.f{fmt['format_id']}.{fmt['ext']}")
+            success, _ = ydl.dl(filepath, fmt_info)
+            if not success or not os.path.exists(filepath):
+                return selected, None
+            files.append((filepath, fmt))
+    finally:
+        bandwidth_budget.release(download_id)
+    return selected, files
+
+def download_video_task(video_id, download_type, quality, download_id, audio_format='original'):
+    """네트워크 단계: 포맷 선택 후 각 스트림을 후처리 없이 내려받음"""
+    try:
+        check_cancelled(download_id)
+        # 대기 중인 작업은 용량을 예약하지 않으므로 실제로 시작할 때 다시 확인
+        if not admit_download(download_progress[download_id].get('reserved_bytes') or 0):
+            fail_download(download_id, '다운로드 저장 공간이 부족합니다. 잠시 후 다시 시도해주세요.')
+            return
+        download_progress[download_id]['status'] = 'starting'
+        download_progress[download_id]['stage'] = 'network'
 
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
         file_id = str(uuid.uuid4())
+        download_progress[download_id]['file_id'] = file_id
 
         ydl_opts = get_ydl_base_opts()
         ydl_opts.update({
-            'outtmpl': os.path.join(DOWNLOAD_DIR, f'{file_id}.%(ext)s'),
+            'format': build_download_format(download_type, quality),
             'progress_hooks': [lambda d: progress_hook(d, download_id)],
+            'concurrent_fragment_downloads': app.config.get('DOWNLOAD_CONCURRENT_FRAGMENTS', 4),
         })
 
-        if download_type == 'audio':
-            ydl_opts.update({
-                'format': 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': quality if quality else '192',
-                }],
-            })
-        else:
-            if quality == 'best':
-                ydl_opts['format'] = 'bestvideo+bestaudio/best'
+        with load_yt_dlp().YoutubeDL(ydl_opts) as ydl:
+            mark_download(download_id, 'extract_start')
+            # watch 페이지에서 이미 해석한 info가 있으면 추출 단계 생략
+            info = get_resolved_info(video_id)
+            if info is None:
+                selected, files = transfer_streams(ydl, extract_download_info(ydl, video_id),
+                                                   file_id, download_id)
             else:
+                app.logger.debug("Reusing resolved info for download: %s", video_id)
+                download_progress[download_id]['info_reused'] = True
                 try:
-                    height = int(quality)
-                    ydl_opts['format'] = f'bestvideo[height<={height}]+bestaudio/best[height<={height}]'
-                except:
-                    ydl_opts['format'] = 'bestvideo+bestaudio/best'
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(video_url, download=True)
-            
-            # Find the downloaded file
-            files = glob.glob(os.path.join(DOWNLOAD_DIR, f'{file_id}.*'))
-            if not files:
-                download_progress[download_id]['status'] = 'error'
-                download_progress[download_id]['error'] = 'Download failed: File not found'
+                    selected, files = transfer_streams(ydl, info, file_id, download_id)
+                except load_yt_dlp().utils.DownloadError as e:
+                    app.logger.warning("Cached info download failed, re-extracting: %s", e)
+                    files = None
+                if files is None:
+                    # 캐시된 스트림 URL이 만료/차단되었을 수 있으므로 새로 추출해 한 번만 재시도
+                    cache.delete(resolved_info_key(video_id))
+                    remove_job_files(file_id)
+                    download_progress[download_id]['info_reused'] = False
+                    selected, files = transfer_streams(ydl, extract_download_info(ydl, video_id),
+                                                       file_id, download_id)
+
+            if files is None:
+                fail_download(download_id, 'Download failed: File not found')
                 return
 
-            filename = os.path.basename(files[0])
-            title = info.get('title', 'video')
-            
-            download_progress[download_id]['status'] = 'completed'
-            download_progress[download_id]['progress'] = 100
-            download_progress[download_id]['filename'] = filename
-            download_progress[download_id]['title'] = title
+        mark_download(download_id, 'transfer_end')
+        check_cancelled(download_id)
+        total_bytes = sum(os.path.getsize(path) for path, _ in files)
+        transfer_time = get_download_phases(download_progress[download_id])['transfer']
+        download_progress[download_id]['bytes'] = total_bytes
+        download_progress[download_id]['throughput'] = int(total_bytes / transfer_time) if transfer_time else None
+
+        title = selected.get('title', 'video')
+        audio_path = None
+        if download_type == 'audio':
+            audio_path = choose_audio_path(files[0][1], audio_format)
+            download_progress[download_id]['audio_path'] = audio_path
+            download_progress[download_id]['audio_codec'] = files[0][1].get('acodec')
+
+        needs_postprocess = len(files) > 1 or audio_path in ('remux', 'transcode')
+        if not needs_postprocess:
+            # 단일 파일은 후처리 없이 바로 완료
+            filepath = os.path.join(DOWNLOAD_DIR, f"{file_id}.{files[0][1]['ext']}")
+            os.replace(files[0][0], filepath)
+            complete_download(download_id, filepath, title)
+            return
+
+        download_progress[download_id]['status'] = 'processing'
+        download_progress[download_id]['stage'] = 'postprocess'
+        job = {
+            'file_id': file_id,
+            'files': files,
+            'merged': selected,
+            'download_type': download_type,
+            'quality': quality,
+            'audio_path': audio_path,
+            'title': title,
+        }
+        download_tasks[download_id] = submit_to_stage(
+            'postprocess', download_postprocess_task, job, download_id)
+
+    except DownloadCancelled:
+        cancel_download(download_id)
+    except Exception as e:
+        fail_download(download_id, str(e))
+        app.logger.error("Download task error: %s", e)
+
+def audio_reencode_needed(pp, path):
+    """FFmpegExtractAudioPP(preferredcodec='best')가 스트림 복사 대신 재인코딩하는지 (ffprobe로 코덱 확인)"""
+    from yt_dlp.postprocessor.ffmpeg import ACODECS
 
+    codec = pp.get_audio_codec(path)
+    # AAC는 m4a로, 그 외 ACODECS에 있는 코덱은 같은 코덱 컨테이너로 복사되고 나머지는 MP3로 변환됨
+    return codec is not None and codec != 'aac' and codec not in ACODECS
+
+def download_postprocess_task(job, download_id):
+    """후처리 단계: ffmpeg 병합 또는 오디오 변환 (CPU 풀에서 실행)"""
+    from yt_dlp.postprocessor import FFmpegExtractAudioPP, FFmpegMergerPP
+
+    files = job['files']
+    mark_download(download_id, 'postprocess_start')
+    try:
+        check_cancelled(download_id)
+        with load_yt_dlp().YoutubeDL(get_ydl_base_opts()) as ydl:
+            if len(files) > 1:
+                merged = job['merged']
+                filepath = os.path.join(DOWNLOAD_DIR, f"{job['file_id']}.{merged['ext']}")
+                pp = FFmpegMergerPP(ydl)
+                pp_info = {
+                    'filepath': filepath,
+                    'vcodec': merged.get('vcodec'),
+                    'acodec': merged.get('acodec'),
+                    'requested_formats': [dict(fmt, filepath=path) for path, fmt in files],
+                    '__files_to_merge': [path for path, _ in files],
+                }
+            else:
+                path, fmt = files[0]
+                if job['audio_path'] == 'transcode':
+                    pp = FFmpegExtractAudioPP(
+                        ydl,
+                        preferredcodec='mp3',
+                        preferredquality=job['quality'] if job['quality'] else '192'
+                    )
+                else:
+                    # 'best'는 코덱이 맞으면 스트림 복사만 수행 (무손실 remux)
+                    pp = FFmpegExtractAudioPP(ydl, preferredcodec='best')
+                pp_info = dict(fmt, filepath=path)
+
+            if not pp.available:
+                if job['audio_path'] == 'remux':
+                    # remux는 선택 사항 - 원본 컨테이너 그대로 제공
+                    download_progress[download_id]['audio_path'] = 'passthrough'
+                    filepath = os.path.join(DOWNLOAD_DIR, f"{job['file_id']}.{fmt['ext']}")
+                    os.replace(path, filepath)
+                    mark_download(download_id, 'postprocess_end')
+                    complete_download(download_id, filepath, job['title'])
+                    return
+                fail_download(download_id, 'ffmpeg가 설치되어 있지 않아 후처리를 할 수 없습니다')
+                return
+
+            if job['audio_path'] == 'remux' and audio_reencode_needed(pp, path):
+                download_progress[download_id]['audio_path'] = 'convert'
+            files_to_delete, pp_info = pp.run(pp_info)
+
+        for path in files_to_delete:
+            if os.path.exists(path):
+                os.remove(path)
+        mark_download(download_id, 'postprocess_end')
+        complete_download(download_id, pp_info['filepath'], job['title'])
+
+    except DownloadCancelled:
+        cancel_download(download_id)
     except Exception as e:
-        download_progress[download_id]['status'] = 'error'
-        download_progress[download_id]['error'] = str(e)
-        app.logger.error(f"Download task error: {e}")
+        fail_download(download_id, str(e))
+        app.logger.error("Download post-processing error: %s", e)
+
+def enqueue_download(video_id, download_type, quality, audio_format='original'):
+    """다운로드 작업을 네트워크 단계 대기열에 넣고 download_id 반환"""
+    download_id = str(uuid.uuid4())
+    download_progress[download_id] = {
+        'status': 'queued',
+        'stage': 'network',
+        'progress': 0,
+        'filename': None,
+        'error': None,
+        'title': None,
+        'reserved_bytes': estimate_download_size(video_id),
+        'timings': {'queued': time.time()}
+    }
+
+    # 네트워크 단계 풀에 다운로드 제출 (후처리는 완료 후 별도 풀로 넘어감)
+    future = submit_to_stage('network', download_video_task, video_id, download_type, quality, download_id, audio_format)
+    download_tasks[download_id] = future
+    return download_id
 
 @app.route('/api/download', methods=['POST'])
-@limiter.limit(app.config.get('RATELIMIT_DOWNLOAD', '5 per minute'))
+@limiter.limit(lambda: app.config.get('RATELIMIT_DOWNLOAD', '5 per minute'))
 def api_download():
     """다운로드 시작 API (Rate limited: 분당 5회)"""
     data = request.get_json()
     video_id = data.get('video_id')
+    video_id = canonical_video_id(video_id) or video_id
+    # 웹 워커가 전달한 요청에만 실려 있음 (단일 프로세스 실행에서는 클라이언트 값이므로 무시)
+    shared_info = data.get('resolved_info')
+    if shared_info and video_id and app.config.get('SERVER_ROLE') == 'downloads':
+        adopt_resolved_info(video_id, shared_info)
     download_type = data.get('type', 'video')
     quality = data.get('quality', 'best')
+    # 오디오는 명시적으로 MP3를 요청한 경우에만 재인코딩
+    audio_format = 'mp3' if data.get('audio_format') == 'mp3' else 'original'
 
     if not video_id:
         return jsonify({'success': False, 'message': 'Video ID is required'})
 
-    # 다운로드 ID 생성
-    download_id = str(uuid.uuid4())
-    
-    app.logger.info(f"Starting download for video: {video_id}, type: {download_type}")
+    if not admit_download(estimate_download_size(video_id)):
+        app.logger.warning("Download refused, disk quota exceeded: %s", video_id)
+        return jsonify({'success': False, 'message': '다운로드 저장 공간이 부족합니다. 잠시 후 다시 시도해주세요.'}), 507
 
-    # ThreadPoolExecutor를 사용하여 다운로드 시작
-    future = executor.submit(download_video_task, video_id, download_type, quality, download_id)
-    download_tasks[download_id] = future
+    app.logger.info("Starting download for video: %s, type: %s", video_id, download_type)
+    download_id = enqueue_download(video_id, download_type, quality, audio_format)
 
     return jsonify({
         'success': True,
@@ -318,7 +923,54 @@ def api_download_progress(download_id):
 
     return jsonify({
         'success': True,
-        **progress_data
+        **progress_data,
+        'phases': get_download_phases(progress_data),
+        'pipeline': get_pipeline_snapshot(),
+        'bandwidth': bandwidth_budget.snapshot()
+    })
+
+def summarize_durations(values):
+    """소요 시간 목록의 개수/평균/p50/p95/최대값"""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return {'count': 0}
+
+    def percentile(p):
+        return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+    return {
+        'count': len(values),
+        'avg': round(sum(values) / len(values), 3),
+        'p50': percentile(50),
+        'p95': percentile(95),
+        'max': values[-1],
+    }
+
+@app.route('/api/download/metrics')
+def api_download_metrics():
+    """최근 다운로드 작업의 단계별 소요 시간 집계 (병목 파악 및 풀 크기 조정용)"""
+    jobs = list(download_metrics)
+    status_counts = {}
+    for job in jobs:
+        status_counts[job['status']] = status_counts.get(job['status'], 0) + 1
+
+    phase_names = ['queue_wait', 'extraction', 'transfer', 'postprocess_wait', 'postprocess', 'total']
+    throughputs = [job['throughput'] for job in jobs if job['throughput']]
+
+    return jsonify({
+        'success': True,
+        'jobs': len(jobs),
+        'status': status_counts,
+        'info_reused': sum(1 for job in jobs if job['info_reused']),
+        'phases': {name: summarize_durations(job['phases'][name] for job in jobs) for name in phase_names},
+        'bytes': sum(job['bytes'] or 0 for job in jobs),
+        'throughput': {
+            'avg': int(sum(throughputs) / len(throughputs)) if throughputs else None,
+            'min': min(throughputs) if throughputs else None,
+            'max': max(throughputs) if throughputs else None,
+        },
+        'pipeline': get_pipeline_snapshot(),
+        'bandwidth': bandwidth_budget.snapshot()
     })
 
 @app.route('/api/download/cancel/<download_id>', methods=['POST'])
@@ -331,10 +983,13 @@ def api_download_cancel(download_id):
     if download_id in download_tasks:
         future = download_tasks[download_id]
         if not future.done():
-            future.cancel()
-            download_progress[download_id]['status'] = 'cancelled'
-            app.logger.info(f"Download cancelled: {download_id}")
-            return jsonify({'success': True, 'message': '다운로드가 취소되었습니다'})
+            if future.cancel():
+                cancel_download(download_id)
+                return jsonify({'success': True, 'message': '다운로드가 취소되었습니다'})
+            # 이미 실행 중인 작업은 진행률 콜백이나 다음 단계 시작 시 중단됨
+            download_progress[download_id]['cancel_requested'] = True
+            app.logger.info("Download cancel requested: %s", download_id)
+            return jsonify({'success': True, 'message': '다운로드 취소를 요청했습니다'})
     
     # 이미 완료되었거나 취소할 수 없는 경우
     return jsonify({'success': False, 'message': '다운로드를 취소할 수 없습니다'})
@@ -346,7 +1001,7 @@ def serve_download(filename):
         # Path Traversal 방지: secure_filename 사용
         safe_filename = secure_filename(filename)
         if not safe_filename:
-            app.logger.warning(f"Invalid filename requested: {filename}")
+            app.logger.warning("Invalid filename requested: %s", filename)
             return "Invalid filename", 400
         
         title = request.args.get('title', 'video')
@@ -356,7 +1011,7 @@ def serve_download(filename):
         real_path = os.path.realpath(file_path)
         real_download_dir = os.path.realpath(DOWNLOAD_DIR)
         if not real_path.startswith(real_download_dir):
-            app.logger.warning(f"Path traversal attempt detected: {filename}")
+            app.logger.warning("Path traversal attempt detected: %s", filename)
             return "Access denied", 403
         
         if not os.path.exists(file_path):
@@ -372,9 +1027,9 @@ def serve_download(filename):
             try:
                 if os.path.exists(file_path):
                     os.remove(file_path)
-                    app.logger.debug(f"Downloaded file removed: {safe_filename}")
+                    app.logger.debug("Downloaded file removed: %s", safe_filename)
             except Exception as e:
-                app.logger.error(f"Error removing file: {e}")
+                app.logger.error("Error removing file: %s", e)
             return response
             
         return send_file(
@@ -383,9 +1038,383 @@ def serve_download(filename):
             download_name=download_filename
         )
     except Exception as e:
-        app.logger.error(f"Error serving download: {e}")
+        app.logger.error("Error serving download: %s", e)
         return str(e), 500
 
+# ============== 플레이리스트 일괄 다운로드 (ZIP 스트리밍) ==============
+
+# 일괄 다운로드 작업 추적 {batch_id: {...}}
+batch_downloads = {}
+batch_lock = threading.Lock()
+
+class ZipStreamBuffer:
+    """zipfile이 쓴 데이터를 모아 두었다가 응답 청크로 내보내는 쓰기 전용 버퍼"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def get_batch_items(playlist_id):
+    """플레이리스트 ID로 (제목, 영상 목록) 반환 - pl_* 는 사용자 플레이리스트"""
+    if playlist_id.startswith('pl_'):
+        for pl in load_playlists():
+            if pl['id'] == playlist_id:
+                return pl.get('name'), pl.get('videos', [])
+        return None, []
+    playlist_info = get_playlist_info(f"https://www.youtube.com/playlist?list={playlist_id}")
+    if not playlist_info or 'error' in playlist_info:
+        return None, []
+    return playlist_info.get('title'), playlist_info.get('videos', [])
+
+def get_batch_status(batch_id):
+    """일괄 다운로드 작업의 항목별 진행률"""
+    batch = batch_downloads[batch_id]
+    items = []
+    for item in batch['items']:
+        progress = download_progress.get(item['download_id'], {})
+        items.append({
+            **item,
+            'status': progress.get('status'),
+            'progress': progress.get('progress', 0),
+            'error': progress.get('error'),
+        })
+    done = sum(1 for item in items if item['status'] in ('completed', 'error', 'cancelled'))
+    return {
+        'batch_id': batch_id,
+        'title': batch['title'],
+        'status': batch['status'],
+        'total': len(items),
+        'completed': sum(1 for item in items if item['status'] == 'completed'),
+        'failed': sum(1 for item in items if item['status'] in ('error', 'cancelled')),
+        'progress': round(done / len(items) * 100, 1) if items else 100,
+        'items': items,
+    }
+
+def abort_batch(batch_id):
+    """ZIP 스트림이 끊긴 일괄 다운로드 정리 - 대기 중인 항목 취소, 중간 파일 삭제
+
+    실행 중이거나 완료된 항목은 그대로 두어 다시 받을 때 재사용함
+    """
+    batch = batch_downloads[batch_id]
+    for item in batch['items']:
+        future = download_tasks.get(item['download_id'])
+        if future is not None and future.cancel():
+            cancel_download(item['download_id'])
+    batch['status'] = 'aborted'
+    notify_download_finished()
+    app.logger.info("Batch download aborted: %s", batch_id)
+
+def restart_batch(batch_id):
+    """중단된 일괄 다운로드 재시작 - 취소되었거나 이미 ZIP으로 내보내 파일이 없는 항목만 다시 대기열에 넣음"""
+    batch = batch_downloads[batch_id]
+    download_type, quality, audio_format = batch['options']
+    for item in batch['items']:
+        progress = download_progress.get(item['download_id'], {})
+        if progress.get('status') == 'completed':
+            if os.path.exists(os.path.join(DOWNLOAD_DIR, progress['filename'])):
+                continue
+        elif progress.get('status') not in ('cancelled', None):
+            continue
+        item['download_id'] = enqueue_download(item['video_id'], download_type, quality, audio_format)
+    app.logger.info("Restarting batch download: %s", batch_id)
+
+def zip_arcname(index, title, filename):
+    """ZIP 내부 파일명 (순번 + 제목 + 원래 확장자)"""
+    _, ext = os.path.splitext(filename)
+    safe_title = re.sub(r'[\\/:*?"<>|\x00-\x1f]', '_', title or 'video').strip() or 'video'
+    return f"{index:03d} {safe_title[:100]}{ext}"
+
+def stream_batch_zip(batch_id):
+    """항목이 완료되는 순서대로 ZIP 엔트리를 만들어 바로 내보냄 (디스크에 아카이브를 만들지 않음)"""
+    batch = batch_downloads[batch_id]
+    buffer = ZipStreamBuffer()
+    try:
+        with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_STORED) as zf:
+            for index, item in enumerate(batch['items'], 1):
+                # 해당 항목 다운로드가 끝날 때까지 대기
+                progress = wait_for_download(item['download_id'])
+                if progress['status'] != 'completed':
+                    continue
+
+                file_path = os.path.join(DOWNLOAD_DIR, progress['filename'])
+                arcname = zip_arcname(index, progress.get('title') or item.get('title'), progress['filename'])
+                with open(file_path, 'rb') as src, zf.open(arcname, mode='w', force_zip64=True) as dest:
+                    while True:
+                        chunk = src.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        dest.write(chunk)
+                        yield buffer.drain()
+                yield buffer.drain()
+
+                try:
+                    os.remove(file_path)
+                except OSError as e:
+                    app.logger.error("Error removing batch item file: %s", e)
+        yield buffer.drain()
+        batch['status'] = 'completed'
+    except GeneratorExit:
+        abort_batch(batch_id)
+        raise
+    except Exception as e:
+        batch['status'] = 'error'
+        app.logger.error("Error streaming batch zip: %s", e)
+
+@app.route('/api/download/playlist', methods=['POST'])
+@limiter.limit(lambda: app.config.get('RATELIMIT_DOWNLOAD', '5 per minute'))
+def api_download_playlist():
+    """플레이리스트 일괄 다운로드 시작 API - 항목은 일반 다운로드 대기열로 처리"""
+    data = request.get_json()
+    playlist_id = data.get('playlist_id')
+    download_type = data.get('type', 'video')
+    quality = data.get('quality', 'best')
+    audio_format = 'mp3' if data.get('audio_format') == 'mp3' else 'original'
+
+    if not playlist_id:
+        return jsonify({'success': False, 'message': 'Playlist ID is required'})
+
+    title, videos = get_batch_items(playlist_id)
+    videos = [v for v in videos if v.get('id')]
+    if not videos:
+        return jsonify({'success': False, 'message': '다운로드할 영상이 없습니다'})
+
+    max_items = app.config.get('DOWNLOAD_BATCH_MAX_ITEMS', 50)
+    videos = videos[:max_items]
+
+    # 항목은 네트워크 단계 워커 수만큼만 동시에 실행되고, 각 항목은 시작할 때 다시 용량을 확인함
+    estimates = sorted((estimate_download_size(v['id']) for v in videos), reverse=True)
+    if not admit_download(sum(estimates[:pipeline_stages['network']['workers']])):
+        app.logger.warning("Batch download refused, disk quota exceeded: %s", playlist_id)
+        return jsonify({'success': False, 'message': '다운로드 저장 공간이 부족합니다. 잠시 후 다시 시도해주세요.'}), 507
+
+    batch_id = str(uuid.uuid4())
+    app.logger.info("Starting batch download for playlist: %s, items: %d", playlist_id, len(videos))
+
+    batch_downloads[batch_id] = {
+        'title': title or playlist_id,
+        'playlist_id': playlist_id,
+        'status': 'queued',
+        'options': (download_type, quality, audio_format),
+        'items': [
+            {
+                'video_id': video['id'],
+                'title': video.get('title'),
+                'download_id': enqueue_download(video['id'], download_type, quality, audio_format),
+            }
+            for video in videos
+        ],
+    }
+
+    return jsonify({
+        'success': True,
+        'batch_id': batch_id,
+        'total': len(videos),
+        'download_url': url_for('serve_batch_download', batch_id=batch_id),
+        'message': '일괄 다운로드가 시작되었습니다'
+    })
+
+@app.route('/api/download/batch/<batch_id>')
+def api_batch_progress(batch_id):
+    """일괄 다운로드 항목별 진행률 조회"""
+    if batch_id not in batch_downloads:
+        return jsonify({'success': False, 'message': 'Download not found'})
+    return jsonify({
+        'success': True,
+        **get_batch_status(batch_id),
+        'download_url': url_for('serve_batch_download', batch_id=batch_id)
+    })
+
+@app.route('/download/batch/<batch_id>')
+def serve_batch_download(batch_id):
+    """일괄 다운로드 ZIP 스트리밍"""
+    if batch_id not in batch_downloads:
+        return "File not found", 404
+    with batch_lock:
+        status = batch_downloads[batch_id]['status']
+        if status not in ('queued', 'aborted'):
+            return "Already downloaded", 409
+        if status == 'aborted':
+            restart_batch(batch_id)
+        batch_downloads[batch_id]['status'] = 'streaming'
+
+    # 한글 제목은 RFC 5987 filename*로 보내고, 이를 지원하지 않는 클라이언트에는 플레이리스트 ID 사용
+    batch = batch_downloads[batch_id]
+    fallback_filename = f"{secure_filename(batch['playlist_id']) or 'playlist'}.zip"
+    disposition = (f'attachment; filename="{fallback_filename}"; '
+                   f"filename*=UTF-8''{urllib.parse.quote(batch['title'] + '.zip')}")
+    return Response(
+        stream_batch_zip(batch_id),
+        mimetype='application/zip',
+        headers={'Content-Disposition': disposition}
+    )
+
+# ============== 다운로드 디렉토리 정리 (janitor) ==============
+
+# 작업이 끝난 상태
+DOWNLOAD_DONE_STATUSES = ('completed', 'error', 'cancelled')
+janitor_lock = threading.Lock()
+
+def remove_job_files(file_id):
+    """작업의 중간 파일(.part, .ytdl, .fNNN 등) 모두 삭제"""
+    if not file_id:
+        return
+    for path in glob.glob(os.path.join(DOWNLOAD_DIR, f'{file_id}.*')):
+        try:
+            os.remove(path)
+        except OSError as e:
+            app.logger.warning("Error removing job file %s: %s", path, e)
+
+def format_size(fmt, duration=None):
+    """포맷 하나의 크기 (filesize, filesize_approx, 비트레이트 x 길이 순으로 사용, 모르면 None)"""
+    size = fmt.get('filesize') or fmt.get('filesize_approx')
+    if not size and fmt.get('tbr') and duration:
+        size = fmt['tbr'] * 1000 / 8 * duration
+    return int(size) if size else None
+
+def info_download_size(info):
+    """info dict로 내려받을 크기 추정 - 병합 포맷은 requested_formats 합계 (모르면 None)"""
+    duration = info.get('duration')
+    parts = info.get('requested_formats') or [info]
+    sizes = [format_size(fmt, duration) for fmt in parts]
+    if not sizes or None in sizes:
+        return None
+    return sum(sizes)
+
+def estimate_download_size(video_id):
+    """캐시된 info의 파일 크기로 작업 크기 추정 (없으면 기본 예약 용량)"""
+    info = get_resolved_info(video_id)
+    size = info_download_size(info) if info else None
+    return size or app.config.get('DOWNLOAD_JOB_RESERVE', 200 * 1024 * 1024)
+
+def scan_download_dir():
+    """다운로드 디렉토리의 파일 목록 [(이름, 크기, 수정시각)]"""
+    entries = []
+    try:
+        with os.scandir(DOWNLOAD_DIR) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((entry.name, stat.st_size, stat.st_mtime))
+    except FileNotFoundError:
+        pass
+    return entries
+
+def get_protected_files():
+    """정리 대상에서 제외할 파일: 진행 중인 작업의 file_id, ZIP 스트리밍 대기 중인 파일명"""
+    active_file_ids = set()
+    pinned = set()
+    for progress in list(download_progress.values()):
+        if progress.get('file_id') and progress['status'] not in DOWNLOAD_DONE_STATUSES:
+            active_file_ids.add(progress['file_id'])
+    for batch in list(batch_downloads.values()):
+        if batch['status'] in ('queued', 'streaming'):
+            for item in batch['items']:
+                filename = download_progress.get(item['download_id'], {}).get('filename')
+                if filename:
+                    pinned.add(filename)
+    return active_file_ids, pinned
+
+def get_download_usage():
+    """다운로드 디렉토리 사용량과 실행 중인 작업의 예약 용량 (대기 중인 작업은 시작할 때 예약)"""
+    entries = scan_download_dir()
+    reserved = sum(
+        p.get('reserved_bytes') or 0
+        for p in list(download_progress.values())
+        if p['status'] not in DOWNLOAD_DONE_STATUSES and p['status'] != 'queued'
+    )
+    return {
+        'used_bytes': sum(size for _, size, _ in entries),
+        'reserved_bytes': reserved,
+        'quota_bytes': app.config.get('DOWNLOAD_DISK_QUOTA'),
+        'files': len(entries),
+    }
+
+def sweep_download_dir(target_bytes=None):
+    """오래된 완료 파일/고아 중간 파일 삭제 후, 용량 초과 시 오래된 파일부터(LRU) 제거"""
+    with janitor_lock:
+        now = time.time()
+        active_file_ids, pinned = get_protected_files()
+        completed_files = {
+            p['filename'] for p in list(download_progress.values())
+            if p['status'] == 'completed' and p.get('filename')
+        }
+        file_max_age = app.config.get('DOWNLOAD_FILE_MAX_AGE', 6 * 3600)
+        orphan_max_age = app.config.get('DOWNLOAD_ORPHAN_MAX_AGE', 3600)
+
+        removed = 0
+        candidates = []
+        for name, size, mtime in scan_download_dir():
+            # 진행 중인 작업과 ZIP으로 내보낼 파일은 오래되었어도 지우지 않음
+            if name.split('.', 1)[0] in active_file_ids or name in pinned:
+                continue
+            # 완료 파일은 가져갈 시간을 주고, 그 외(죽은 작업의 조각/이전 프로세스 파일)는 짧게 보관
+            max_age = file_max_age if name in completed_files else orphan_max_age
+            if now - mtime > max_age:
+                removed += remove_download_file(name, size)
+            else:
+                candidates.append((mtime, name, size))
+
+        if target_bytes is None:
+            target_bytes = app.config.get('DOWNLOAD_DISK_QUOTA')
+        if target_bytes:
+            usage = sum(size for _, size, _ in scan_download_dir())
+            for _, name, size in sorted(candidates):
+                if usage <= target_bytes:
+                    break
+                freed = remove_download_file(name, size)
+                usage -= freed
+                removed += freed
+        return removed
+
+def remove_download_file(name, size):
+    try:
+        os.remove(os.path.join(DOWNLOAD_DIR, name))
+        app.logger.info("Janitor removed download file: %s", name)
+        return size
+    except OSError as e:
+        app.logger.warning("Janitor could not remove %s: %s", name, e)
+        return 0
+
+def admit_download(estimated_bytes):
+    """새 작업을 받아도 용량 한도를 넘지 않는지 확인 (필요하면 먼저 정리)"""
+    quota = app.config.get('DOWNLOAD_DISK_QUOTA')
+    if not quota:
+        return True
+    usage = get_download_usage()
+    if usage['used_bytes'] + usage['reserved_bytes'] + estimated_bytes <= quota:
+        return True
+    sweep_download_dir(target_bytes=quota - usage['reserved_bytes'] - estimated_bytes)
+    usage = get_download_usage()
+    return usage['used_bytes'] + usage['reserved_bytes'] + estimated_bytes <= quota
+
+def run_download_janitor():
+    """주기적으로 다운로드 디렉토리 정리"""
+    interval = app.config.get('DOWNLOAD_JANITOR_INTERVAL', 300)
+    while True:
+        time.sleep(interval)
+        try:
+            sweep_download_dir()
+        except Exception as e:
+            app.logger.error("Download janitor error: %s", e)
+
+
+@app.route('/api/download/usage')
+def api_download_usage():
+    """다운로드 디렉토리 사용량 조회"""
+    return jsonify({'success': True, **get_download_usage()})
+
+@metrics.span('storage')
 def save_json(filepath, data):
     """JSON 파일 저장"""
     try:
@@ -396,9 +1425,9 @@ def save_json(filepath, data):
 
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
-        app.logger.debug(f"Successfully saved JSON to {filepath}")
+        app.logger.debug("Successfully saved JSON to %s", filepath)
     except Exception as e:
-        app.logger.error(f"Error saving JSON to {filepath}: {e}")
+        app.logger.error("Error saving JSON to %s: %s", filepath, e)
         raise
 
 # ============== 프로필 관리 함수 ==============
@@ -430,6 +1459,223 @@ def get_data_path(file_type):
     if file_type == 'playlists': return os.path.join(DATA_DIR, f'playlists_{profile_id}.json')
     return None
 
+# ============== 메트릭 ==============
+
+# cProfile은 프로세스에서 하나만 켤 수 있으므로 (Python 3.12+는 ValueError) 겹치는 요청은 프로파일링하지 않음
+profiler_lock = threading.Lock()
+
+def start_profiler():
+    """프로파일러 시작 - 다른 요청이 이미 프로파일링 중이면 None"""
+    if not profiler_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        profiler_lock.release()
+        return None
+    return profiler
+
+def stop_profiler(profiler):
+    profiler.disable()
+    profiler_lock.release()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.spans = {}
+    # 느린 요청인지는 끝나야 알 수 있으므로 일부 요청을 미리 프로파일링하고, 느린 경우만 저장
+    sample_rate = app.config.get('SLOW_REQUEST_PROFILE_SAMPLE_RATE', 0)
+    if sample_rate and random.random() < sample_rate:
+        profiler = start_profiler()
+        if profiler is not None:
+            g.profiler = profiler
+
+@app.after_request
+def record_request_metrics(response):
+    """라우트별 응답 시간/요청 수 기록 (엔드포인트 이름 기준으로 집계)"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.endpoint or 'unmatched'
+        elapsed = time.perf_counter() - started
+        metrics.REQUEST_SECONDS.labels(endpoint, request.method).observe(elapsed)
+        metrics.REQUESTS.labels(endpoint, request.method, str(response.status_code)).inc()
+
+        # 스트리밍 페이지는 헤더 전송 시점까지의 구간만 포함 (느린 요청 로그는 전송 완료 기준)
+        spans = g.get('spans', {})
+        if app.config.get('SERVER_TIMING_HEADER', True):
+            response.headers['Server-Timing'] = metrics.format_server_timing(spans, elapsed)
+        response.call_on_close(partial(
+            finish_request_trace, started, endpoint, request.method, request.full_path.rstrip('?'),
+            response.status_code, spans, g.pop('profiler', None)
+        ))
+    return response
+
+@app.teardown_request
+def stop_request_profiler(exc):
+    """after_request까지 가지 못한 요청의 프로파일러 정리"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        stop_profiler(profiler)
+
+@before_render_template.connect_via(app)
+def start_render_span(sender, template, context, **extra):
+    g.render_started = time.perf_counter()
+
+@template_rendered.connect_via(app)
+def finish_render_span(sender, template, context, **extra):
+    """템플릿 렌더링 구간 (스트리밍 페이지는 load()로 가져오는 시간 포함)"""
+    started = g.pop('render_started', None)
+    if started is not None:
+        metrics.record_span('render', time.perf_counter() - started)
+
+def finish_request_trace(started, endpoint, method, path, status, spans, profiler):
+    """응답 전송이 끝난 뒤 기준 시간을 넘긴 요청을 구간별 시간과 함께 JSON 한 줄로 기록"""
+    elapsed = time.perf_counter() - started
+    if profiler is not None:
+        stop_profiler(profiler)
+    if elapsed < app.config.get('SLOW_REQUEST_THRESHOLD', 2.0):
+        return
+
+    entry = {
+        'endpoint': endpoint,
+        'method': method,
+        'path': path,
+        'status': status,
+        'duration_ms': round(elapsed * 1000, 1),
+        'spans': {name: {'ms': round(seconds * 1000, 1), 'count': count}
+                  for name, (seconds, count) in spans.items()},
+    }
+    if profiler is not None:
+        profile_dir = os.path.join(app.config.get('LOGS_DIR', 'logs'), 'profiles')
+        os.makedirs(profile_dir, exist_ok=True)
+        profile_path = os.path.join(
+            profile_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{endpoint}-{os.getpid()}.prof")
+        profiler.dump_stats(profile_path)
+        entry['profile'] = profile_path
+    app.logger.warning("Slow request %s", json.dumps(entry, ensure_ascii=False))
+
+def internal_access_denied(allow_session=True):
+    """운영용 엔드포인트 접근 검사 - METRICS_TOKEN Bearer 토큰 또는 (allow_session이면) 로그인 세션
+
+    토큰이 없으면 INTERNAL_LOCAL_ACCESS일 때만 로컬 접근을 허용
+    (리버스 프록시 뒤에서는 모든 요청이 로컬 주소로 보이므로 프로덕션에서는 끔)
+    """
+    token = app.config.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') == f"Bearer {token}":
+        return None
+    if allow_session and session.get('logged_in'):
+        return None
+    if token or not app.config.get('INTERNAL_LOCAL_ACCESS', True):
+        return "Unauthorized", 401
+    if request.remote_addr not in ('127.0.0.1', '::1'):
+        return "Forbidden", 403
+    return None
+
+@app.route('/metrics')
+@limiter.exempt
+def prometheus_metrics():
+    """Prometheus 메트릭 - 수집기는 로그인하지 않으므로 토큰 (프로덕션에서는 토큰이 없으면 제공하지 않음)"""
+    denied = internal_access_denied(allow_session=False)
+    if denied:
+        return denied
+    body, content_type = metrics.render_latest()
+    return Response(body, content_type=content_type)
+
+# ============== 메모리 진단 ==============
+
+def memory_registries():
+    """프로세스 메모리에 쌓이는 레지스트리 (다운로드 관련은 SERVER_ROLE='web'이면 다운로드 프로세스 쪽에 있음)"""
+    registries = {
+        'download_progress': download_progress,
+        'download_tasks': download_tasks,
+        'download_metrics': download_metrics,
+        'batch_downloads': batch_downloads,
+        'related_inflight': related_inflight,
+        'asset_manifest': asset_manifest,
+        'startup_timings': startup_timings,
+    }
+    if isinstance(getattr(extractor, 'loaded', None), dict):
+        registries['extractor_fixtures'] = extractor.loaded
+    return registries
+
+@app.route('/admin/memory')
+@limiter.exempt
+def admin_memory():
+    """메모리 사용 현황 (RSS, 캐시 네임스페이스별 크기, 레지스트리 크기, tracemalloc 상위 할당 위치)
+
+    ?top=N&group=lineno|filename|traceback - tracemalloc이 켜져 있을 때 상위 할당 위치 수와 묶음 기준
+    """
+    denied = internal_access_denied()
+    if denied:
+        return denied
+
+    group_by = request.args.get('group', 'lineno')
+    if group_by not in ('lineno', 'filename', 'traceback'):
+        return jsonify({'success': False, 'message': 'group은 lineno, filename, traceback 중 하나여야 합니다.'}), 400
+    limit = max(1, min(request.args.get('top', 20, type=int), 200))
+
+    registries = diagnostics.registry_stats(memory_registries())
+    status_counts = {}
+    for progress in list(download_progress.values()):
+        status = progress.get('status', 'unknown')
+        status_counts[status] = status_counts.get(status, 0) + 1
+    registries['download_progress']['by_status'] = status_counts
+
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'role': app.config.get('SERVER_ROLE', 'all'),
+        'process': diagnostics.process_memory(),
+        'caches': diagnostics.cache_stats(cache.cache),
+        'registries': registries,
+        'tracemalloc': diagnostics.tracemalloc_top(limit, group_by),
+    })
+
+@app.route('/admin/memory/tracemalloc', methods=['POST'])
+@limiter.exempt
+def admin_tracemalloc():
+    """tracemalloc 켜기/끄기 - {"action": "start" | "stop", "frames": 1}"""
+    denied = internal_access_denied()
+    if denied:
+        return denied
+
+    data = request.get_json(silent=True) or {}
+    action = data.get('action')
+    if action == 'start':
+        frames = data.get('frames', app.config.get('TRACEMALLOC_FRAMES', 1))
+        if not isinstance(frames, int) or not 1 <= frames <= 100:
+            return jsonify({'success': False, 'message': 'frames는 1~100 사이의 정수여야 합니다.'}), 400
+        status = diagnostics.tracemalloc_start(frames)
+    elif action == 'stop':
+        status = diagnostics.tracemalloc_stop()
+    else:
+        return jsonify({'success': False, 'message': 'action은 start 또는 stop이어야 합니다.'}), 400
+    app.logger.info("tracemalloc %s (pid %s)", action, os.getpid())
+    return jsonify({'success': True, 'tracemalloc': status})
+
+@app.route('/admin/cache/purge', methods=['POST'])
+@limiter.exempt
+def admin_cache_purge():
+    """캐시 항목 삭제 - {"namespace": "video_info"}, {"prefix": "shelf:related:"} 또는 {"all": true}"""
+    denied = internal_access_denied()
+    if denied:
+        return denied
+
+    data = request.get_json(silent=True) or {}
+    namespace = data.get('namespace') or None
+    prefix = data.get('prefix') or None
+    if namespace is None and prefix is None and not data.get('all'):
+        return jsonify({'success': False, 'message': 'namespace, prefix 또는 all이 필요합니다.'}), 400
+
+    try:
+        removed, freed = diagnostics.purge_cache(cache.cache, namespace=namespace, prefix=prefix)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    app.logger.info("Cache purge namespace=%s prefix=%s: %d entries, %d bytes",
+                    namespace, prefix, removed, freed)
+    return jsonify({'success': True, 'removed': removed, 'bytes': freed})
+
 # ============== 전역 에러 핸들러 ==============
 
 @app.errorhandler(Exception)
@@ -437,7 +1683,7 @@ def handle_exception(e):
     """전역 예외 핸들러"""
     # API 요청인 경우 JSON 응답 반환
     if request.path.startswith('/api/'):
-        app.logger.error(f"API Error: {str(e)}", exc_info=True)
+        app.logger.error("API Error: %s", e, exc_info=True)
         return jsonify({
             'success': False,
             'message': f'서버 오류: {str(e)}'
@@ -458,7 +1704,7 @@ def not_found(e):
 @app.errorhandler(500)
 def internal_error(e):
     """500 에러 핸들러"""
-    app.logger.error(f"Internal Server Error: {str(e)}", exc_info=True)
+    app.logger.error("Internal Server Error: %s", e, exc_info=True)
     if request.path.startswith('/api/'):
         return jsonify({'success': False, 'message': '내부 서버 오류가 발생했습니다.'}), 500
     return str(e), 500
@@ -466,13 +1712,83 @@ def internal_error(e):
 @app.errorhandler(429)
 def ratelimit_handler(e):
     """Rate Limit 에러 핸들러"""
-    app.logger.warning(f"Rate limit exceeded: {request.remote_addr} - {request.path}")
+    app.logger.warning("Rate limit exceeded: %s - %s", request.remote_addr, request.path)
     return jsonify({
         'success': False,
         'message': '요청 한도를 초과했습니다. 잠시 후 다시 시도해주세요.',
         'retry_after': e.description
     }), 429
 
+# ============== 응답 압축 및 조건부 요청 ==============
+
+def choose_content_encoding():
+    """Accept-Encoding 협상 - br(설치된 경우) > gzip 순으로 선택"""
+    accepted = request.accept_encodings
+    if BROTLI_AVAILABLE and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+def compress_body(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=app.config.get('COMPRESS_BROTLI_QUALITY', 5))
+    return gzip.compress(data, compresslevel=app.config.get('COMPRESS_LEVEL', 6))
+
+def compress_stream(chunks, encoding):
+    """스트리밍 응답 압축 - 청크마다 flush해서 셸이 먼저 도착하는 효과를 유지"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=app.config.get('COMPRESS_BROTLI_QUALITY', 5))
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(app.config.get('COMPRESS_LEVEL', 6), zlib.DEFLATED, 31)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+@app.after_request
+def finalize_response(response):
+    """HTML/JSON 응답에 약한 ETag를 붙여 304로 응답하고, 협상된 인코딩으로 압축"""
+    if response.mimetype not in app.config.get('COMPRESS_MIMETYPES', []):
+        return response
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    # 변경 없는 GET 응답은 본문 없이 304 (세션별 데이터이므로 private + 재검증)
+    if (request.method in ('GET', 'HEAD') and response.status_code == 200
+            and not response.is_streamed and 'ETag' not in response.headers):
+        response.set_etag(hashlib.md5(response.get_data()).hexdigest(), weak=True)
+        # 라우트가 직접 캐시 정책을 정한 응답은 그대로 둠
+        if 'Cache-Control' not in response.headers:
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    encoding = choose_content_encoding()
+    if not encoding or request.method == 'HEAD':
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < app.config.get('COMPRESS_MIN_SIZE', 1024):
+            return response
+        response.set_data(compress_body(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
 # ============== 프로필 라우트 ==============
 
 @app.route('/profiles')
@@ -487,11 +1803,11 @@ def create_profile():
     """새 프로필 생성"""
     try:
         app.logger.info("Profile creation started")
-        app.logger.debug(f"Request method: {request.method}")
-        app.logger.debug(f"Request content type: {request.content_type}")
+        app.logger.debug("Request method: %s", request.method)
+        app.logger.debug("Request content type: %s", request.content_type)
 
         name = request.form.get('name')
-        app.logger.debug(f"Profile name: {name}")
+        app.logger.debug("Profile name: %s", name)
 
         if not name:
             app.logger.warning("Profile creation: No name provided")
@@ -500,12 +1816,12 @@ def create_profile():
         avatar_path = '/static/avatars/default.svg'
         if 'avatar' in request.files:
             file = request.files['avatar']
-            app.logger.debug(f"Avatar file: {file.filename}")
+            app.logger.debug("Avatar file: %s", file.filename)
             if file and file.filename and allowed_file(file.filename):
                 filename = secure_filename(file.filename)
                 unique_filename = f"{uuid.uuid4()}_{filename}"
                 filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-                app.logger.debug(f"Saving avatar to: {filepath}")
+                app.logger.debug("Saving avatar to: %s", filepath)
                 file.save(filepath)
                 avatar_path = f"/static/avatars/{unique_filename}"
 
@@ -515,17 +1831,17 @@ def create_profile():
             'avatar': avatar_path,
             'created_at': datetime.now().isoformat()
         }
-        app.logger.info(f"New profile created: {new_profile.get('id')}")
+        app.logger.info("New profile created: %s", new_profile.get('id'))
 
         profiles = load_profiles()
-        app.logger.debug(f"Existing profiles count: {len(profiles)}")
+        app.logger.debug("Existing profiles count: %d", len(profiles))
         profiles.append(new_profile)
         save_profiles(profiles)
         app.logger.info("Profile saved successfully")
 
         return jsonify({'success': True, 'profile': new_profile})
     except Exception as e:
-        app.logger.error(f"Error creating profile: {e}", exc_info=True)
+        app.logger.error("Error creating profile: %s", e, exc_info=True)
         return jsonify({'success': False, 'message': f'프로필 생성 중 오류 발생: {str(e)}'})
 
 @app.route('/api/profile/switch', methods=['POST'])
@@ -540,7 +1856,7 @@ def switch_profile():
 
         return jsonify({'success': False, 'message': '프로필을 찾을 수 없습니다.'})
     except Exception as e:
-        app.logger.error(f"Error switching profile: {e}")
+        app.logger.error("Error switching profile: %s", e)
         return jsonify({'success': False, 'message': f'프로필 전환 중 오류 발생: {str(e)}'})
 
 @app.route('/api/profile/delete', methods=['POST'])
@@ -560,14 +1876,14 @@ def delete_profile():
                 if os.path.exists(path):
                     os.remove(path)
         except Exception as file_error:
-            app.logger.warning(f"Error deleting profile data files: {file_error}")
+            app.logger.warning("Error deleting profile data files: %s", file_error)
 
         if session.get('profile_id') == profile_id:
             session.pop('profile_id', None)
 
         return jsonify({'success': True})
     except Exception as e:
-        app.logger.error(f"Error deleting profile: {e}")
+        app.logger.error("Error deleting profile: %s", e)
         return jsonify({'success': False, 'message': f'프로필 삭제 중 오류 발생: {str(e)}'})
 
 @app.route('/login', methods=['GET', 'POST'])
@@ -584,7 +1900,7 @@ def login():
         if username == 'malgeun_admin' and password == 'Tube2024!@Secure':
             session['logged_in'] = True
             session.permanent = True
-            app.logger.info(f"User logged in: {username}")
+            app.logger.info("User logged in: %s", username)
             return redirect(url_for('profiles_view'))
         else:
             return render_template('login.html', error='아이디 또는 비밀번호가 올바르지 않습니다.')
@@ -603,11 +1919,13 @@ def check_auth():
     """로그인 및 프로필 확인"""
     # Static resources don't need auth check
     if (request.path.startswith('/static/') or
-        request.endpoint == 'static'):
+        request.path.startswith('/assets/') or
+        request.endpoint in ('static', 'hashed_asset', 'service_worker')):
         return
 
-    # Login page doesn't need auth check
-    if request.path in ['/login', '/logout']:
+    # Login page, metrics and admin diagnostics (token/local access check) don't need auth check
+    if request.path in ['/login', '/logout', '/metrics', '/admin/memory',
+                        '/admin/memory/tracemalloc', '/admin/cache/purge']:
         return
 
     # Check if user is logged in
@@ -638,13 +1956,15 @@ def load_history():
 def save_history(history):
     save_json(get_data_path('history'), history)
 
-def add_to_history(video_info):
-    history = load_history()
+def add_to_history(video_info, history_file=None):
+    # history_file을 넘기면 세션 없이(백그라운드 스레드에서) 저장 가능
+    history_file = history_file or get_data_path('history')
+    history = load_json(history_file)
     history = [h for h in history if h.get('id') != video_info.get('id')]
     video_info['watched_at'] = datetime.now().isoformat()
     history.insert(0, video_info)
     history = history[:100]
-    save_history(history)
+    save_json(history_file, history)
 
 def load_channels():
     return load_json(get_data_path('channels'))
@@ -738,7 +2058,7 @@ def load_settings():
     settings = load_json(settings_file)
     if isinstance(settings, list):
         # 기존 데이터가 리스트인 경우 (잘못된 형식) 기본값 반환
-        app.logger.warning(f"Settings file contains list instead of dict, using defaults: {settings_file}")
+        app.logger.warning("Settings file contains list instead of dict, using defaults: %s", settings_file)
         return {'country': DEFAULT_COUNTRY}
     return settings if settings else {'country': DEFAULT_COUNTRY}
 
@@ -886,194 +2206,280 @@ def get_search_suggestions(query):
 
 # ============== YouTube 데이터 함수 ==============
 
-@cache.memoize(timeout=3600)  # 1시간 캐시
-def get_video_info_cached(video_url):
-    """비디오 정보 가져오기 (캐시됨) - is_subscribed 제외"""
+def video_info_key(video_id):
+    """영상 메타데이터 캐시 키 - watch, 관련 영상, 다운로드, 플레이리스트가 모두 이 키를 사용"""
+    return result_cache.result_key('video_info', video_id)
+
+def summarize_video_info(info):
+    """yt-dlp info dict에서 페이지에 필요한 메타데이터만 추림"""
+    formats = []
+    if info.get('formats'):
+        for f in info['formats']:
+            if f.get('vcodec') != 'none' and f.get('acodec') != 'none':
+                formats.append({
+                    'format_id': f.get('format_id'),
+                    'ext': f.get('ext'),
+                    'resolution': f.get('resolution', 'unknown'),
+                    'filesize': f.get('filesize'),
+                    'url': f.get('url'),
+                    'quality': f.get('height', 0)
+                })
+
+    formats.sort(key=lambda x: x.get('quality') or 0, reverse=True)
+    channel_id = info.get('channel_id') or info.get('uploader_id', '')
+
+    return {
+        'id': info.get('id'),
+        'title': info.get('title'),
+        'description': (info.get('description') or '')[:500],
+        'thumbnail': info.get('thumbnail'),
+        'duration': info.get('duration'),
+        'view_count': info.get('view_count'),
+        'like_count': info.get('like_count'),
+        'channel': info.get('channel') or info.get('uploader'),
+        'channel_id': channel_id,
+        'channel_url': info.get('channel_url') or f"https://www.youtube.com/channel/{channel_id}",
+        'upload_date': info.get('upload_date'),
+        'formats': formats[:10],
+        'url': info.get('url'),
+        'webpage_url': info.get('webpage_url'),
+    }
+
+def remember_video_info(info, video_id=None):
+    """전체 추출 결과를 영상 ID 기준 메타데이터 캐시와 다운로드 재사용 캐시에 저장
+
+    video_id: 요청한 영상 ID (픽스처 기본 응답처럼 응답의 ID가 다를 때도 요청한 ID로 저장)
+    """
+    video_info = summarize_video_info(info)
+    video_id = video_id or video_info['id']
+    if video_id:
+        cache.set(video_info_key(video_id), video_info,
+                  timeout=app.config.get('CACHE_VIDEO_INFO_TIMEOUT', 3600))
+        result_cache.forget_failure('video_info', video_id)
+    remember_resolved_info(info, video_id)
+    return video_info
+
+def get_cached_video_info(video_id):
+    """캐시된 영상 메타데이터 (없으면 None, 추출하지 않음)"""
+    video_info = cache.get(video_info_key(video_id))
+    metrics.record_cache_lookup('video_info', video_info is not None)
+    return video_info
+
+@observe_extraction('video_info')
+def extract_video_info(video_url, video_id=None):
     ydl_opts = get_ydl_base_opts()
     ydl_opts['extract_flat'] = False
+    return remember_video_info(extractor.extract_info(video_url, ydl_opts), video_id)
+
+def get_video_info_cached(video_ref):
+    """비디오 정보 가져오기 (영상 ID 기준 캐시) - is_subscribed 제외
+
+    video_ref: 영상 ID 또는 URL (youtu.be, m.youtube.com, &t= 등은 같은 영상 ID로 정규화)
+    """
+    video_id = canonical_video_id(video_ref)
+    if video_id:
+        video_url = canonical_video_url(video_id)
+    elif '://' in video_ref:
+        video_url = video_ref
+    else:
+        video_url = canonical_video_url(video_ref)
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(video_url, download=False)
-            
-            formats = []
-            if info.get('formats'):
-                for f in info['formats']:
-                    if f.get('vcodec') != 'none' and f.get('acodec') != 'none':
-                        formats.append({
-                            'format_id': f.get('format_id'),
-                            'ext': f.get('ext'),
-                            'resolution': f.get('resolution', 'unknown'),
-                            'filesize': f.get('filesize'),
-                            'url': f.get('url'),
-                            'quality': f.get('height', 0)
-                        })
-            
-            formats.sort(key=lambda x: x.get('quality', 0), reverse=True)
-            channel_id = info.get('channel_id') or info.get('uploader_id', '')
-            
-            return {
-                'id': info.get('id'),
-                'title': info.get('title'),
-                'description': info.get('description', '')[:500],
-                'thumbnail': info.get('thumbnail'),
-                'duration': info.get('duration'),
-                'view_count': info.get('view_count'),
-                'like_count': info.get('like_count'),
-                'channel': info.get('channel') or info.get('uploader'),
-                'channel_id': channel_id,
-                'channel_url': info.get('channel_url') or f"https://www.youtube.com/channel/{channel_id}",
-                'upload_date': info.get('upload_date'),
-                'formats': formats[:10],
-                'url': info.get('url'),
-                'webpage_url': info.get('webpage_url'),
-            }
+        # 영상 ID가 있으면 성공 결과는 extract_video_info가 영상 ID 키로 저장
+        return result_cache.get('video_info', video_id or video_url,
+                                partial(extract_video_info, video_url, video_id),
+                                timeout=None if video_id else app.config.get('CACHE_VIDEO_INFO_TIMEOUT', 3600))
+    except CachedFailure as e:
+        return {'error': str(e), 'error_kind': e.kind}
     except Exception as e:
-        app.logger.error(f"Error getting video info: {e}")
-        return {'error': str(e)}
-
-def get_video_info(video_url):
+        app.logger.error("Error getting video info: %s", e)
+        return {'error': str(e), 'error_kind': classify_error(e)}
+
+def fill_video_entry(entry):
+    """플레이리스트/나중에 볼 항목의 ID를 정규화하고 빠진 값은 캐시된 메타데이터로 채움 (추출하지 않음)"""
+    entry['id'] = canonical_video_id(entry.get('id')) or entry.get('id')
+    if entry['id'] and any(value is None for value in entry.values()):
+        cached = get_cached_video_info(entry['id'])
+        if cached:
+            for key, value in entry.items():
+                if value is None:
+                    entry[key] = cached.get(key)
+    return entry
+
+def get_video_info(video_ref):
     """비디오 정보 가져오기 (구독 상태 포함)"""
-    video_info = get_video_info_cached(video_url)
+    video_info = get_video_info_cached(video_ref)
     if 'error' not in video_info:
         video_info['is_subscribed'] = is_channel_subscribed(video_info.get('channel_id', ''))
     return video_info
 
-def get_playlist_info(playlist_url):
+@observe_extraction('playlist')
+def extract_playlist_info(playlist_url):
     ydl_opts = get_ydl_base_opts()
     ydl_opts.update({
         'extract_flat': True,
         'ignoreerrors': True,
     })
 
+    info = extractor.extract_info(playlist_url, ydl_opts)
+    if not info:
+        raise ExtractorError(f"Playlist unavailable: {playlist_url}")
+
+    videos = []
+    if 'entries' in info:
+        for idx, entry in enumerate(info['entries']):
+            if entry:
+                videos.append({
+                    'id': entry.get('id'),
+                    'title': entry.get('title'),
+                    'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
+                    'duration': entry.get('duration'),
+                    'channel': entry.get('channel') or entry.get('uploader'),
+                    'index': idx
+                })
+
+    return {
+        'id': info.get('id'),
+        'title': info.get('title'),
+        'description': info.get('description', ''),
+        'thumbnail': info.get('thumbnail'),
+        'channel': info.get('channel') or info.get('uploader'),
+        'video_count': len(videos),
+        'videos': videos
+    }
+
+def get_playlist_info(playlist_url):
+    """플레이리스트 정보 (성공은 CACHE_PLAYLIST_TIMEOUT, 실패는 오류 종류별 짧은 시간 캐시)"""
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(playlist_url, download=False)
-            
-            videos = []
-            if info and 'entries' in info:
-                for idx, entry in enumerate(info['entries']):
-                    if entry:
-                        videos.append({
-                            'id': entry.get('id'),
-                            'title': entry.get('title'),
-                            'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
-                            'duration': entry.get('duration'),
-                            'channel': entry.get('channel') or entry.get('uploader'),
-                            'index': idx
-                        })
-            
-            return {
-                'id': info.get('id'),
-                'title': info.get('title'),
-                'description': info.get('description', ''),
-                'thumbnail': info.get('thumbnail'),
-                'channel': info.get('channel') or info.get('uploader'),
-                'video_count': len(videos),
-                'videos': videos
-            }
+        return result_cache.get('playlist', playlist_url, partial(extract_playlist_info, playlist_url),
+                                timeout=app.config.get('CACHE_PLAYLIST_TIMEOUT', 1800))
+    except CachedFailure as e:
+        return {'error': str(e), 'error_kind': e.kind}
     except Exception as e:
-        return {'error': str(e)}
+        app.logger.error("Error getting playlist info: %s", e)
+        return {'error': str(e), 'error_kind': classify_error(e)}
 
-def get_channel_videos(channel_url, max_videos=100):
+@observe_extraction('channel')
+def extract_channel_videos(channel_url, max_videos):
     ydl_opts = {
         'quiet': True,
         'no_warnings': True,
         'extract_flat': True,
         'playlistend': max_videos,
     }
-    
+
+    info = extractor.extract_info(channel_url, ydl_opts)
+    if not info:
+        raise ExtractorError(f"Channel unavailable: {channel_url}")
+
+    videos = []
+    if 'entries' in info:
+        for entry in info['entries'][:max_videos]:
+            if entry:
+                videos.append({
+                    'id': entry.get('id'),
+                    'title': entry.get('title'),
+                    'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
+                    'duration': entry.get('duration'),
+                    'view_count': entry.get('view_count'),
+                })
+
+    return {
+        'channel': info.get('channel') or info.get('uploader'),
+        'channel_id': info.get('channel_id') or info.get('uploader_id'),
+        'videos': videos
+    }
+
+def get_channel_videos(channel_url, max_videos=100):
+    """채널 영상 목록 (결과는 캐시하지 않고, 실패만 오류 종류별 짧은 시간 동안 재사용)"""
+    if '/channel/' in channel_url or '/@' in channel_url:
+        if not channel_url.endswith('/videos'):
+            channel_url = channel_url.rstrip('/') + '/videos'
+
     try:
-        if '/channel/' in channel_url or '/@' in channel_url:
-            if not channel_url.endswith('/videos'):
-                channel_url = channel_url.rstrip('/') + '/videos'
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(channel_url, download=False)
-            
-            videos = []
-            if info and 'entries' in info:
-                for entry in info['entries'][:max_videos]:
-                    if entry:
-                        videos.append({
-                            'id': entry.get('id'),
-                            'title': entry.get('title'),
-                            'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
-                            'duration': entry.get('duration'),
-                            'view_count': entry.get('view_count'),
-                        })
-            
-            return {
-                'channel': info.get('channel') or info.get('uploader'),
-                'channel_id': info.get('channel_id') or info.get('uploader_id'),
-                'videos': videos
-            }
+        return result_cache.get('channel', channel_url, partial(extract_channel_videos, channel_url, max_videos),
+                                cached=False)
+    except CachedFailure as e:
+        return {'error': str(e), 'error_kind': e.kind}
     except Exception as e:
-        return {'error': str(e)}
+        app.logger.error("Error getting channel videos: %s", e)
+        return {'error': str(e), 'error_kind': classify_error(e)}
 
-def get_related_videos(video_id, max_results=12):
+@observe_extraction('related')
+def get_related_videos(video_id, max_results=12, title=None, channel=None):
+    """관련 영상 (제목/채널을 이미 알고 있으면 영상 정보 추출 생략)"""
     ydl_opts = get_ydl_base_opts()
     ydl_opts['extract_flat'] = True
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            video_info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
-            title = video_info.get('title', '')
-            channel = video_info.get('channel', '')
-            search_query = f"{title[:30]} {channel}"
-            results = ydl.extract_info(f"ytsearch{max_results}:{search_query}", download=False)
-            
-            videos = []
-            if results and 'entries' in results:
-                for entry in results['entries']:
-                    if entry and entry.get('id') != video_id:
-                        videos.append({
-                            'id': entry.get('id'),
-                            'title': entry.get('title'),
-                            'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
-                            'duration': entry.get('duration'),
-                            'channel': entry.get('channel') or entry.get('uploader'),
-                            'view_count': entry.get('view_count'),
-                        })
-            
-            return videos[:max_results]
+        if title is None:
+            # watch 페이지/다운로드와 같은 영상 메타데이터 캐시 사용
+            video_info = get_video_info_cached(video_id)
+            if 'error' in video_info:
+                raise ExtractorError(video_info['error'])
+            title = video_info.get('title') or ''
+            channel = video_info.get('channel') or ''
+        search_query = f"{title[:30]} {channel or ''}"
+        results = extractor.extract_info(f"ytsearch{max_results}:{search_query}", ydl_opts)
+
+        videos = []
+        if results and 'entries' in results:
+            for entry in results['entries']:
+                if entry and entry.get('id') != video_id:
+                    videos.append({
+                        'id': entry.get('id'),
+                        'title': entry.get('title'),
+                        'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
+                        'duration': entry.get('duration'),
+                        'channel': entry.get('channel') or entry.get('uploader'),
+                        'view_count': entry.get('view_count'),
+                    })
+
+        return videos[:max_results]
     except Exception as e:
-        app.logger.error(f"Error getting related videos: {e}")
+        app.logger.error("Error getting related videos: %s", e)
         return []
 
-@cache.memoize(timeout=900)  # 15분 캐시
-def search_youtube(query, max_results=20):
-    """YouTube 검색 (캐시됨)"""
+@observe_extraction('search')
+def extract_search_results(query, max_results):
     ydl_opts = get_ydl_base_opts()
     ydl_opts['extract_flat'] = True
 
+    results = extractor.extract_info(f"ytsearch{max_results}:{query}", ydl_opts)
+
+    videos = []
+    if results and 'entries' in results:
+        for entry in results['entries']:
+            if entry:
+                videos.append({
+                    'id': entry.get('id'),
+                    'title': entry.get('title'),
+                    'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
+                    'duration': entry.get('duration'),
+                    'channel': entry.get('channel') or entry.get('uploader'),
+                    'channel_id': entry.get('channel_id') or entry.get('uploader_id'),
+                    'view_count': entry.get('view_count'),
+                })
+    return videos
+
+def search_youtube(query, max_results=20):
+    """YouTube 검색 (성공은 CACHE_SEARCH_TIMEOUT, 실패는 오류 종류별 짧은 시간 캐시)"""
+    key = f"{max_results}:{hashlib.md5(query.encode('utf-8')).hexdigest()}"
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            results = ydl.extract_info(f"ytsearch{max_results}:{query}", download=False)
-            
-            videos = []
-            if results and 'entries' in results:
-                for entry in results['entries']:
-                    if entry:
-                        videos.append({
-                            'id': entry.get('id'),
-                            'title': entry.get('title'),
-                            'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
-                            'duration': entry.get('duration'),
-                            'channel': entry.get('channel') or entry.get('uploader'),
-                            'channel_id': entry.get('channel_id') or entry.get('uploader_id'),
-                            'view_count': entry.get('view_count'),
-                        })
-            return videos
+        return result_cache.get('search', key, partial(extract_search_results, query, max_results),
+                                timeout=app.config.get('CACHE_SEARCH_TIMEOUT', 900))
+    except CachedFailure as e:
+        return {'error': str(e), 'error_kind': e.kind}
     except Exception as e:
-        app.logger.error(f"Error searching YouTube: {e}")
-        return {'error': str(e)}
+        app.logger.error("Error searching YouTube: %s", e)
+        return {'error': str(e), 'error_kind': classify_error(e)}
 
+@observe_extraction('trending')
 def get_trending_videos(max_results=20, country=None):
     """트렌딩 영상 가져오기 (trending 페이지 대신 인기 검색어 사용)"""
     if country is None:
         country = get_country_setting()
-    
+
     ydl_opts = get_ydl_base_opts()
     ydl_opts.update({
         'extract_flat': True,
@@ -1082,30 +2488,104 @@ def get_trending_videos(max_results=20, country=None):
     })
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            # trending 페이지 대신 인기 검색어로 대체
-            popular_queries = ['music', 'gaming', 'news', 'sports', 'entertainment']
-            query = random.choice(popular_queries)
-            results = ydl.extract_info(f"ytsearch{max_results}:{query}", download=False)
-
-            videos = []
-            if results and 'entries' in results:
-                for entry in results['entries'][:max_results]:
-                    if entry:
-                        videos.append({
-                            'id': entry.get('id'),
-                            'title': entry.get('title'),
-                            'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
-                            'duration': entry.get('duration'),
-                            'channel': entry.get('channel') or entry.get('uploader'),
-                            'view_count': entry.get('view_count'),
-                        })
-            return videos
+        # trending 페이지 대신 인기 검색어로 대체
+        popular_queries = ['music', 'gaming', 'news', 'sports', 'entertainment']
+        query = random.choice(popular_queries)
+        results = extractor.extract_info(f"ytsearch{max_results}:{query}", ydl_opts)
+
+        videos = []
+        if results and 'entries' in results:
+            for entry in results['entries'][:max_results]:
+                if entry:
+                    videos.append({
+                        'id': entry.get('id'),
+                        'title': entry.get('title'),
+                        'thumbnail': entry.get('thumbnail') or f"https://img.youtube.com/vi/{entry.get('id')}/mqdefault.jpg",
+                        'duration': entry.get('duration'),
+                        'channel': entry.get('channel') or entry.get('uploader'),
+                        'view_count': entry.get('view_count'),
+                    })
+        return videos
     except:
         return []
 
+# ============== 정적 리소스 (fingerprint) ==============
+
+# 해시를 붙이지 않는 정적 파일 - 서비스 워커는 고정 URL이어야 하고 아바타는 실행 중에 바뀜
+UNHASHED_STATIC_PATHS = ('sw.js', 'avatars/')
+
+def build_asset_manifest(static_folder):
+    """정적 파일 내용 해시로 {원래 경로: 해시 포함 경로} 매니페스트 생성"""
+    manifest = {}
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            full_path = os.path.join(root, name)
+            rel_path = os.path.relpath(full_path, static_folder).replace(os.sep, '/')
+            if rel_path.startswith(UNHASHED_STATIC_PATHS):
+                continue
+            with open(full_path, 'rb') as f:
+                digest = hashlib.md5(f.read()).hexdigest()[:10]
+            base, ext = os.path.splitext(rel_path)
+            manifest[rel_path] = f"{base}.{digest}{ext}"
+    return manifest
+
+# create_app()에서 채움
+asset_manifest = {}
+hashed_assets = {}
+asset_version = None
+
+def load_asset_manifest():
+    """정적 리소스 매니페스트와 역방향 조회 테이블, 버전 해시 갱신"""
+    global asset_version
+    asset_manifest.clear()
+    asset_manifest.update(build_asset_manifest(app.static_folder))
+    hashed_assets.clear()
+    hashed_assets.update({hashed: original for original, hashed in asset_manifest.items()})
+    asset_version = hashlib.md5(json.dumps(asset_manifest, sort_keys=True).encode()).hexdigest()[:10]
+
+@app.template_global()
+def asset_url(filename):
+    """해시가 붙은 정적 리소스 URL (매니페스트에 없으면 일반 static URL)"""
+    hashed = asset_manifest.get(filename)
+    if hashed is None:
+        return url_for('static', filename=filename)
+    return url_for('hashed_asset', filename=hashed)
+
+@app.route('/assets/<path:filename>')
+def hashed_asset(filename):
+    """해시 포함 정적 리소스 제공 (immutable 캐시)"""
+    original = hashed_assets.get(filename)
+    if original is None:
+        return "File not found", 404
+    response = send_file(os.path.join(app.static_folder, original),
+                         max_age=app.config.get('ASSET_MAX_AGE', 365 * 24 * 3600))
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+@app.route('/static/sw.js')
+def service_worker():
+    """서비스 워커 - 사전 캐싱할 해시 URL 목록을 스크립트 앞에 주입"""
+    with open(os.path.join(app.static_folder, 'sw.js'), encoding='utf-8') as f:
+        script = f.read()
+    precache = {filename: asset_url(filename) for filename in asset_manifest}
+    header = (f"self.ASSET_VERSION = {json.dumps(asset_version)};\n"
+              f"self.ASSET_MANIFEST = {json.dumps(precache, sort_keys=True)};\n")
+    response = Response(header + script, mimetype='application/javascript')
+    # 매니페스트가 바뀌면 스크립트 내용도 바뀌므로 매번 재검증해 업데이트 감지
+    response.cache_control.no_cache = True
+    return response
+
 # ============== 라우트 ==============
 
+def stream_page(template_name, loader, **context):
+    """페이지 셸을 먼저 보내고, 무거운 데이터는 템플릿이 load()를 호출할 때 가져오는 스트리밍 응답
+
+    loader의 결과는 한 번만 계산되어 content 블록 안에서 공유
+    (title 블록에서 호출하면 <head>부터 데이터를 기다리므로 제목은 본문에서 document.title로 설정)
+    """
+    return Response(stream_template(template_name, load=lru_cache(maxsize=None)(loader), **context))
+
 @app.route('/favicon.ico')
 def favicon():
     """Favicon 제공"""
@@ -1114,21 +2594,97 @@ def favicon():
         mimetype='image/svg+xml'
     )
 
-@app.route('/')
-def index():
-    history = load_history()[:8]
-    channels = load_channels()[:6]
-    trending = get_trending_videos(8)
+# ============== 홈 화면 선반(shelf) ==============
+
+# 홈 화면의 원격 선반(인기, 추천)을 동시에 가져오는 풀
+shelf_executor = None
+
+def configure_shelf_executor():
+    """선반 풀을 HOME_SHELF_WORKERS로 생성 (create_app에서 설정이 바뀌면 다시 호출)"""
+    global shelf_executor
+    if shelf_executor is not None:
+        shelf_executor.shutdown(wait=False)
+    shelf_executor = ThreadPoolExecutor(
+        max_workers=app.config.get('HOME_SHELF_WORKERS', 4),
+        thread_name_prefix='home-shelf'
+    )
+
+configure_shelf_executor()
+
+def shelf_cache_key(name, scope):
+    return f"shelf:{name}:{scope}"
+
+def fetch_trending_shelf(country):
+    """인기 영상 선반 - 결과는 마감 시간을 넘겨 도착해도 캐시에 저장"""
+    videos = get_trending_videos(8, country=country)
+    if videos:
+        cache.set(shelf_cache_key('trending', country), videos,
+                  timeout=app.config.get('HOME_SHELF_CACHE_TIMEOUT', 900))
+    return videos
+
+# 진행 중인 관련 영상 요청 {video_id: Future} - 같은 영상은 한 번만 요청
+related_inflight = {}
+related_inflight_lock = threading.Lock()
+
+def fetch_related_shelf(video_id, title=None, channel=None):
+    """관련 영상 선반 - 홈 추천, watch 페이지, /api/recommended가 캐시 공유"""
+    videos = get_related_videos(video_id, max_results=12, title=title, channel=channel)
+    if videos:
+        cache.set(shelf_cache_key('related', video_id), videos,
+                  timeout=app.config.get('HOME_SHELF_CACHE_TIMEOUT', 900))
+    return videos
+
+def prefetch_related_shelf(video_id, title=None, channel=None):
+    """관련 영상 선반을 백그라운드에서 가져오기 시작 (이미 진행 중이면 그 Future 반환)"""
+    with related_inflight_lock:
+        future = related_inflight.get(video_id)
+        if future is None:
+            future = shelf_executor.submit(fetch_related_shelf, video_id, title, channel)
+            related_inflight[video_id] = future
+            future.add_done_callback(lambda f: related_inflight.pop(video_id, None))
+    return future
+
+def get_related_shelf(video_id, title=None, channel=None):
+    """캐시된 관련 영상 선반, 없으면 가져올 때까지 대기"""
+    videos = cache.get(shelf_cache_key('related', video_id))
+    metrics.record_cache_lookup('related_shelf', videos is not None)
+    if videos is None:
+        videos = prefetch_related_shelf(video_id, title, channel).result()
+    return videos
+
+def build_home_shelves(history, country):
+    """홈 화면 원격 선반(인기, 추천) - 마감 시간 안에 모이지 않은 선반은 pending_shelves로 표시"""
+    # 원격 선반은 병렬로 요청하고 전체 마감 시간까지만 기다림
+    sample_videos = random.sample(history[:5], min(2, len(history[:5]))) if history else []
+    trending_future = shelf_executor.submit(fetch_trending_shelf, country)
+    related_futures = {
+        video.get('id'): prefetch_related_shelf(video.get('id'), video.get('title'), video.get('channel'))
+        for video in sample_videos
+    }
+    wait([trending_future, *related_futures.values()],
+         timeout=app.config.get('HOME_SHELF_DEADLINE', 2.5))
+
+    pending_shelves = []
+
+    # 시간 안에 못 받은 선반은 캐시에서, 캐시도 없으면 자리표시자로 렌더링
+    if trending_future.done():
+        trending = trending_future.result()
+    else:
+        trending = cache.get(shelf_cache_key('trending', country))
+        if trending is None:
+            trending = []
+            pending_shelves.append('trending')
 
     # 시청 기록 기반 추천 영상
     recommended = []
     if history:
-        # 최근 시청한 영상들에서 랜덤으로 선택
-        import random
-        sample_videos = random.sample(history[:5], min(2, len(history[:5])))
-        for video in sample_videos:
-            related = get_related_videos(video.get('id'), max_results=6)
-            recommended.extend(related)
+        for video_id, future in related_futures.items():
+            if future.done():
+                recommended.extend(future.result()[:6])
+            else:
+                cached = cache.get(shelf_cache_key('related', video_id))
+                if cached:
+                    recommended.extend(cached[:6])
 
         # 중복 제거 및 셔플
         seen_ids = set()
@@ -1140,8 +2696,26 @@ def index():
 
         random.shuffle(unique_recommended)
         recommended = unique_recommended[:12]
+        if not recommended and not all(f.done() for f in related_futures.values()):
+            pending_shelves.append('recommended')
 
-    return render_template('index.html', history=history, channels=channels, trending=trending, recommended=recommended)
+    if pending_shelves:
+        app.logger.debug("Home shelves missed deadline: %s", pending_shelves)
+
+    return {'trending': trending, 'recommended': recommended, 'pending_shelves': pending_shelves}
+
+@app.route('/')
+def index():
+    history = load_history()[:8]
+    channels = load_channels()[:6]
+    country = get_country_setting()
+
+    # 원격 선반은 셸을 먼저 보낸 뒤 본문 렌더링 시점에 모음
+    return stream_page('index.html', lambda: build_home_shelves(history, country),
+                       history=history, channels=channels)
+
+# 요청 경로 밖에서 처리하는 저장 작업 (순서 보장을 위해 단일 스레드)
+background_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='background-storage')
 
 @app.route('/watch')
 def watch():
@@ -1152,67 +2726,67 @@ def watch():
     if not video_url:
         return redirect(url_for('index'))
     
-    if not video_url.startswith('http'):
-        video_url = f"https://www.youtube.com/watch?v={video_url}"
-    
-    video_info = get_video_info(video_url)
+    user_playlists = load_playlists()
     
+    # 사용자 플레이리스트만 바로 렌더링 - 원격 플레이리스트와 관련 영상은 페이지에서 API로 로드
     playlist_info = None
+    remote_playlist_id = None
     if playlist_id:
         if playlist_id.startswith('pl_'):
-            playlists = load_playlists()
-            for pl in playlists:
+            for pl in user_playlists:
                 if pl['id'] == playlist_id:
-                    playlist_info = pl
-                    playlist_info['is_custom'] = True
+                    playlist_info = dict(pl, is_custom=True)
                     break
         else:
-            playlist_info = get_playlist_info(f"https://www.youtube.com/playlist?list={playlist_id}")
-            if playlist_info and 'error' not in playlist_info:
-                playlist_info['is_custom'] = False
+            remote_playlist_id = playlist_id
     
-    related_videos = []
-    if 'error' not in video_info:
-        related_videos = get_related_videos(video_info['id'])
-        add_to_history({
-            'id': video_info.get('id'),
-            'title': video_info.get('title'),
-            'thumbnail': video_info.get('thumbnail'),
-            'channel': video_info.get('channel'),
-            'channel_id': video_info.get('channel_id'),
-            'duration': video_info.get('duration')
-        })
+    history_file = get_data_path('history')
     
-    user_playlists = load_playlists()
+    def load_video():
+        video_info = get_video_info(video_url)
+        if 'error' not in video_info:
+            # 관련 영상은 미리 요청해 두고, 시청 기록은 백그라운드에서 저장
+            prefetch_related_shelf(video_info['id'], video_info.get('title'), video_info.get('channel'))
+            background_executor.submit(add_to_history, {
+                'id': video_info.get('id'),
+                'title': video_info.get('title'),
+                'thumbnail': video_info.get('thumbnail'),
+                'channel': video_info.get('channel'),
+                'channel_id': video_info.get('channel_id'),
+                'duration': video_info.get('duration')
+            }, history_file)
+        return {'video': video_info}
     
-    return render_template('watch.html', 
-                         video=video_info, 
-                         playlist=playlist_info,
-                         playlist_index=playlist_index,
-                         related_videos=related_videos,
-                         user_playlists=user_playlists)
+    return stream_page('watch.html', load_video,
+                       playlist=playlist_info,
+                       remote_playlist_id=remote_playlist_id,
+                       playlist_index=playlist_index,
+                       user_playlists=user_playlists)
 
 @app.route('/search')
-@limiter.limit(app.config.get('RATELIMIT_SEARCH', '10 per minute'))
+@limiter.limit(lambda: app.config.get('RATELIMIT_SEARCH', '10 per minute'))
 def search():
     """검색 페이지 (Rate limited)"""
     query = request.args.get('q', '')
-    results = []
     search_history = load_search_history()
     
     if query:
         # 검색 기록 저장
         save_search_query(query)
-        
-        results = search_youtube(query, max_results=30)
-        if isinstance(results, list):
-            for video in results:
-                if video.get('channel_id'):
-                    video['is_subscribed'] = is_channel_subscribed(video['channel_id'])
+    
+    def load_results():
+        results = []
+        if query:
+            results = search_youtube(query, max_results=30)
+            if isinstance(results, list):
+                for video in results:
+                    if video.get('channel_id'):
+                        video['is_subscribed'] = is_channel_subscribed(video['channel_id'])
+        return {'results': results}
     
     user_playlists = load_playlists()
-    return render_template('search.html', query=query, results=results, 
-                         user_playlists=user_playlists, search_history=search_history)
+    return stream_page('search.html', load_results, query=query,
+                       user_playlists=user_playlists, search_history=search_history)
 
 @app.route('/history')
 def history():
@@ -1260,34 +2834,41 @@ def channels():
 @app.route('/channel/<channel_id>')
 def channel_detail(channel_id):
     channel_url = f"https://www.youtube.com/channel/{channel_id}"
-    channel_info = get_channel_videos(channel_url)
-    
-    if 'error' in channel_info:
-        return render_template('channel_detail.html', channel=None, error=channel_info['error'])
+    is_subscribed = is_channel_subscribed(channel_id)
     
-    channel_info['channel_id'] = channel_id
-    channel_info['is_subscribed'] = is_channel_subscribed(channel_id)
+    def load_channel():
+        channel_info = get_channel_videos(channel_url)
+        
+        if 'error' in channel_info:
+            return {'channel': None, 'error': channel_info['error']}
+        
+        channel_info['channel_id'] = channel_id
+        channel_info['is_subscribed'] = is_subscribed
+        return {'channel': channel_info, 'error': None}
     
-    return render_template('channel_detail.html', channel=channel_info)
+    return stream_page('channel_detail.html', load_channel)
 
 @app.route('/feed')
 def feed():
     channels = load_channels()
-    all_videos = []
     
-    for channel in channels[:15]:  # 더 많은 채널에서 가져오기
-        channel_url = channel.get('channel_url', '')
-        if channel_url:
-            videos = get_channel_videos(channel_url, max_videos=10)  # 채널당 더 많은 영상
-            if 'error' not in videos:
-                for video in videos.get('videos', []):
-                    video['channel'] = channel.get('name')
-                    video['channel_id'] = channel.get('channel_id')
-                    all_videos.append(video)
-    
-    random.shuffle(all_videos)
+    def load_feed():
+        all_videos = []
+        
+        for channel in channels[:15]:  # 더 많은 채널에서 가져오기
+            channel_url = channel.get('channel_url', '')
+            if channel_url:
+                videos = get_channel_videos(channel_url, max_videos=10)  # 채널당 더 많은 영상
+                if 'error' not in videos:
+                    for video in videos.get('videos', []):
+                        video['channel'] = channel.get('name')
+                        video['channel_id'] = channel.get('channel_id')
+                        all_videos.append(video)
+        
+        random.shuffle(all_videos)
+        return {'videos': all_videos[:60]}  # 더 많은 영상 표시
     
-    return render_template('feed.html', videos=all_videos[:60], channels=channels)  # 더 많은 영상 표시
+    return stream_page('feed.html', load_feed, channels=channels)
 
 # ============== API 엔드포인트 ==============
 
@@ -1326,8 +2907,8 @@ def api_create_playlist():
 def api_add_to_playlist(playlist_id):
     try:
         data = request.get_json()
-        app.logger.debug(f"Adding to playlist {playlist_id}")
-        app.logger.debug(f"Request data: {data}")
+        app.logger.debug("Adding to playlist %s", playlist_id)
+        app.logger.debug("Request data: %s", data)
 
         video_info = {
             'id': data.get('video_id'),
@@ -1336,17 +2917,18 @@ def api_add_to_playlist(playlist_id):
             'duration': data.get('duration'),
             'channel': data.get('channel')
         }
-        app.logger.debug(f"Video info: {video_info}")
+        fill_video_entry(video_info)
+        app.logger.debug("Video info: %s", video_info)
 
         success = add_to_playlist(playlist_id, video_info)
-        app.logger.debug(f"Add result: {success}")
+        app.logger.debug("Add result: %s", success)
 
         if success:
             return jsonify({'success': True, 'message': '플레이리스트에 추가되었습니다.'})
         else:
             return jsonify({'success': False, 'message': '이미 플레이리스트에 있거나 추가할 수 없습니다.'})
     except Exception as e:
-        app.logger.error(f"Error adding to playlist: {e}", exc_info=True)
+        app.logger.error("Error adding to playlist: %s", e, exc_info=True)
         return jsonify({'success': False, 'message': f'오류 발생: {str(e)}'})
 
 @app.route('/api/playlist/<playlist_id>/remove', methods=['POST'])
@@ -1386,7 +2968,7 @@ def api_reorder_playlist(playlist_id):
 
         return jsonify({'success': False, 'message': '플레이리스트를 찾을 수 없습니다'})
     except Exception as e:
-        app.logger.error(f"Error reordering playlist: {e}")
+        app.logger.error("Error reordering playlist: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 @app.route('/api/playlist/<playlist_id>/move', methods=['POST'])
@@ -1432,7 +3014,7 @@ def api_move_video_in_playlist(playlist_id):
 
         return jsonify({'success': False, 'message': '플레이리스트를 찾을 수 없습니다'})
     except Exception as e:
-        app.logger.error(f"Error moving video: {e}")
+        app.logger.error("Error moving video: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 # ============== 나중에 볼 영상 API ==============
@@ -1449,6 +3031,7 @@ def api_add_watch_later():
             'channel': data.get('channel'),
             'channel_id': data.get('channel_id')
         }
+        fill_video_entry(video_info)
 
         success = add_to_watch_later(video_info)
         if success:
@@ -1456,7 +3039,7 @@ def api_add_watch_later():
         else:
             return jsonify({'success': False, 'message': '이미 추가된 영상입니다'})
     except Exception as e:
-        app.logger.error(f"Error adding to watch later: {e}")
+        app.logger.error("Error adding to watch later: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 @app.route('/api/watch-later/remove', methods=['POST'])
@@ -1467,7 +3050,7 @@ def api_remove_watch_later():
         remove_from_watch_later(video_id)
         return jsonify({'success': True, 'message': '나중에 볼 영상에서 제거되었습니다'})
     except Exception as e:
-        app.logger.error(f"Error removing from watch later: {e}")
+        app.logger.error("Error removing from watch later: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 @app.route('/api/watch-later/check/<video_id>', methods=['GET'])
@@ -1488,7 +3071,7 @@ def api_update_progress():
         update_progress(video_id, current_time, duration)
         return jsonify({'success': True})
     except Exception as e:
-        app.logger.error(f"Error updating progress: {e}")
+        app.logger.error("Error updating progress: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 @app.route('/api/progress/<video_id>', methods=['GET'])
@@ -1550,7 +3133,7 @@ def api_get_stats():
 
         return jsonify({'success': True, 'stats': stats})
     except Exception as e:
-        app.logger.error(f"Error getting stats: {e}")
+        app.logger.error("Error getting stats: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 @app.route('/api/channel/<channel_id>/videos', methods=['GET'])
@@ -1579,11 +3162,11 @@ def api_get_channel_videos(channel_id):
             'total': len(channel_info.get('videos', []))
         })
     except Exception as e:
-        app.logger.error(f"Error loading more videos: {e}")
+        app.logger.error("Error loading more videos: %s", e)
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/api/search', methods=['GET'])
-@limiter.limit(app.config.get('RATELIMIT_SEARCH', '10 per minute'))
+@limiter.limit(lambda: app.config.get('RATELIMIT_SEARCH', '10 per minute'))
 def api_search():
     """검색 API (Rate limited: 분당 10회)"""
     try:
@@ -1594,7 +3177,7 @@ def api_search():
         if not query:
             return jsonify({'success': False, 'error': 'Query is required'})
 
-        app.logger.debug(f"API Search: {query}, offset: {offset}, limit: {limit}")
+        app.logger.debug("API Search: %s, offset: %d, limit: %d", query, offset, limit)
 
         # 더 많은 결과 요청 (최대 50개까지)
         max_results = min(offset + limit, 50)
@@ -1620,7 +3203,7 @@ def api_search():
             'total': len(results)
         })
     except Exception as e:
-        app.logger.error(f"Error in API search: {e}", exc_info=True)
+        app.logger.error("Error in API search: %s", e, exc_info=True)
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/api/recommended', methods=['GET'])
@@ -1630,7 +3213,7 @@ def api_recommended():
         offset = request.args.get('offset', 0, type=int)
         limit = request.args.get('limit', 12, type=int)
 
-        app.logger.debug(f"API Recommended: offset: {offset}, limit: {limit}")
+        app.logger.debug("API Recommended: offset: %d, limit: %d", offset, limit)
 
         history = load_history()
 
@@ -1644,7 +3227,7 @@ def api_recommended():
 
         all_recommended = []
         for video in sample_videos:
-            related = get_related_videos(video.get('id'), max_results=10)
+            related = get_related_shelf(video.get('id'))
             all_recommended.extend(related)
 
         # 중복 제거
@@ -1669,7 +3252,39 @@ def api_recommended():
             'total': len(unique_recommended)
         })
     except Exception as e:
-        app.logger.error(f"Error in API recommended: {e}", exc_info=True)
+        app.logger.error("Error in API recommended: %s", e, exc_info=True)
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/related/<video_id>', methods=['GET'])
+def api_related(video_id):
+    """관련 영상 API (watch 페이지 사이드바)"""
+    try:
+        videos = get_related_shelf(video_id)
+        return jsonify({'success': True, 'videos': videos})
+    except Exception as e:
+        app.logger.error("Error in API related: %s", e, exc_info=True)
+        return jsonify({'success': False, 'error': str(e)})
+
+@app.route('/api/playlist/<playlist_id>/info', methods=['GET'])
+def api_playlist_info(playlist_id):
+    """원격 플레이리스트 정보 API (watch 페이지 사이드바)"""
+    playlist_info = get_playlist_info(f"https://www.youtube.com/playlist?list={playlist_id}")
+    if not playlist_info or 'error' in playlist_info:
+        return jsonify({'success': False, 'error': (playlist_info or {}).get('error')})
+    playlist_info['is_custom'] = False
+    return jsonify({'success': True, 'playlist': playlist_info})
+
+@app.route('/api/trending', methods=['GET'])
+def api_trending():
+    """인기 영상 선반 API (홈 화면 마감 시간 안에 못 받은 경우 브라우저에서 호출)"""
+    try:
+        country = get_country_setting()
+        videos = cache.get(shelf_cache_key('trending', country))
+        if videos is None:
+            videos = fetch_trending_shelf(country)
+        return jsonify({'success': True, 'videos': videos})
+    except Exception as e:
+        app.logger.error("Error in API trending: %s", e, exc_info=True)
         return jsonify({'success': False, 'error': str(e)})
 
 @app.route('/api/search/suggestions', methods=['GET'])
@@ -1704,7 +3319,7 @@ def api_get_settings():
             'countries': SUPPORTED_COUNTRIES
         })
     except Exception as e:
-        app.logger.error(f"Error getting settings: {e}")
+        app.logger.error("Error getting settings: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 @app.route('/api/settings', methods=['POST'])
@@ -1725,7 +3340,7 @@ def api_save_settings():
         save_settings(settings)
         return jsonify({'success': True, 'message': '설정이 저장되었습니다.', 'settings': settings})
     except Exception as e:
-        app.logger.error(f"Error saving settings: {e}")
+        app.logger.error("Error saving settings: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 @app.route('/api/settings/country', methods=['GET'])
@@ -1781,5 +3396,135 @@ def format_timeago(iso_string):
     except:
         return ''
 
+# ============== 다운로드 서비스 전달 ==============
+
+# 웹 워커(SERVER_ROLE='web')가 다운로드 프로세스로 넘기는 엔드포인트
+# 다운로드 작업, 진행률, 파일은 모두 다운로드 프로세스 메모리/디스크에 있음
+DOWNLOAD_SERVICE_ENDPOINTS = {
+    'api_download', 'api_download_progress', 'api_download_metrics', 'api_download_cancel',
+    'serve_download', 'api_download_playlist', 'api_batch_progress', 'serve_batch_download',
+    'api_download_usage',
+}
+FORWARDED_REQUEST_HEADERS = ('Cookie', 'Content-Type', 'Accept', 'Accept-Encoding', 'Range', 'User-Agent')
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'te', 'trailer', 'upgrade',
+                      'proxy-authenticate', 'proxy-authorization', 'content-length'}
+# 파일/ZIP을 스트리밍하는 엔드포인트 - 읽기 타임아웃을 따로 적용
+DOWNLOAD_STREAM_ENDPOINTS = {'serve_download', 'serve_batch_download'}
+
+def attach_resolved_info(body):
+    """다운로드 시작 요청에 웹 워커가 해석해 둔 info를 실어 보냄 (다운로드 프로세스와 캐시를 공유하지 않으므로)"""
+    if not body:
+        return body
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    if not isinstance(data, dict):
+        return body
+
+    # 클라이언트가 보낸 값은 신뢰하지 않음
+    data.pop('resolved_info', None)
+    video_id = canonical_video_id(data.get('video_id'))
+    entry = cache.get(resolved_info_key(video_id)) if video_id else None
+    if entry:
+        data['resolved_info'] = entry
+    return json.dumps(data).encode('utf-8')
+
+def forward_download_request():
+    """다운로드 관련 요청을 다운로드 서비스로 전달 (인증/Rate Limit 검사 후 실행)"""
+    if request.endpoint not in DOWNLOAD_SERVICE_ENDPOINTS:
+        return None
+
+    url = app.config['DOWNLOAD_SERVICE_URL'].rstrip('/') + request.full_path.rstrip('?')
+    headers = {name: request.headers[name] for name in FORWARDED_REQUEST_HEADERS if name in request.headers}
+    headers['X-Forwarded-For'] = request.remote_addr or ''
+    # 클라이언트가 보내지 않았어도 이 요청에 붙인 ID로 두 프로세스의 로그를 이어 봄
+    headers['X-Request-ID'] = g.request_id
+    body = request.get_data() or None
+    if request.endpoint == 'api_download':
+        body = attach_resolved_info(body)
+    upstream_request = urllib.request.Request(url, data=body, headers=headers, method=request.method)
+    if request.endpoint in DOWNLOAD_STREAM_ENDPOINTS:
+        timeout = app.config.get('DOWNLOAD_SERVICE_STREAM_TIMEOUT')
+    else:
+        timeout = app.config.get('DOWNLOAD_SERVICE_TIMEOUT', 30)
+    try:
+        upstream = urllib.request.urlopen(upstream_request, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        upstream = e  # 4xx/5xx 응답도 본문과 함께 그대로 전달
+    except (urllib.error.URLError, OSError) as e:
+        app.logger.error("Download service unavailable: %s", e)
+        return jsonify({'success': False, 'message': '다운로드 서비스에 연결할 수 없습니다.'}), 502
+
+    def generate():
+        with upstream:
+            while True:
+                chunk = upstream.read(64 * 1024)
+                if not chunk:
+                    break
+                yield chunk
+
+    response = Response(generate(), status=upstream.status)
+    response.headers.clear()
+    for name, value in upstream.headers.items():
+        if name.lower() not in HOP_BY_HOP_HEADERS:
+            response.headers.add(name, value)
+    # 다운로드 서비스가 이미 압축/ETag 처리를 했으므로 그대로 통과
+    response.direct_passthrough = True
+    return response
+
+# ============== 애플리케이션 팩토리 ==============
+
+def create_app(config=None):
+    """앱 초기화 (로깅, 확장, 디렉토리, 정적 매니페스트, 백그라운드 작업)
+
+    config: 설정 클래스/객체 또는 dict - 기본 설정 위에 덮어씀.
+    라우트가 모듈의 app에 등록되어 있으므로 같은 프로세스에서는 한 번만 초기화됨
+    """
+    if app.extensions.get('malgeuntube_ready'):
+        return app
+
+    started = time.perf_counter()
+    if isinstance(config, dict):
+        app.config.update(config)
+    elif config is not None:
+        app.config.from_object(config)
+    # 설정 클래스의 초기화 훅 (디렉토리 생성, 프로덕션 SECRET_KEY 확인)
+    (getattr(config, 'init_app', None) or config_obj.init_app)(app)
+
+    # SERVER_ROLE: 'all'(단일 프로세스), 'web'(다운로드는 다운로드 서비스로 전달), 'downloads'(다운로드 전용)
+    role = app.config.get('SERVER_ROLE', 'all')
+    if role == 'downloads':
+        # 웹 워커가 Rate Limit을 검사한 뒤 로컬에서만 전달하므로 중복 검사하지 않음
+        app.config['RATELIMIT_ENABLED'] = False
+
+    setup_logging()
+    init_extensions()
+    configure_storage_paths()
+    configure_extractor()
+    configure_download_pipeline()
+    configure_shelf_executor()
+    ensure_directories()
+    load_asset_manifest()
+
+    if role in ('all', 'downloads'):
+        threading.Thread(target=run_download_janitor, name='download-janitor', daemon=True).start()
+        for stage_name, stage in pipeline_stages.items():
+            metrics.DOWNLOAD_STAGE_WORKERS.labels(stage_name).set(stage['workers'])
+    if role == 'web' and app.config.get('DOWNLOAD_SERVICE_URL'):
+        app.before_request(forward_download_request)
+
+    # yt-dlp는 첫 요청 전에 백그라운드에서 미리 로드 (워커 부팅은 기다리지 않음)
+    # 픽스처 재생 중에는 다운로드를 시작할 때 로드
+    if app.config.get('PRELOAD_YT_DLP', True) and extractor.name != 'fixture':
+        threading.Thread(target=load_yt_dlp, name='yt-dlp-preload', daemon=True).start()
+
+    app.extensions['malgeuntube_ready'] = True
+    startup_timings['create_app'] = time.perf_counter() - started
+    startup_timings['import_to_ready'] = time.perf_counter() - IMPORT_STARTED_AT
+    app.logger.info("App ready (%s) in %.0fms (create_app %.0fms)", role,
+                    startup_timings['import_to_ready'] * 1000, startup_timings['create_app'] * 1000)
+    return app
+
 if __name__ == '__main__':
-    app.run(debug=True, port=5678)
\ No newline at end of file
+    create_app().run(debug=True, port=5678)
\ No newline at end of file
@@ -0,0 +1,3 @@
+"""
+MalgeunTube 성능 측정 도구 (python -m benchmarks.routes)
+"""
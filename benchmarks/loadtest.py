@@ -0,0 +1,383 @@
+"""
+로컬 부하 테스트
+
+실제 시청자와 비슷한 세션을 동시 사용자 수를 늘려가며 재생하고, 단계별/엔드포인트별
+처리량, 오류율, 지연 시간 백분위(p50/p95/p99)를 출력.
+
+    python -m benchmarks.loadtest run                                  # 합성 추출기 서버를 띄워서 측정
+    python -m benchmarks.loadtest run --users 10,50,100 --stage-duration 60
+    python -m benchmarks.loadtest run --time-scale 0.2                 # 대기 시간을 1/5로 줄여 빠르게
+    python -m benchmarks.loadtest run --target http://127.0.0.1:5000 --profile-id <id>
+
+세션 종류 (--mix로 비율 지정)
+    viewer      검색 → 시청 페이지 → 관련 영상 → 5초마다 /api/progress/update
+    scroller    검색 페이지 → /api/search 무한 스크롤 → /api/recommended 무한 스크롤
+    downloader  /api/download → 1초마다 /api/download/progress 조회
+
+--target 없이 실행하면 합성 추출기와 가짜 다운로드 작업을 쓰는 앱을 임시 데이터로 띄움
+(werkzeug 스레드 서버). 운영 서버(python -m malgeuntube serve)를 측정하려면
+EXTRACTOR_BACKEND=fixture로 띄운 뒤 --target으로 지정
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from http.cookiejar import CookieJar
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from benchmarks.profiles import QUERY_WORDS, add_size_arguments, generate_profiles, resolve_size, write_json  # noqa: E402
+
+# app.py의 기본 계정
+DEFAULT_USERNAME = 'malgeun_admin'
+DEFAULT_PASSWORD = 'Tube2024!@Secure'
+
+# 앱 화면의 실제 주기 (초)
+PROGRESS_BEACON_INTERVAL = 5
+DOWNLOAD_POLL_INTERVAL = 1
+SCROLL_INTERVAL = 2
+
+
+# ---------- 합성 서버 ----------
+
+def simulated_download_task(video_id, download_type, quality, download_id, audio_format='original'):
+    """yt-dlp 대신 진행률만 올리다가 작은 파일로 완료 처리하는 다운로드 작업"""
+    import app as app_module
+
+    progress = app_module.download_progress[download_id]
+    progress.update(status='downloading', stage='network')
+    app_module.mark_download(download_id, 'extract_start')
+    app_module.mark_download(download_id, 'extract_end')
+    app_module.mark_download(download_id, 'transfer_start')
+    duration = app_module.app.config.get('LOADTEST_DOWNLOAD_SECONDS', 10)
+    for step in range(1, 11):
+        time.sleep(duration / 10)
+        progress['progress'] = step * 10
+    app_module.mark_download(download_id, 'transfer_end')
+
+    filepath = os.path.join(app_module.DOWNLOAD_DIR, f"{uuid.uuid4()}.mp4")
+    with open(filepath, 'wb') as f:
+        f.write(b'\0' * 1024)
+    app_module.complete_download(download_id, filepath, f"Simulated {video_id}")
+
+
+def serve(args):
+    """합성 추출기 + 가짜 다운로드로 앱 실행 (준비되면 --ready-file에 주소와 프로필 ID 기록)"""
+    import logging
+    from werkzeug.serving import make_server
+
+    from benchmarks.routes import create_benchmark_app
+    import app as app_module
+
+    work_dir = tempfile.mkdtemp(prefix='malgeuntube-load-')
+    flask_app = create_benchmark_app(work_dir, argparse.Namespace(
+        fixture_dir=args.fixture_dir, latency=args.latency, no_cache=False))
+    flask_app.config['DOWNLOAD_DISK_QUOTA'] = None
+    flask_app.config['LOADTEST_DOWNLOAD_SECONDS'] = args.download_seconds * args.time_scale
+    app_module.download_video_task = simulated_download_task
+
+    profiles = generate_profiles(args.profiles, resolve_size(args))
+    write_json(flask_app.config['DATA_DIR'], profiles)
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    server = make_server('127.0.0.1', args.port, flask_app, threaded=True)
+    ready = {
+        'url': f"http://127.0.0.1:{server.server_port}",
+        'profiles': [p['profile']['id'] for p in profiles],
+    }
+    temp_path = f"{args.ready_file}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(ready, f)
+    os.replace(temp_path, args.ready_file)
+    server.serve_forever()
+
+
+def start_local_server(args):
+    """합성 서버를 하위 프로세스로 띄우고 준비될 때까지 대기 - (프로세스, 주소, 프로필 ID)"""
+    ready_file = os.path.join(tempfile.mkdtemp(prefix='malgeuntube-load-'), 'ready.json')
+    command = [sys.executable, '-m', 'benchmarks.loadtest', 'serve', '--ready-file', ready_file,
+               '--port', str(args.port), '--size', args.size, '--profiles', str(args.profiles),
+               '--latency', str(args.latency), '--time-scale', str(args.time_scale),
+               '--download-seconds', str(args.download_seconds)]
+    if args.fixture_dir:
+        command += ['--fixture-dir', args.fixture_dir]
+    process = subprocess.Popen(command, cwd=BASE_DIR)
+
+    deadline = time.time() + 120
+    while not os.path.exists(ready_file):
+        if process.poll() is not None or time.time() > deadline:
+            process.kill()
+            sys.exit('부하 테스트 서버를 시작하지 못했습니다.')
+        time.sleep(0.2)
+    with open(ready_file, 'r', encoding='utf-8') as f:
+        ready = json.load(f)
+    return process, ready['url'], ready['profiles']
+
+
+# ---------- 측정 ----------
+
+class Recorder:
+    """(단계, 엔드포인트)별 요청 결과 수집"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stage = 0
+        self.samples = {}
+
+    def record(self, stage, endpoint, seconds, ok):
+        with self.lock:
+            self.samples.setdefault((stage, endpoint), []).append((seconds, ok))
+
+
+class UserSession:
+    """가상 사용자 한 명 (쿠키를 유지하는 HTTP 클라이언트)"""
+
+    def __init__(self, base_url, recorder, stop, time_scale, timeout):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.stop = stop
+        self.time_scale = time_scale
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+        self.rng = random.Random()
+
+    def request(self, endpoint, path, data=None, form=None):
+        """요청 1회 - 응답 JSON(없으면 None) 반환, 결과는 Recorder에 기록"""
+        stage = self.recorder.stage
+        headers = {}
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        elif form is not None:
+            body = urllib.parse.urlencode(form).encode('utf-8')
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers)
+
+        started = time.perf_counter()
+        ok, payload = True, None
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                content = response.read()
+                if response.headers.get_content_type() == 'application/json':
+                    payload = json.loads(content)
+                    # 엔드포인트가 실패를 200 + success: false로 알리는 경우
+                    if isinstance(payload, dict) and payload.get('success') is False:
+                        ok = False
+        except (urllib.error.URLError, OSError, ValueError):
+            ok = False
+        self.recorder.record(stage, endpoint, time.perf_counter() - started, ok)
+        return payload
+
+    def pause(self, seconds):
+        """대기 (중단 요청 시 True)"""
+        return self.stop.wait(seconds * self.time_scale)
+
+    def login(self, profile_id):
+        self.request('login', '/login', form={'username': DEFAULT_USERNAME, 'password': DEFAULT_PASSWORD})
+        if profile_id:
+            self.request('profile_switch', '/api/profile/switch', data={'profile_id': profile_id})
+
+    def search_videos(self, offset=0):
+        query = urllib.parse.urlencode({'q': ' '.join(self.rng.sample(QUERY_WORDS, 2)), 'offset': offset, 'limit': 20})
+        payload = self.request('api_search', f"/api/search?{query}")
+        return (payload or {}).get('videos') or []
+
+    def viewer(self):
+        """검색해서 영상을 고르고 시청하면서 진행률 비콘 전송"""
+        while not self.stop.is_set():
+            videos = self.search_videos()
+            video_id = videos[0]['id'] if videos else 'dQw4w9WgXcQ'
+            self.request('watch', f"/watch?v={video_id}")
+            self.request('api_related', f"/api/related/{video_id}")
+
+            duration = self.rng.randint(120, 900)
+            watch_for = min(duration, self.rng.expovariate(1 / 240))
+            position = 0
+            while position < watch_for:
+                if self.pause(PROGRESS_BEACON_INTERVAL):
+                    return
+                position += PROGRESS_BEACON_INTERVAL
+                self.request('progress_update', '/api/progress/update', data={
+                    'video_id': video_id, 'current_time': position, 'duration': duration})
+
+    def scroller(self):
+        """검색 결과와 추천 영상을 무한 스크롤"""
+        while not self.stop.is_set():
+            query = ' '.join(self.rng.sample(QUERY_WORDS, 2))
+            self.request('search', f"/search?{urllib.parse.urlencode({'q': query})}")
+            for page in range(1, self.rng.randint(2, 6)):
+                if self.pause(SCROLL_INTERVAL):
+                    return
+                self.search_videos(offset=page * 20)
+            for page in range(self.rng.randint(1, 5)):
+                if self.pause(SCROLL_INTERVAL):
+                    return
+                self.request('api_recommended', f"/api/recommended?offset={page * 12}&limit=12")
+
+    def downloader(self):
+        """다운로드를 시작하고 끝날 때까지 진행률 조회"""
+        while not self.stop.is_set():
+            videos = self.search_videos()
+            video_id = videos[0]['id'] if videos else 'dQw4w9WgXcQ'
+            started = self.request('download', '/api/download', data={'video_id': video_id, 'type': 'video'})
+            download_id = (started or {}).get('download_id')
+            if not download_id:
+                if self.pause(10):
+                    return
+                continue
+            while True:
+                if self.pause(DOWNLOAD_POLL_INTERVAL):
+                    return
+                progress = self.request('download_progress', f"/api/download/progress/{download_id}")
+                if not progress or progress.get('status') in ('completed', 'error', 'cancelled'):
+                    break
+            if self.pause(self.rng.uniform(5, 30)):
+                return
+
+
+def parse_mix(value):
+    """'viewer=70,scroller=20,downloader=10' → [(종류, 가중치)]"""
+    mix = []
+    for part in value.split(','):
+        kind, _, weight = part.partition('=')
+        if kind not in ('viewer', 'scroller', 'downloader'):
+            raise argparse.ArgumentTypeError(f"알 수 없는 세션 종류: {kind}")
+        mix.append((kind, float(weight or 1)))
+    return mix
+
+
+def summarize(samples, elapsed):
+    """엔드포인트 한 개의 단계 결과"""
+    latencies = sorted(seconds for seconds, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    else:
+        cuts = latencies * 99
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / elapsed, 2),
+        'error_rate': round(errors / len(samples), 4),
+        'p50_ms': round(cuts[49] * 1000, 1),
+        'p95_ms': round(cuts[94] * 1000, 1),
+        'p99_ms': round(cuts[98] * 1000, 1),
+        'max_ms': round(latencies[-1] * 1000, 1),
+    }
+
+
+def print_stage(stage):
+    totals = stage['total']
+    print(f"\n== {stage['users']} users, {stage['seconds']:.0f}s: {totals['rps']} req/s, "
+          f"errors {totals['error_rate'] * 100:.2f}%, p99 {totals['p99_ms']}ms")
+    print(f"{'endpoint':<20}{'reqs':>8}{'req/s':>9}{'err%':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for endpoint, stats in sorted(stage['endpoints'].items()):
+        print(f"{endpoint:<20}{stats['requests']:>8}{stats['rps']:>9.2f}{stats['error_rate'] * 100:>8.2f}"
+              f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+
+
+def run(args):
+    process = None
+    if args.target:
+        base_url, profile_ids = args.target.rstrip('/'), args.profile_id or [None]
+    else:
+        process, base_url, profile_ids = start_local_server(args)
+
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = []
+    kinds, weights = zip(*args.mix)
+    stages = []
+    try:
+        for stage_index, target_users in enumerate(args.users):
+            recorder.stage = stage_index
+            # 단계마다 사용자를 더함 (기존 사용자는 계속 실행)
+            ramp = args.ramp_seconds / max(target_users - len(threads), 1)
+            stage_started = time.perf_counter()
+            while len(threads) < target_users:
+                user = UserSession(base_url, recorder, stop, args.time_scale, args.timeout)
+                kind = random.choices(kinds, weights)[0]
+                profile_id = profile_ids[len(threads) % len(profile_ids)]
+
+                def session(user=user, kind=kind, profile_id=profile_id):
+                    user.login(profile_id)
+                    getattr(user, kind)()
+
+                thread = threading.Thread(target=session, name=f"user-{len(threads)}-{kind}", daemon=True)
+                thread.start()
+                threads.append(thread)
+                time.sleep(ramp)
+            time.sleep(max(0.0, args.stage_duration - (time.perf_counter() - stage_started)))
+
+            elapsed = time.perf_counter() - stage_started
+            with recorder.lock:
+                stage_samples = {endpoint: list(samples) for (index, endpoint), samples
+                                 in recorder.samples.items() if index == stage_index}
+            all_samples = [sample for samples in stage_samples.values() for sample in samples]
+            if not all_samples:
+                continue
+            stage = {
+                'users': target_users,
+                'seconds': round(elapsed, 1),
+                'total': summarize(all_samples, elapsed),
+                'endpoints': {endpoint: summarize(samples, elapsed)
+                              for endpoint, samples in stage_samples.items()},
+            }
+            stages.append(stage)
+            if not args.json:
+                print_stage(stage)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join(timeout=args.timeout)
+        if process:
+            process.terminate()
+            process.wait(timeout=30)
+
+    if args.json:
+        print(json.dumps({'target': base_url, 'time_scale': args.time_scale,
+                          'mix': dict(args.mix), 'stages': stages}, ensure_ascii=False, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='benchmarks.loadtest', description='MalgeunTube 부하 테스트')
+    parser.add_argument('command', choices=['run', 'serve'])
+    parser.add_argument('--target', help='측정할 서버 주소 (없으면 합성 서버를 띄움)')
+    parser.add_argument('--profile-id', action='append', help='--target 서버에서 사용할 프로필 ID (여러 번 지정 가능)')
+    parser.add_argument('--users', type=lambda v: [int(n) for n in v.split(',')], default=[5, 20, 50],
+                        help='단계별 동시 사용자 수 (쉼표로 구분)')
+    parser.add_argument('--stage-duration', type=float, default=30, help='단계당 측정 시간 (초)')
+    parser.add_argument('--ramp-seconds', type=float, default=5, help='단계 시작 시 사용자를 나눠 투입하는 시간 (초)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('viewer=70,scroller=20,downloader=10'),
+                        help='세션 종류 비율')
+    parser.add_argument('--time-scale', type=float, default=1.0, help='세션 대기 시간 배율 (0.2면 5배 빠르게)')
+    parser.add_argument('--timeout', type=float, default=30, help='요청 타임아웃 (초)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    # 합성 서버 옵션
+    parser.add_argument('--port', type=int, default=0, help='합성 서버 포트 (0이면 빈 포트)')
+    parser.add_argument('--profiles', type=int, default=5, help='합성 서버 프로필 수')
+    parser.add_argument('--latency', type=float, default=0.05, help='추출 1회당 인위적 지연 (초)')
+    parser.add_argument('--download-seconds', type=float, default=10, help='가짜 다운로드 1건 소요 시간 (초)')
+    parser.add_argument('--fixture-dir', help='합성 응답 대신 기록된 픽스처 재생')
+    parser.add_argument('--ready-file', help=argparse.SUPPRESS)
+    add_size_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args)
+    else:
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,371 @@
+"""
+합성 프로필 데이터 생성기
+
+실제 사용 패턴과 비슷한 profiles.json과 프로필별 JSON 파일(시청 기록, 구독 채널, 플레이리스트,
+나중에 볼 영상, 시청 진행률, 검색 기록)을 원하는 크기로 생성. seed가 같으면 같은 데이터가 나옴.
+
+    python -m benchmarks.profiles generate --out /tmp/data --size xlarge --profiles 3
+    python -m benchmarks.profiles generate --out /tmp/data --history 10000 --progress 10000
+    python -m benchmarks.profiles generate --out /tmp/bench.db --format sql   # models.py 테이블 행
+    python -m benchmarks.profiles migrate --size large                         # migrate_data.py 처리량
+
+라우트 벤치마크(benchmarks.routes)도 이 생성기로 프로필을 만듦
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 프로필 크기별 항목 수 (xlarge는 목록 선형 탐색 비용을 보기 위한 1만 건 규모)
+PROFILE_SIZES = {
+    'small': {'history': 20, 'channels': 5, 'playlists': 3, 'playlist_videos': 20,
+              'watch_later': 10, 'progress': 10, 'search_history': 10},
+    'medium': {'history': 100, 'channels': 30, 'playlists': 20, 'playlist_videos': 100,
+               'watch_later': 100, 'progress': 200, 'search_history': 50},
+    'large': {'history': 1000, 'channels': 200, 'playlists': 100, 'playlist_videos': 500,
+              'watch_later': 1000, 'progress': 2000, 'search_history': 50},
+    'xlarge': {'history': 10000, 'channels': 1000, 'playlists': 50, 'playlist_videos': 2000,
+               'watch_later': 10000, 'progress': 10000, 'search_history': 50},
+}
+
+# 앱이 사용하는 프로필별 파일 이름
+STORE_FILES = {
+    'history': 'history_{}.json',
+    'channels': 'channels_{}.json',
+    'playlists': 'playlists_{}.json',
+    'watch_later': 'watch_later_{}.json',
+    'progress': 'progress_{}.json',
+    'search_history': 'search_history_{}.json',
+}
+
+ID_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_'
+TITLE_WORDS = [
+    '브이로그', '리뷰', '먹방', '여행', '게임', '공부', '음악', '라이브', '하이라이트', '튜토리얼',
+    'official', 'MV', 'live', 'reaction', 'highlights', 'tutorial', 'review', 'cover', 'full', 'ep.',
+    '2024', '4K', 'shorts', 'podcast', 'news', 'ASMR', 'vlog', 'study with me', 'playlist', 'trailer',
+]
+CHANNEL_WORDS = ['TV', '스튜디오', 'Official', '뮤직', 'Gaming', '뉴스', 'Kitchen', 'Daily', 'Lab', 'Films']
+QUERY_WORDS = ['아이유', 'lofi', '요리', '캠핑', 'python', '축구', '뉴진스', 'minecraft', '다큐', 'jazz',
+               '운동', 'piano', '여행', 'react', '고양이', 'drama', '코딩', 'asmr', '영화 리뷰', 'kpop']
+
+
+def random_video_id(rng):
+    return ''.join(rng.choice(ID_ALPHABET) for _ in range(11))
+
+
+def random_channel_id(rng):
+    return 'UC' + ''.join(rng.choice(ID_ALPHABET) for _ in range(22))
+
+
+def make_channel(rng, index):
+    channel_id = random_channel_id(rng)
+    return {
+        'channel_id': channel_id,
+        'name': f"{rng.choice(QUERY_WORDS).title()} {rng.choice(CHANNEL_WORDS)} {index}",
+        'channel_url': f"https://www.youtube.com/channel/{channel_id}",
+        'thumbnail': f"https://yt3.ggpht.com/{channel_id}=s88-c-k-c0x00ffffff-no-rj",
+    }
+
+
+def make_video(rng, channel, video_id=None):
+    """영상 항목 (재생 시간은 짧은 영상이 많은 로그정규 분포)"""
+    video_id = video_id or random_video_id(rng)
+    title = ' '.join(rng.sample(TITLE_WORDS, rng.randint(2, 6)))
+    return {
+        'id': video_id,
+        'title': f"{title} #{rng.randint(1, 999)}",
+        'thumbnail': f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg",
+        'duration': min(int(rng.lognormvariate(5.8, 1.0)) + 15, 6 * 3600),
+        'channel': channel['name'],
+        'channel_id': channel['channel_id'],
+    }
+
+
+def pick_channel(rng, channels):
+    """소수의 채널을 자주 보는 분포 (앞쪽 채널일수록 많이 선택)"""
+    index = min(int(rng.paretovariate(1.2)) - 1, len(channels) - 1)
+    return channels[index]
+
+
+def generate_profile(profile_id, size, seed=0, name=None, now=None):
+    """프로필 하나의 모든 저장소 데이터 생성 - {'profile': ..., 'history': [...], ...}"""
+    rng = random.Random(f"{seed}:{profile_id}")
+    now = now or datetime.now()
+    used_ids = set()
+
+    def new_video(channel):
+        video = make_video(rng, channel)
+        while video['id'] in used_ids:
+            video = make_video(rng, channel)
+        used_ids.add(video['id'])
+        return video
+
+    # 구독 채널 + 구독하지 않은 채널에서도 영상을 봄
+    subscribed = [make_channel(rng, i) for i in range(size['channels'])]
+    others = [make_channel(rng, size['channels'] + i) for i in range(max(20, size['channels'] // 2))]
+    catalog = subscribed + others
+
+    channels = []
+    added_at = now
+    for channel in subscribed:
+        added_at -= timedelta(hours=rng.expovariate(1 / 48))
+        channels.append(dict(channel, added_at=added_at.isoformat()))
+
+    history = []
+    watched_at = now
+    for _ in range(size['history']):
+        watched_at -= timedelta(minutes=rng.expovariate(1 / 40))
+        history.append(dict(new_video(pick_channel(rng, catalog)), watched_at=watched_at.isoformat()))
+
+    # 플레이리스트는 절반 정도를 시청 기록에서 담음
+    playlists = []
+    created_at = now
+    for p in range(size['playlists']):
+        created_at -= timedelta(days=rng.expovariate(1 / 7))
+        videos, seen = [], set()
+        for _ in range(size['playlist_videos']):
+            if history and rng.random() < 0.5:
+                video = {k: v for k, v in rng.choice(history).items() if k not in ('watched_at', 'channel_id')}
+            else:
+                video = {k: v for k, v in new_video(pick_channel(rng, catalog)).items() if k != 'channel_id'}
+            if video['id'] not in seen:
+                seen.add(video['id'])
+                videos.append(video)
+        playlists.append({
+            # 앱과 같은 pl_{타임스탬프} 형식 (겹치지 않도록 생성 시각을 조금씩 뺌)
+            'id': f"pl_{int(created_at.timestamp()) - p}",
+            'name': f"{rng.choice(QUERY_WORDS)} 모음 {p + 1}",
+            'videos': videos,
+            'created_at': created_at.isoformat(),
+        })
+
+    watch_later = []
+    added_at = now
+    for _ in range(size['watch_later']):
+        added_at -= timedelta(minutes=rng.expovariate(1 / 90))
+        watch_later.append(dict(new_video(pick_channel(rng, catalog)), added_at=added_at.isoformat()))
+
+    # 진행률은 앱처럼 5% ~ 95% 사이만 저장됨
+    progress = []
+    updated_at = now
+    progress_sources = history + watch_later
+    for i in range(size['progress']):
+        video = progress_sources[i] if i < len(progress_sources) else new_video(pick_channel(rng, catalog))
+        duration = video['duration']
+        percentage = rng.uniform(5, 95)
+        updated_at -= timedelta(minutes=rng.expovariate(1 / 30))
+        progress.append({
+            'video_id': video['id'],
+            'current_time': round(duration * percentage / 100, 1),
+            'duration': duration,
+            'percentage': round(percentage, 2),
+            'updated_at': updated_at.isoformat(),
+        })
+
+    search_history, queries = [], set()
+    searched_at = now
+    while len(search_history) < size['search_history']:
+        query = ' '.join(rng.sample(QUERY_WORDS, rng.randint(1, 3)))
+        if query.lower() in queries:
+            if len(queries) >= 1000:
+                query = f"{query} {len(search_history)}"
+            else:
+                continue
+        queries.add(query.lower())
+        searched_at -= timedelta(minutes=rng.expovariate(1 / 120))
+        search_history.append({'query': query, 'searched_at': searched_at.isoformat()})
+
+    return {
+        'profile': {
+            'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'name': name or f"프로필 {profile_id}",
+            'avatar': '/static/avatars/default.svg',
+            'created_at': (now - timedelta(days=rng.randint(30, 900))).isoformat(),
+        },
+        'history': history,
+        'channels': channels,
+        'playlists': playlists,
+        'watch_later': watch_later,
+        'progress': progress,
+        'search_history': search_history,
+    }
+
+
+def generate_profiles(count, size, seed=0):
+    return [generate_profile(index, size, seed=seed) for index in range(count)]
+
+
+def write_json(data_dir, profiles):
+    """앱의 save_json과 같은 형식(indent=2)으로 profiles.json과 프로필별 파일 저장"""
+    os.makedirs(data_dir, exist_ok=True)
+
+    def dump(filename, data):
+        with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    dump('profiles.json', [p['profile'] for p in profiles])
+    for generated in profiles:
+        profile_id = generated['profile']['id']
+        for store, filename in STORE_FILES.items():
+            dump(filename.format(profile_id), generated[store])
+
+
+def sql_rows(generated):
+    """models.py 테이블별 행 목록 ({모델 이름: [행 dict]})"""
+    parse = datetime.fromisoformat
+    profile = generated['profile']
+    profile_id = profile['id']
+    rows = {
+        'Profile': [dict(profile, created_at=parse(profile['created_at']))],
+        'History': [
+            {'profile_id': profile_id, 'video_id': h['id'], 'title': h['title'], 'thumbnail': h['thumbnail'],
+             'channel': h['channel'], 'channel_id': h['channel_id'], 'duration': h['duration'],
+             'watched_at': parse(h['watched_at'])}
+            for h in generated['history']
+        ],
+        'Channel': [
+            {'profile_id': profile_id, 'channel_id': c['channel_id'], 'name': c['name'],
+             'channel_url': c['channel_url'], 'thumbnail': c['thumbnail'], 'added_at': parse(c['added_at'])}
+            for c in generated['channels']
+        ],
+        'Playlist': [
+            {'id': pl['id'], 'profile_id': profile_id, 'name': pl['name'], 'created_at': parse(pl['created_at'])}
+            for pl in generated['playlists']
+        ],
+        'PlaylistVideo': [
+            {'playlist_id': pl['id'], 'video_id': v['id'], 'title': v['title'], 'thumbnail': v['thumbnail'],
+             'duration': v['duration'], 'channel': v['channel'], 'position': position}
+            for pl in generated['playlists'] for position, v in enumerate(pl['videos'])
+        ],
+        'WatchLater': [
+            {'profile_id': profile_id, 'video_id': w['id'], 'title': w['title'], 'thumbnail': w['thumbnail'],
+             'duration': w['duration'], 'channel': w['channel'], 'channel_id': w['channel_id'],
+             'added_at': parse(w['added_at'])}
+            for w in generated['watch_later']
+        ],
+        'WatchProgress': [
+            dict(p, profile_id=profile_id, updated_at=parse(p['updated_at'])) for p in generated['progress']
+        ],
+        'SearchHistory': [
+            {'profile_id': profile_id, 'query': s['query'], 'searched_at': parse(s['searched_at'])}
+            for s in generated['search_history']
+        ],
+    }
+    return rows
+
+
+def create_db_app(database_uri):
+    """models.py 테이블을 쓰기 위한 최소 Flask 앱"""
+    from flask import Flask
+    from models import db
+
+    db_app = Flask(__name__)
+    db_app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    db_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(db_app)
+    return db_app
+
+
+def write_sqlite(db_path, profiles):
+    """생성한 데이터를 models.py 테이블 행으로 SQLite에 저장"""
+    import models
+    from models import db
+
+    db_app = create_db_app(f"sqlite:///{os.path.abspath(db_path)}")
+    with db_app.app_context():
+        db.create_all()
+        for generated in profiles:
+            for model_name, rows in sql_rows(generated).items():
+                if rows:
+                    db.session.execute(db.insert(getattr(models, model_name)), rows)
+        db.session.commit()
+
+
+def measure_migration(profiles):
+    """JSON 파일을 만든 뒤 migrate_data.py의 단계별 처리량(행/초) 측정"""
+    import migrate_data
+    from models import db
+
+    steps = [
+        ('history', migrate_data.migrate_history, lambda g: len(g['history'])),
+        ('channels', migrate_data.migrate_channels, lambda g: len(g['channels'])),
+        ('playlists', migrate_data.migrate_playlists,
+         lambda g: sum(len(pl['videos']) + 1 for pl in g['playlists'])),
+        ('watch_later', migrate_data.migrate_watch_later, lambda g: len(g['watch_later'])),
+        ('progress', migrate_data.migrate_watch_progress, lambda g: len(g['progress'])),
+    ]
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='malgeuntube-migrate-') as work_dir:
+        data_dir = os.path.join(work_dir, 'data')
+        write_json(data_dir, profiles)
+        db_app = create_db_app(f"sqlite:///{os.path.join(work_dir, 'migrate.db')}")
+        with db_app.app_context():
+            db.create_all()
+            started = time.perf_counter()
+            migrated_profiles = migrate_data.migrate_profiles(data_dir)
+            results['profiles'] = (len(profiles), time.perf_counter() - started)
+            for name, step, count in steps:
+                started = time.perf_counter()
+                step(data_dir, migrated_profiles)
+                results[name] = (sum(count(g) for g in profiles), time.perf_counter() - started)
+    return results
+
+
+def resolve_size(args):
+    """--size 프리셋에 개별 옵션(--history 등)을 덮어씀"""
+    size = dict(PROFILE_SIZES[args.size])
+    for key in size:
+        value = getattr(args, key, None)
+        if value is not None:
+            size[key] = value
+    return size
+
+
+def add_size_arguments(parser):
+    parser.add_argument('--size', choices=list(PROFILE_SIZES), default='medium', help='프로필 크기 프리셋')
+    for key in PROFILE_SIZES['small']:
+        parser.add_argument(f"--{key.replace('_', '-')}", dest=key, type=int, help=f"{key} 항목 수")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='benchmarks.profiles', description='합성 프로필 데이터 생성')
+    parser.add_argument('command', choices=['generate', 'migrate'])
+    parser.add_argument('--out', help='출력 경로 (json: 데이터 디렉토리, sql: SQLite 파일)')
+    parser.add_argument('--format', choices=['json', 'sql'], default='json')
+    parser.add_argument('--profiles', type=int, default=1, help='프로필 수')
+    parser.add_argument('--seed', type=int, default=0)
+    add_size_arguments(parser)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, BASE_DIR)
+    size = resolve_size(args)
+    started = time.perf_counter()
+    profiles = generate_profiles(args.profiles, size, seed=args.seed)
+    print(f"{args.profiles}개 프로필 생성 ({time.perf_counter() - started:.2f}s): "
+          + ', '.join(f"{key}={value}" for key, value in size.items()), file=sys.stderr)
+
+    if args.command == 'generate':
+        if not args.out:
+            parser.error('generate에는 --out이 필요합니다')
+        if args.format == 'sql':
+            write_sqlite(args.out, profiles)
+        else:
+            write_json(args.out, profiles)
+        print(f"저장: {args.out}", file=sys.stderr)
+        return
+
+    results = measure_migration(profiles)
+    print(f"\n{'store':<14}{'rows':>10}{'seconds':>10}{'rows/s':>12}")
+    for name, (rows, seconds) in results.items():
+        print(f"{name:<14}{rows:>10}{seconds:>10.2f}{rows / seconds if seconds else 0:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
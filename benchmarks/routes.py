@@ -0,0 +1,286 @@
+"""
+라우트 벤치마크
+
+Flask 테스트 클라이언트로 주요 페이지와 API를 반복 호출해 초당 처리량과 지연 시간 백분위를 측정.
+YouTube 추출은 합성 응답(또는 --fixture-dir의 기록된 응답)으로 대체하므로 네트워크 없이 실행됨.
+
+    python -m benchmarks.routes                          # 기본 (medium 프로필)
+    python -m benchmarks.routes --size large -n 500      # 큰 프로필, 시나리오당 500회
+    python -m benchmarks.routes --watch-later 10000      # 프리셋의 일부 항목 수만 변경
+    python -m benchmarks.routes --only watch,search      # 일부 시나리오만
+    python -m benchmarks.routes --save-baseline main     # 결과를 benchmarks/baselines/main.json에 저장
+    python -m benchmarks.routes --compare main           # 저장된 기준과 비교
+
+데이터는 임시 디렉토리에 만든 합성 프로필(benchmarks.profiles)을 사용하므로 실제 data/ 폴더는 건드리지 않음
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(BASE_DIR, 'benchmarks', 'baselines')
+sys.path.insert(0, BASE_DIR)
+
+from benchmarks.profiles import (  # noqa: E402
+    add_size_arguments, generate_profile, make_channel, make_video, resolve_size, write_json
+)
+from extractors import Extractor, canonical_video_id, classify_url, register_extractor  # noqa: E402
+
+
+class SyntheticExtractor(Extractor):
+    """URL 종류에 맞는 info dict를 만들어 반환 (latency초 지연)"""
+
+    name = 'synthetic'
+
+    def __init__(self, latency=0.0, entries=20):
+        self.latency = latency
+        self.entries = entries
+
+    def extract_info(self, url, options):
+        if self.latency:
+            time.sleep(self.latency)
+        kind = classify_url(url)
+        rng = random.Random(url)
+        channel = make_channel(rng, 0)
+
+        if kind == 'video':
+            entry = make_video(rng, channel)
+            entry['id'] = canonical_video_id(url) or entry['id']
+            return dict(entry, description='Synthetic video', like_count=10, upload_date='20240101',
+                        view_count=rng.randint(0, 10 ** 7),
+                        webpage_url=url, formats=[
+                            {'format_id': str(height), 'ext': 'mp4', 'vcodec': 'avc1', 'acodec': 'mp4a',
+                             'height': height, 'resolution': f"{height}p",
+                             'url': f"https://example.invalid/{height}.mp4"}
+                            for height in (360, 720, 1080)
+                        ])
+
+        count = self.entries
+        if kind == 'search':
+            count = int(url[len('ytsearch'):].split(':', 1)[0] or 1)
+        channels = [channel] + [make_channel(rng, i) for i in range(1, 10)]
+        entries = [make_video(rng, channels[i % len(channels)]) for i in range(count)]
+        return {'id': f"list{rng.getrandbits(32)}", 'title': f"Synthetic {kind}", 'channel': channel['name'],
+                'channel_id': channel['channel_id'], 'entries': entries}
+
+
+register_extractor('synthetic', lambda config, load_module: SyntheticExtractor(
+    latency=config.get('EXTRACTOR_FIXTURE_LATENCY', 0.0)))
+
+
+def create_benchmark_app(work_dir, args):
+    """임시 디렉토리를 데이터 경로로 쓰는 앱 생성 (Rate Limit/로그 출력 끔)"""
+    import app as app_module
+
+    overrides = {
+        'DATA_DIR': os.path.join(work_dir, 'data'),
+        'DOWNLOAD_DIR': os.path.join(work_dir, 'downloads'),
+        'UPLOAD_FOLDER': os.path.join(work_dir, 'uploads'),
+        'LOGS_DIR': os.path.join(work_dir, 'logs'),
+        'LOG_LEVEL': 'ERROR',
+        'RATELIMIT_ENABLED': False,
+        'PRELOAD_YT_DLP': False,
+        'SLOW_REQUEST_THRESHOLD': float('inf'),
+        'EXTRACTOR_BACKEND': 'fixture' if args.fixture_dir else 'synthetic',
+        'EXTRACTOR_FIXTURE_LATENCY': args.latency,
+    }
+    if args.fixture_dir:
+        overrides['EXTRACTOR_FIXTURE_DIR'] = args.fixture_dir
+    if args.no_cache:
+        overrides['CACHE_TYPE'] = 'NullCache'
+
+    return app_module.create_app(overrides)
+
+
+def added_video(i):
+    """플레이리스트 추가/제거 시나리오용 영상 (11자리 고정 ID)"""
+    return {'video_id': f"bench{i:06d}", 'title': f"Benchmark {i}", 'thumbnail': '', 'duration': 60,
+            'channel': 'Benchmark'}
+
+
+def build_scenarios(profile):
+    """(이름, 함수(client, i)) 목록 - 생성된 프로필의 실제 ID를 사용"""
+    history_ids = [h['id'] for h in profile['history']] or ['dQw4w9WgXcQ']
+    channel_ids = [c['channel_id'] for c in profile['channels']] or ['UCbenchmark00000000000000']
+    playlist = profile['playlists'][0] if profile['playlists'] else {'id': 'pl_0', 'videos': []}
+    playlist_id = playlist['id']
+    playlist_videos = [v['id'] for v in playlist['videos']]
+
+    def get(path):
+        return lambda client, i: client.get(path(i))
+
+    def post(path, body):
+        return lambda client, i: client.post(path(i), json=body(i))
+
+    def create_and_delete(client, i):
+        created = client.post('/api/playlist/create', json={'name': f"Bench {i}"}).get_json()
+        return client.post(f"/api/playlist/{created['playlist_id']}/delete", json={})
+
+    return [
+        ('index', get(lambda i: '/')),
+        ('watch', get(lambda i: f"/watch?v={history_ids[i % len(history_ids)]}")),
+        ('search', get(lambda i: f"/search?q=benchmark+{i % 20}")),
+        ('feed', get(lambda i: '/feed')),
+        ('channel_detail', get(lambda i: f"/channel/{channel_ids[i % len(channel_ids)]}")),
+        ('progress_update', post(lambda i: '/api/progress/update', lambda i: {
+            'video_id': history_ids[i % len(history_ids)], 'current_time': 40 + i % 50, 'duration': 100})),
+        ('api_search', get(lambda i: f"/api/search?q=benchmark+{i % 20}&offset=0&limit=20")),
+        # 추가 후 같은 순서로 제거하므로 측정이 끝나면 플레이리스트는 원래 상태로 돌아옴
+        ('playlist_add', post(lambda i: f"/api/playlist/{playlist_id}/add", added_video)),
+        ('playlist_remove', post(lambda i: f"/api/playlist/{playlist_id}/remove",
+                                 lambda i: {'video_id': added_video(i)['video_id']})),
+        ('playlist_reorder', post(lambda i: f"/api/playlist/{playlist_id}/reorder", lambda i: {
+            'video_ids': playlist_videos[::-1] if i % 2 == 0 else playlist_videos})),
+        ('playlist_move', post(lambda i: f"/api/playlist/{playlist_id}/move", lambda i: {
+            'video_id': playlist_videos[i % len(playlist_videos)] if playlist_videos else '',
+            'direction': 'top'})),
+        ('playlist_create_delete', create_and_delete),
+    ]
+
+
+def measure(client, run, iterations, warmup):
+    """시나리오를 반복 실행하고 요청별 소요 시간(초) 목록 반환"""
+    for i in range(warmup):
+        response = run(client, i)
+        response.get_data()
+        response.close()
+
+    timings = []
+    for i in range(warmup, warmup + iterations):
+        started = time.perf_counter()
+        response = run(client, i)
+        response.get_data()  # 스트리밍 페이지는 본문을 끝까지 받아야 렌더링이 끝남
+        response.close()
+        timings.append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            raise RuntimeError(f"HTTP {response.status_code}")
+    return timings
+
+
+def summarize(timings):
+    total = sum(timings)
+    cuts = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+    return {
+        'iterations': len(timings),
+        'ops_per_sec': round(len(timings) / total, 1) if total else None,
+        'mean_ms': round(statistics.mean(timings) * 1000, 3),
+        'p50_ms': round(cuts[49] * 1000, 3),
+        'p90_ms': round(cuts[89] * 1000, 3),
+        'p99_ms': round(cuts[98] * 1000, 3),
+        'max_ms': round(max(timings) * 1000, 3),
+    }
+
+
+def git_revision():
+    """기준 파일에 남길 브랜치/커밋 (git이 없으면 None)"""
+    try:
+        branch = subprocess.check_output(['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
+                                         cwd=BASE_DIR, stderr=subprocess.DEVNULL, text=True).strip()
+        commit = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                         cwd=BASE_DIR, stderr=subprocess.DEVNULL, text=True).strip()
+        return {'branch': branch, 'commit': commit}
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def print_results(results, baseline=None):
+    header = f"{'scenario':<24}{'ops/s':>10}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}"
+    if baseline:
+        header += f"{'ops/s Δ':>10}{'p99 Δ':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, stats in results.items():
+        line = (f"{name:<24}{stats['ops_per_sec'] or 0:>10.1f}{stats['mean_ms']:>10.2f}"
+                f"{stats['p50_ms']:>10.2f}{stats['p90_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+        previous = (baseline or {}).get(name)
+        if previous:
+            line += f"{percent_change(previous['ops_per_sec'], stats['ops_per_sec']):>10}"
+            line += f"{percent_change(previous['p99_ms'], stats['p99_ms']):>10}"
+        print(line)
+    print('(ms 단위, Δ는 기준 대비 변화율)' if baseline else '(ms 단위)')
+
+
+def percent_change(before, after):
+    if not before or after is None:
+        return '-'
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='benchmarks.routes', description='MalgeunTube 라우트 벤치마크')
+    add_size_arguments(parser)
+    parser.add_argument('-n', '--iterations', type=int, default=200, help='시나리오당 측정 횟수')
+    parser.add_argument('--warmup', type=int, default=10, help='시나리오당 예열 횟수')
+    parser.add_argument('--only', help='실행할 시나리오 (쉼표로 구분)')
+    parser.add_argument('--latency', type=float, default=0.0, help='추출 1회당 인위적 지연 (초)')
+    parser.add_argument('--no-cache', action='store_true', help='추출 결과 캐시 끄기 (매 요청 추출)')
+    parser.add_argument('--fixture-dir', help='합성 응답 대신 기록된 픽스처 재생 (EXTRACTOR_BACKEND=record로 기록)')
+    parser.add_argument('--save-baseline', metavar='NAME', help='결과를 benchmarks/baselines/NAME.json에 저장')
+    parser.add_argument('--compare', metavar='NAME', help='저장된 기준 결과와 비교')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    size = resolve_size(args)
+    profile = generate_profile(0, size)
+    scenarios = build_scenarios(profile)
+    if args.only:
+        selected = set(args.only.split(','))
+        unknown = selected - {name for name, _ in scenarios}
+        if unknown:
+            parser.error(f"알 수 없는 시나리오: {', '.join(sorted(unknown))}")
+        scenarios = [(name, run) for name, run in scenarios if name in selected]
+
+    baseline = None
+    if args.compare:
+        with open(baseline_path(args.compare), 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    with tempfile.TemporaryDirectory(prefix='malgeuntube-bench-') as work_dir:
+        flask_app = create_benchmark_app(work_dir, args)
+        write_json(flask_app.config['DATA_DIR'], [profile])
+        client = flask_app.test_client()
+        with client.session_transaction() as session:
+            session['logged_in'] = True
+            session['profile_id'] = profile['profile']['id']
+
+        results = {}
+        for name, run in scenarios:
+            results[name] = summarize(measure(client, run, args.iterations, args.warmup))
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git': git_revision(),
+        'python': platform.python_version(),
+        'size': args.size,
+        'profile': size,
+        'iterations': args.iterations,
+        'latency': args.latency,
+        'no_cache': args.no_cache,
+        'results': results,
+    }
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_results(results, baseline)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(args.save_baseline), 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"기준 저장: {baseline_path(args.save_baseline)}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -31,18 +31,124 @@ class Config:
         f"sqlite:///{os.path.join(BASE_DIR, 'data', 'malgeuntube.db')}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
-    # 캐싱 설정
-    CACHE_TYPE = 'SimpleCache'
+    # 캐싱 설정 (용량 정리 횟수를 메트릭으로 세는 SimpleCache)
+    CACHE_TYPE = 'metrics.InstrumentedSimpleCache'
     CACHE_DEFAULT_TIMEOUT = 300  # 5분
     CACHE_VIDEO_INFO_TIMEOUT = 3600  # 1시간
     CACHE_SEARCH_TIMEOUT = 900  # 15분
     CACHE_CHANNEL_TIMEOUT = 1800  # 30분
+    CACHE_PLAYLIST_TIMEOUT = 1800  # 30분
+    # 추출 실패는 오류 종류별로 짧게만 재사용 (연속 실패 시 두 배씩, 최대 NEGATIVE_CACHE_MAX_TTL)
+    # 0이면 저장한 실패를 돌려주지 않고 매번 다시 시도
+    NEGATIVE_CACHE_TTLS = {
+        'unavailable': 300,  # 삭제/비공개 영상
+        'geo_blocked': 300,
+        'rate_limited': 60,  # HTTP 429
+        'bot_check': 30,  # "Sign in to confirm you're not a bot"
+        'unknown': 10,
+        'network': 0,  # 타임아웃/연결 오류
+    }
+    NEGATIVE_CACHE_MAX_TTL = 900  # 15분
+    
+    # 다운로드 설정
+    # watch 페이지에서 해석한 info dict를 다운로드에 재사용하는 최대 시간
+    # (스트림 URL 만료 전에 충분히 짧게 유지)
+    DOWNLOAD_INFO_REUSE_TTL = 600  # 10분
+    # 다운로드 파이프라인 단계별 동시 작업 수
+    # 네트워크 전송(I/O)과 ffmpeg 병합/변환(CPU)을 별도 풀에서 실행
+    DOWNLOAD_NETWORK_WORKERS = 3
+    DOWNLOAD_POSTPROCESS_WORKERS = os.cpu_count() or 1
+    # 작업당 동시 조각(fragment) 다운로드 수 (HLS/DASH 조각 포맷)
+    DOWNLOAD_CONCURRENT_FRAGMENTS = 4
+    # 노드 전체 다운로드 대역폭 (bytes/s, 0 = 무제한) - 느린 작업이 쓰지 않는 몫은 다른 작업에 재분배
+    DOWNLOAD_BANDWIDTH_LIMIT = int(os.environ.get('DOWNLOAD_BANDWIDTH_LIMIT', 0))
+    # 플레이리스트 ZIP 다운로드 최대 영상 수
+    DOWNLOAD_BATCH_MAX_ITEMS = 50
+    # 다운로드 디렉토리 정리 (janitor)
+    DOWNLOAD_DISK_QUOTA = int(os.environ.get('DOWNLOAD_DISK_QUOTA', 5 * 1024 * 1024 * 1024))  # 5GB
+    DOWNLOAD_JOB_RESERVE = 200 * 1024 * 1024  # 크기를 알 수 없는 작업의 예약 용량 (200MB)
+    DOWNLOAD_FILE_MAX_AGE = 6 * 3600  # 완료 후 가져가지 않은 파일 보관 시간 (6시간)
+    DOWNLOAD_ORPHAN_MAX_AGE = 3600  # 종료된 작업의 .part/.ytdl/중간 파일 보관 시간 (1시간)
+    DOWNLOAD_JANITOR_INTERVAL = 300  # 정리 주기 (5분)
+    
+    # 홈 화면 설정
+    # 인기/추천 선반을 병렬로 가져오고, 마감 시간 안에 오지 않은 선반은
+    # 캐시 또는 자리표시자로 렌더링 후 브라우저에서 API로 채움
+    HOME_SHELF_WORKERS = 4
+    HOME_SHELF_DEADLINE = 2.5  # 초
+    HOME_SHELF_CACHE_TIMEOUT = 900  # 15분
+    
+    # 메트릭 설정 (/metrics, /admin/*)
+    # Bearer 토큰 (/admin/*은 로그인 세션도 허용), 토큰이 없으면 INTERNAL_LOCAL_ACCESS일 때 로컬(127.0.0.1)에서도 허용
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    INTERNAL_LOCAL_ACCESS = True
+    # /admin/memory/tracemalloc로 추적을 켤 때 기록할 호출 스택 깊이 (깊을수록 느림)
+    TRACEMALLOC_FRAMES = int(os.environ.get('TRACEMALLOC_FRAMES', 1))
+    
+    # 요청 구간 시간 (Server-Timing 헤더: 추출/저장소/렌더링)
+    # 기준 시간을 넘긴 요청은 구간별 시간을 JSON 한 줄로 로그에 기록하고,
+    # 샘플링된 요청이 느렸으면 cProfile 결과를 logs/profiles/*.prof로 저장
+    SERVER_TIMING_HEADER = True
+    SLOW_REQUEST_THRESHOLD = float(os.environ.get('SLOW_REQUEST_THRESHOLD', 2.0))  # 초
+    SLOW_REQUEST_PROFILE_SAMPLE_RATE = float(os.environ.get('SLOW_REQUEST_PROFILE_SAMPLE_RATE', 0))  # 0 ~ 1
+    
+    # 시작 설정
+    # yt-dlp는 임포트가 무거우므로 create_app() 후 백그라운드에서 미리 로드
+    PRELOAD_YT_DLP = True
+    
+    # 추출기 설정 (extractors.py)
+    # ytdlp: YouTube에서 추출 / fixture: 저장된 응답 재생 (네트워크 없는 벤치마크, 부하 테스트)
+    # record: yt-dlp로 추출하면서 응답을 EXTRACTOR_FIXTURE_DIR에 저장
+    # 다운로드는 항상 yt-dlp로 실행
+    EXTRACTOR_BACKEND = os.environ.get('EXTRACTOR_BACKEND', 'ytdlp')
+    EXTRACTOR_FIXTURE_DIR = os.environ.get('EXTRACTOR_FIXTURE_DIR', os.path.join(BASE_DIR, 'fixtures', 'extractor'))
+    EXTRACTOR_FIXTURE_LATENCY = float(os.environ.get('EXTRACTOR_FIXTURE_LATENCY', 0))  # 재생 지연 (초)
+    EXTRACTOR_FIXTURE_JITTER = float(os.environ.get('EXTRACTOR_FIXTURE_JITTER', 0))  # 추가 무작위 지연 최대값 (초)
+    
+    # 운영 서버 설정 (python -m malgeuntube serve)
+    # 웹 요청은 여러 워커 프로세스 x 스레드로 처리하고,
+    # 다운로드 작업과 디렉토리 정리는 단일 다운로드 프로세스에서 실행
+    SERVER_ROLE = os.environ.get('SERVER_ROLE', 'all')  # all / web / downloads
+    SERVER_HOST = os.environ.get('SERVER_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.environ.get('SERVER_PORT', 5000))
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', os.cpu_count() or 1))
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 8))  # yt-dlp 대기가 대부분이라 스레드 위주
+    SERVER_KEEPALIVE = 5  # 초
+    SERVER_TIMEOUT = 120  # 응답 없는 워커 재시작 (초) - 느린 추출 고려
+    SERVER_GRACEFUL_TIMEOUT = 30  # 재시작/종료 시 진행 중 요청 대기 (초)
+    SERVER_MAX_REQUESTS = 2000  # 워커별 요청 수 도달 시 재시작 (메모리 누수 방지, 0이면 끔)
+    SERVER_MAX_REQUESTS_JITTER = 200
+    
+    # 다운로드 서비스 (SERVER_ROLE='downloads' 프로세스)
+    DOWNLOAD_SERVICE_HOST = '127.0.0.1'
+    DOWNLOAD_SERVICE_PORT = int(os.environ.get('DOWNLOAD_SERVICE_PORT', 5001))
+    DOWNLOAD_SERVICE_THREADS = 16
+    DOWNLOAD_SERVICE_URL = os.environ.get('DOWNLOAD_SERVICE_URL')  # 웹 워커가 다운로드 요청을 전달할 주소
+    DOWNLOAD_SERVICE_TIMEOUT = 30  # 전달 요청 연결/읽기 타임아웃 (초)
+    # 파일/ZIP 스트리밍 전달의 읽기 타임아웃 (None이면 없음) - 배치 ZIP은 항목을 받는 동안 한참 조용할 수 있음
+    DOWNLOAD_SERVICE_STREAM_TIMEOUT = None
+    
+    # 응답 압축 및 조건부 요청 설정
+    # brotli 패키지가 설치되어 있으면 br, 아니면 gzip 사용
+    # /assets/, /static/ 파일은 send_file로 그대로 전달되므로 여기서 압축하지 않음 (정적 파일 서버/프록시에서 처리)
+    # JavaScript는 매니페스트를 주입해 만드는 sw.js 때문에 포함
+    COMPRESS_MIMETYPES = ['text/html', 'application/json',
+                          'application/javascript', 'text/javascript']
+    COMPRESS_MIN_SIZE = 1024  # 이보다 작은 응답은 압축하지 않음 (바이트)
+    COMPRESS_LEVEL = 6  # gzip 압축 레벨
+    COMPRESS_BROTLI_QUALITY = 5
+    
+    # 정적 리소스 설정
+    # 시작 시 static 파일 내용을 해시해 /assets/<경로>.<해시>.<확장자> URL로 제공
+    ASSET_MAX_AGE = 365 * 24 * 3600  # 해시 URL은 내용이 바뀌지 않으므로 1년 immutable
     
     # Rate Limiting 설정
     RATELIMIT_ENABLED = True
     RATELIMIT_DEFAULT = "200 per day"
-    RATELIMIT_STORAGE_URL = "memory://"
-    RATELIMIT_STRATEGY = "fixed-window"
+    # 워커 프로세스들이 카운터를 공유하도록 SQLite 저장소 사용 (ratelimit_storage.py)
+    RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL') or \
+        f"sqlite:///{os.path.join(BASE_DIR, 'data', 'ratelimit.db')}"
+    RATELIMIT_STRATEGY = "sliding-window-counter"
     RATELIMIT_HEADERS_ENABLED = True
     
     # API Rate Limits
@@ -52,6 +158,7 @@ class Config:
     
     # 로깅 설정
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')  # text / json (요청 ID, 프로필 ID 포함 JSON Lines)
     LOG_FILE_MAX_BYTES = 10 * 1024 * 1024  # 10MB
     LOG_FILE_BACKUP_COUNT = 5
     
@@ -89,6 +196,9 @@ class ProductionConfig(Config):
     # 프로덕션에서는 반드시 환경변수에서 시크릿 키 로드
     SECRET_KEY = os.environ.get('SECRET_KEY')
     
+    # 리버스 프록시 뒤에서는 모든 요청이 로컬에서 온 것으로 보이므로 토큰/로그인 없이 허용하지 않음
+    INTERNAL_LOCAL_ACCESS = False
+    
     # 캐시 타입 변경 가능 (Redis 등)
     # CACHE_TYPE = 'redis'
     # CACHE_REDIS_URL = os.environ.get('REDIS_URL')
@@ -113,6 +223,9 @@ class TestingConfig(Config):
     # 캐시 비활성화
     CACHE_TYPE = 'NullCache'
     
+    # 테스트는 필요한 경우에만 yt-dlp 로드
+    PRELOAD_YT_DLP = False
+    
     # Rate Limiting 비활성화
     RATELIMIT_ENABLED = False
     
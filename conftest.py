@@ -0,0 +1,27 @@
+"""
+pytest 공용 픽스처
+
+앱은 프로세스당 한 번만 초기화되므로 세션 단위로 임시 디렉토리를 데이터 경로로 쓰는 앱을 만듦
+"""
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    import app as app_module
+
+    work_dir = str(tmp_path_factory.mktemp('malgeuntube'))
+    app_module.create_app({
+        'TESTING': True,
+        'DATA_DIR': os.path.join(work_dir, 'data'),
+        'DOWNLOAD_DIR': os.path.join(work_dir, 'downloads'),
+        'UPLOAD_FOLDER': os.path.join(work_dir, 'uploads'),
+        'LOGS_DIR': os.path.join(work_dir, 'logs'),
+        'LOG_LEVEL': 'ERROR',
+        'RATELIMIT_ENABLED': False,
+        'PRELOAD_YT_DLP': False,
+        'CACHE_TYPE': 'SimpleCache',
+    })
+    return app_module
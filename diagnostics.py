@@ -0,0 +1,209 @@
+"""
+MalgeunTube 메모리 진단
+
+/admin/memory 엔드포인트에서 사용하는 도구 모음:
+
+    cache_stats      # 캐시 네임스페이스별 항목 수와 크기 (SimpleCache는 저장된 pickle 바이트 기준)
+    purge_cache      # 네임스페이스 또는 키 접두어로 캐시 항목 삭제
+    registry_stats   # 다운로드 진행률 등 프로세스 내 레지스트리 크기 추정
+    tracemalloc_*    # 요청할 때만 켜는 tracemalloc 상위 할당 위치
+
+캐시 키는 모두 '{네임스페이스}:{키}' 형식 (result_cache, resolved_info, shelf 등)
+"""
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+
+def process_memory():
+    """현재 RSS와 최대 RSS (바이트, 지원하지 않는 플랫폼은 None)"""
+    rss = None
+    try:
+        with open('/proc/self/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    peak = None
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위
+        if sys.platform != 'darwin':
+            peak *= 1024
+    except ImportError:
+        pass
+    return {'rss_bytes': rss, 'peak_rss_bytes': peak, 'gc_counts': gc.get_count()}
+
+
+# ============== 캐시 ==============
+
+def cache_entries(backend):
+    """백엔드의 내부 저장소 {키: (만료 시각, pickle 값)} - 키 목록을 볼 수 없는 백엔드는 None"""
+    entries = getattr(backend, '_cache', None)
+    return entries if isinstance(entries, dict) else None
+
+
+def cache_namespace(key):
+    """키가 속한 네임스페이스 - 'resolved_info:..'는 콜론 앞 (형식이 다른 키는 'other')"""
+    if ':' in key:
+        return key.split(':', 1)[0]
+    return 'other'
+
+
+def entry_size(key, value):
+    """항목 크기 추정 - 저장된 값이 pickle 바이트면 그 길이, 아니면 객체 크기 추정"""
+    size = len(key)
+    if isinstance(value, (bytes, bytearray)):
+        return size + len(value)
+    return size + deep_sizeof(value)
+
+
+def cache_stats(backend):
+    """네임스페이스별 {entries, bytes, expired} 와 전체 합계"""
+    entries = cache_entries(backend)
+    if entries is None:
+        return {'backend': type(backend).__name__, 'supported': False}
+
+    now = time.time()
+    snapshot = list(entries.items())
+    namespaces = {}
+    for key, (expires, value) in snapshot:
+        stats = namespaces.setdefault(cache_namespace(key),
+                                      {'entries': 0, 'bytes': 0, 'expired': 0})
+        stats['entries'] += 1
+        stats['bytes'] += entry_size(key, value)
+        if expires and expires < now:
+            stats['expired'] += 1
+
+    return {
+        'backend': type(backend).__name__,
+        'supported': True,
+        'threshold': getattr(backend, '_threshold', None),
+        'entries': len(snapshot),
+        'bytes': sum(stats['bytes'] for stats in namespaces.values()),
+        'namespaces': dict(sorted(namespaces.items(), key=lambda item: -item[1]['bytes'])),
+    }
+
+
+def purge_cache(backend, namespace=None, prefix=None):
+    """네임스페이스 또는 키 접두어에 해당하는 항목 삭제 - (삭제 수, 해제된 바이트)"""
+    entries = cache_entries(backend)
+    if entries is None:
+        raise ValueError(f"{type(backend).__name__} does not support key listing")
+
+    removed = 0
+    freed = 0
+    for key, (_, value) in list(entries.items()):
+        if namespace is not None and cache_namespace(key) != namespace:
+            continue
+        if prefix is not None and not key.startswith(prefix):
+            continue
+        if entries.pop(key, None) is not None:
+            removed += 1
+            freed += entry_size(key, value)
+    return removed, freed
+
+
+# ============== 레지스트리 ==============
+
+def deep_sizeof(obj, seen=None):
+    """컨테이너를 따라가며 sys.getsizeof 합산 (같은 객체는 한 번만 셈)"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in list(obj.items()):
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in list(obj):
+            size += deep_sizeof(item, seen)
+    return size
+
+
+def registry_stats(registries):
+    """{이름: 컨테이너} -> {이름: {entries, bytes}}"""
+    return {
+        name: {'entries': len(registry), 'bytes': deep_sizeof(registry)}
+        for name, registry in registries.items()
+    }
+
+
+# ============== tracemalloc ==============
+
+tracemalloc_lock = threading.Lock()
+# 마지막 스냅샷 - 다음 조회에서 증가량 비교에 사용
+last_snapshot = None
+
+# 진단 도구 자신의 할당은 결과에서 제외
+TRACEMALLOC_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def tracemalloc_start(frames=1):
+    """추적 시작 (이미 추적 중이면 그대로) - 켜져 있는 동안 할당이 느려지므로 필요할 때만 사용"""
+    global last_snapshot
+    with tracemalloc_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            last_snapshot = None
+        return tracemalloc_status()
+
+
+def tracemalloc_stop():
+    global last_snapshot
+    with tracemalloc_lock:
+        tracemalloc.stop()
+        last_snapshot = None
+        return tracemalloc_status()
+
+
+def tracemalloc_status():
+    if not tracemalloc.is_tracing():
+        return {'tracing': False}
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'tracing': True,
+        'frames': tracemalloc.get_traceback_limit(),
+        'traced_bytes': current,
+        'traced_peak_bytes': peak,
+    }
+
+
+def format_statistic(stat):
+    frames = [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+    entry = {'location': frames[0] if frames else '?', 'bytes': stat.size, 'count': stat.count}
+    if len(frames) > 1:
+        entry['traceback'] = frames
+    if hasattr(stat, 'size_diff'):
+        entry['bytes_diff'] = stat.size_diff
+        entry['count_diff'] = stat.count_diff
+    return entry
+
+
+def tracemalloc_top(limit=20, group_by='lineno'):
+    """상위 할당 위치와 지난 조회 이후 증가량 (추적 중이 아니면 상태만 반환)"""
+    global last_snapshot
+    with tracemalloc_lock:
+        result = tracemalloc_status()
+        if not result['tracing']:
+            return result
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(TRACEMALLOC_FILTERS)
+        result['top'] = [format_statistic(stat) for stat in snapshot.statistics(group_by)[:limit]]
+        if last_snapshot is not None:
+            result['growth'] = [format_statistic(stat)
+                                for stat in snapshot.compare_to(last_snapshot, group_by)[:limit]]
+        last_snapshot = snapshot
+        return result
@@ -0,0 +1,240 @@
+"""
+MalgeunTube 추출기 백엔드
+
+app.py의 YouTube 데이터 함수는 yt-dlp를 직접 부르지 않고 extract_info(url, options)만 사용.
+EXTRACTOR_BACKEND 설정으로 백엔드를 고름:
+
+    ytdlp    # 실제 YouTube에서 추출 (기본)
+    fixture  # EXTRACTOR_FIXTURE_DIR에 저장된 info dict 재생 (네트워크 없이 벤치마크/부하 테스트)
+    record   # yt-dlp로 추출하면서 응답을 EXTRACTOR_FIXTURE_DIR에 저장
+
+그 밖의 백엔드는 register_extractor()로 등록 (benchmarks.routes의 synthetic)
+
+픽스처 파일은 {종류}-{URL 해시}.json 이고, 저장된 응답이 없는 URL은 default-{종류}.json이
+있으면 그것으로 대신함 (종류: video / playlist / channel / search)
+"""
+import abc
+import copy
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from urllib.parse import parse_qs, urlparse
+
+
+class ExtractorError(Exception):
+    """추출 실패 (재생할 픽스처 없음 등)"""
+
+
+def classify_url(url):
+    """픽스처 파일 이름에 쓰는 URL 종류"""
+    if url.startswith('ytsearch'):
+        return 'search'
+    if 'list=' in url or '/playlist' in url:
+        return 'playlist'
+    if '/channel/' in url or '/@' in url or '/c/' in url or '/user/' in url:
+        return 'channel'
+    return 'video'
+
+
+# 추출 오류 종류 - 메시지의 특징 문구로 구분 (yt-dlp는 대부분 DownloadError 하나로 올림)
+ERROR_PATTERNS = (
+    # "Sign in to confirm your age"는 로그인해야 볼 수 있는 연령 제한 영상 - 다시 시도해도 같으므로 unavailable
+    ('bot_check', ('not a bot', 'captcha')),
+    ('rate_limited', ('http error 429', 'too many requests', 'rate-limit', 'rate limit')),
+    ('geo_blocked', ('not available in your country', 'geo restrict', 'geo-restrict')),
+    ('unavailable', ('video unavailable', 'private video', 'has been removed', 'does not exist',
+                     'account associated with this video has been terminated', 'confirm your age', 'no fixture for',
+                     'unsupported url', 'not a valid url', 'http error 404')),
+    ('network', ('timed out', 'timeout', 'connection reset', 'connection refused', 'connection aborted',
+                 'temporary failure in name resolution', 'name or service not known',
+                 'network is unreachable', 'remote end closed', 'http error 5')),
+)
+
+
+def classify_error(error):
+    """추출 예외를 bot_check / rate_limited / geo_blocked / unavailable / network / unknown 중 하나로 분류"""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return 'network'
+    message = str(error).lower()
+    for kind, phrases in ERROR_PATTERNS:
+        if any(phrase in message for phrase in phrases):
+            return kind
+    return 'unknown'
+
+
+VIDEO_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{11}$')
+YOUTUBE_HOSTS = ('youtube.com', 'youtube-nocookie.com')
+# /shorts/{id}, /embed/{id} 처럼 경로 두 번째 부분이 영상 ID인 형식
+VIDEO_PATH_PREFIXES = ('shorts', 'embed', 'live', 'v', 'e')
+
+
+def canonical_video_id(value):
+    """영상 ID 또는 YouTube 영상 URL에서 11자 영상 ID 추출 (영상 URL이 아니면 None)
+
+    youtu.be/{id}, (m.|music.)youtube.com/watch?v={id}&t=30, /shorts/{id}, /embed/{id}는
+    모두 같은 ID가 되므로 캐시 키로 사용할 수 있음
+    """
+    value = (value or '').strip()
+    if VIDEO_ID_PATTERN.match(value):
+        return value
+
+    parsed = urlparse(value if '://' in value else f"https://{value}")
+    host = (parsed.hostname or '').lower()
+    parts = [part for part in parsed.path.split('/') if part]
+    candidate = None
+    if host == 'youtu.be':
+        candidate = parts[0] if parts else None
+    elif any(host == name or host.endswith(f".{name}") for name in YOUTUBE_HOSTS):
+        if parts[:1] == ['watch']:
+            candidate = parse_qs(parsed.query).get('v', [None])[0]
+        elif len(parts) >= 2 and parts[0] in VIDEO_PATH_PREFIXES:
+            candidate = parts[1]
+    if candidate and VIDEO_ID_PATTERN.match(candidate):
+        return candidate
+    return None
+
+
+def canonical_video_url(video_id):
+    """추출에 사용하는 영상 URL (같은 영상은 항상 같은 URL)"""
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def fixture_key(url, options):
+    """같은 URL이라도 extract_flat 여부에 따라 결과가 다르므로 함께 키로 사용"""
+    return f"{url}|flat={options.get('extract_flat', False)}"
+
+
+def fixture_filename(url, options):
+    digest = hashlib.sha1(fixture_key(url, options).encode('utf-8')).hexdigest()[:16]
+    return f"{classify_url(url)}-{digest}.json"
+
+
+class Extractor(abc.ABC):
+    """추출기 인터페이스"""
+
+    name = 'base'
+
+    @abc.abstractmethod
+    def extract_info(self, url, options):
+        """URL의 info dict 반환 (yt-dlp extract_info(url, download=False)와 같은 형태)"""
+
+    def sanitize_info(self, info):
+        """캐시/저장할 수 있는 JSON 형태로 정리"""
+        return info
+
+
+class YtDlpExtractor(Extractor):
+    """yt-dlp로 실제 추출 (모듈은 처음 필요할 때 load_module()로 임포트)"""
+
+    name = 'ytdlp'
+
+    def __init__(self, load_module):
+        self.load_module = load_module
+
+    def extract_info(self, url, options):
+        with self.load_module().YoutubeDL(options) as ydl:
+            return ydl.extract_info(url, download=False)
+
+    def sanitize_info(self, info):
+        return self.load_module().YoutubeDL.sanitize_info(info, remove_private_keys=True)
+
+
+class FixtureExtractor(Extractor):
+    """저장된 info dict를 재생 (latency + 0~jitter초 지연으로 실제 추출 시간 흉내)"""
+
+    name = 'fixture'
+
+    def __init__(self, fixture_dir, latency=0.0, jitter=0.0):
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.loaded = {}
+        self.lock = threading.Lock()
+
+    def load_fixture(self, filename):
+        """파일별로 한 번만 읽어 메모리에 보관 (없으면 None)"""
+        with self.lock:
+            if filename not in self.loaded:
+                path = os.path.join(self.fixture_dir, filename)
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        self.loaded[filename] = json.load(f)['info']
+                else:
+                    self.loaded[filename] = None
+            return self.loaded[filename]
+
+    def extract_info(self, url, options):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        info = self.load_fixture(fixture_filename(url, options))
+        if info is None:
+            info = self.load_fixture(f"default-{classify_url(url)}.json")
+        if info is None:
+            raise ExtractorError(f"No fixture for {url} in {self.fixture_dir}")
+        # 호출한 쪽에서 수정해도 저장된 응답은 바뀌지 않도록 복사본 반환
+        return copy.deepcopy(info)
+
+
+class RecordingExtractor(Extractor):
+    """다른 백엔드의 응답을 픽스처 파일로 저장하면서 그대로 반환"""
+
+    name = 'record'
+
+    def __init__(self, backend, fixture_dir):
+        self.backend = backend
+        self.fixture_dir = fixture_dir
+
+    def extract_info(self, url, options):
+        info = self.backend.extract_info(url, options)
+        if info:
+            self.save(url, options, self.backend.sanitize_info(info))
+        return info
+
+    def sanitize_info(self, info):
+        return self.backend.sanitize_info(info)
+
+    def save(self, url, options, info):
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        path = os.path.join(self.fixture_dir, fixture_filename(url, options))
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'url': url,
+                'extract_flat': options.get('extract_flat', False),
+                'recorded_at': datetime.now().isoformat(),
+                'info': info,
+            }, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+# 추가 백엔드 {이름: factory(config, load_module)} - 벤치마크의 합성 추출기 등
+extractor_backends = {}
+
+
+def register_extractor(name, factory):
+    """EXTRACTOR_BACKEND로 고를 수 있는 백엔드 등록"""
+    extractor_backends[name] = factory
+
+
+def create_extractor(config, load_module):
+    """설정(EXTRACTOR_*)에 맞는 추출기 생성"""
+    backend = config.get('EXTRACTOR_BACKEND', 'ytdlp')
+    if backend in extractor_backends:
+        return extractor_backends[backend](config, load_module)
+    fixture_dir = config.get('EXTRACTOR_FIXTURE_DIR', 'fixtures/extractor')
+    if backend == 'fixture':
+        return FixtureExtractor(fixture_dir,
+                                latency=config.get('EXTRACTOR_FIXTURE_LATENCY', 0.0),
+                                jitter=config.get('EXTRACTOR_FIXTURE_JITTER', 0.0))
+    if backend == 'record':
+        return RecordingExtractor(YtDlpExtractor(load_module), fixture_dir)
+    if backend != 'ytdlp':
+        raise ValueError(f"Unknown EXTRACTOR_BACKEND: {backend}")
+    return YtDlpExtractor(load_module)
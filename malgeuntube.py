@@ -0,0 +1,153 @@
+"""
+MalgeunTube 운영 서버 실행
+
+    python -m malgeuntube serve       # 다운로드 프로세스 + 웹 워커
+    python -m malgeuntube web         # 웹 워커만 (다운로드 요청은 DOWNLOAD_SERVICE_URL로 전달)
+    python -m malgeuntube downloads   # 다운로드 전용 프로세스
+
+워커/스레드 수, keep-alive, 타임아웃은 config.py의 SERVER_* 설정을 따름.
+Linux/macOS는 gunicorn(프로세스 x 스레드), Windows는 waitress(단일 프로세스, 스레드)로 실행.
+gunicorn 마스터에 HUP 신호를 보내면 진행 중 요청을 마친 뒤 웹 워커만 교체 (다운로드는 유지)
+web/downloads를 따로 실행할 때는 같은 PROMETHEUS_MULTIPROC_DIR을 지정해야 /metrics가 전체 프로세스를 합산
+"""
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def load_settings(env=None):
+    """FLASK_ENV에 맞는 설정 클래스 반환"""
+    if env:
+        os.environ['FLASK_ENV'] = env
+    from config import get_config
+    return get_config()
+
+
+def worker_exited(server, worker):
+    """종료된 워커의 메트릭 게이지 정리 (gunicorn child_exit 훅)"""
+    from metrics import mark_process_dead
+    mark_process_dead(worker.pid)
+
+
+def prepare_metrics_dir():
+    """모든 프로세스가 메트릭을 합쳐 보여주도록 공유 디렉토리 설정 (이전 실행 값은 삭제)"""
+    metrics_dir = os.environ.setdefault(
+        'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'malgeuntube-metrics'))
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, '*.db')):
+        os.remove(path)
+
+
+def run_server(role, host, port, workers, threads, settings, overrides=None):
+    """gunicorn(설치된 경우) 또는 waitress로 앱 실행"""
+    app_config = dict(overrides or {}, SERVER_ROLE=role)
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+
+    if BaseApplication is None:
+        try:
+            from waitress import serve
+        except ImportError:
+            sys.exit("gunicorn 또는 waitress가 필요합니다: pip install -r requirements.txt")
+        from app import create_app
+        # waitress는 단일 프로세스이므로 워커 x 스레드만큼 스레드 사용
+        serve(create_app(app_config), host=host, port=port,
+              threads=workers * threads, channel_timeout=settings.SERVER_TIMEOUT)
+        return
+
+    options = {
+        'bind': f"{host}:{port}",
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread',
+        'keepalive': settings.SERVER_KEEPALIVE,
+        'timeout': settings.SERVER_TIMEOUT,
+        'graceful_timeout': settings.SERVER_GRACEFUL_TIMEOUT,
+        # 다운로드 프로세스는 워커가 하나뿐이고 작업/진행률을 메모리에 두므로 주기적으로 재시작하지 않음
+        'max_requests': 0 if role == 'downloads' else settings.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': 0 if role == 'downloads' else settings.SERVER_MAX_REQUESTS_JITTER,
+        # 워커마다 앱을 초기화 - 마스터에서 스레드(yt-dlp 미리 로드 등)를 만든 뒤 fork하지 않도록
+        'preload_app': False,
+        'proc_name': f"malgeuntube-{role}",
+        # 제어 소켓 경로가 겹치지 않도록 다운로드 프로세스는 제어 소켓 없이 실행 (gunicorn 25.1+)
+        'control_socket_disable': role == 'downloads',
+        'child_exit': worker_exited,
+    }
+
+    class MalgeunTubeServer(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                if key in self.cfg.settings:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            from app import create_app
+            return create_app(app_config)
+
+    MalgeunTubeServer().run()
+
+
+def download_service_url(settings):
+    return f"http://{settings.DOWNLOAD_SERVICE_HOST}:{settings.DOWNLOAD_SERVICE_PORT}"
+
+
+def run_downloads(settings):
+    """다운로드 작업과 디렉토리 정리를 맡는 단일 프로세스 (로컬 주소에서만 수신)"""
+    run_server('downloads', settings.DOWNLOAD_SERVICE_HOST, settings.DOWNLOAD_SERVICE_PORT,
+               1, settings.DOWNLOAD_SERVICE_THREADS, settings)
+
+
+def run_web(args, settings, service_url=None):
+    """웹 워커 - 다운로드 관련 요청은 다운로드 서비스로 전달"""
+    service_url = service_url or settings.DOWNLOAD_SERVICE_URL
+    if not service_url:
+        sys.exit("web 모드에는 DOWNLOAD_SERVICE_URL 설정이 필요합니다. (또는 serve 사용)")
+    run_server('web', args.host or settings.SERVER_HOST, args.port or settings.SERVER_PORT,
+               args.workers or settings.SERVER_WORKERS, args.threads or settings.SERVER_THREADS,
+               settings, overrides={'DOWNLOAD_SERVICE_URL': service_url})
+
+
+def run_all(args, settings):
+    """다운로드 프로세스를 띄우고 웹 워커 실행 - 웹 서버가 끝나면 다운로드 프로세스도 종료"""
+    command = [sys.executable, '-m', 'malgeuntube', 'downloads']
+    if args.env:
+        command += ['--env', args.env]
+    prepare_metrics_dir()
+    downloads = subprocess.Popen(command)
+    try:
+        run_web(args, settings, service_url=download_service_url(settings))
+    finally:
+        downloads.terminate()
+        try:
+            downloads.wait(timeout=settings.SERVER_GRACEFUL_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            downloads.kill()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='malgeuntube', description='MalgeunTube 서버 실행')
+    parser.add_argument('command', choices=['serve', 'web', 'downloads'])
+    parser.add_argument('--env', help='설정 환경 (development / production / testing)')
+    parser.add_argument('--host', help='웹 서버 주소 (기본: SERVER_HOST)')
+    parser.add_argument('--port', type=int, help='웹 서버 포트 (기본: SERVER_PORT)')
+    parser.add_argument('--workers', type=int, help='웹 워커 프로세스 수 (기본: SERVER_WORKERS)')
+    parser.add_argument('--threads', type=int, help='워커당 스레드 수 (기본: SERVER_THREADS)')
+    args = parser.parse_args(argv)
+
+    settings = load_settings(args.env)
+    if args.command == 'downloads':
+        # 다운로드 프로세스는 웹 서버 옵션(--host/--port/--workers/--threads)을 쓰지 않음
+        run_downloads(settings)
+    else:
+        commands = {'serve': run_all, 'web': run_web}
+        commands[args.command](args, settings)
+
+
+if __name__ == '__main__':
+    main()
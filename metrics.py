@@ -0,0 +1,145 @@
+"""
+MalgeunTube Prometheus 메트릭
+
+/metrics 엔드포인트에서 노출하는 라우트/캐시/추출/다운로드 지표 정의.
+여러 프로세스(gunicorn 워커 + 다운로드 프로세스)로 실행할 때는 PROMETHEUS_MULTIPROC_DIR을
+설정하면 모든 프로세스의 값을 합쳐서 보여줌 (python -m malgeuntube serve는 자동 설정)
+"""
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import g, has_request_context
+from flask_caching.backends.simplecache import SimpleCache
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+REQUEST_SECONDS = Histogram(
+    'malgeuntube_request_duration_seconds',
+    '라우트별 응답 시간 (스트리밍 응답은 헤더 전송까지)',
+    ['endpoint', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+REQUESTS = Counter(
+    'malgeuntube_requests_total', '라우트별 요청 수', ['endpoint', 'method', 'status']
+)
+EXTRACTION_SECONDS = Histogram(
+    'malgeuntube_extraction_duration_seconds',
+    'yt-dlp 추출 시간 (캐시 미스만)',
+    ['kind'],
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64)
+)
+CACHE_REQUESTS = Counter(
+    'malgeuntube_cache_requests_total', '캐시 계층별 적중/미스 수', ['layer', 'result']
+)
+EXTRACTION_FAILURES = Counter(
+    'malgeuntube_extraction_failures_total', '추출 실패 수 (캐시 계층, 오류 종류별)', ['layer', 'kind']
+)
+CACHE_EVICTIONS = Counter(
+    'malgeuntube_cache_evictions_total', '캐시 용량 정리로 삭제된 항목 수'
+)
+DOWNLOAD_STAGE_QUEUED = Gauge(
+    'malgeuntube_download_stage_queued', '다운로드 단계별 대기 작업 수', ['stage'],
+    multiprocess_mode='livesum'
+)
+DOWNLOAD_STAGE_ACTIVE = Gauge(
+    'malgeuntube_download_stage_active', '다운로드 단계별 실행 중 작업 수', ['stage'],
+    multiprocess_mode='livesum'
+)
+DOWNLOAD_STAGE_WORKERS = Gauge(
+    'malgeuntube_download_stage_workers', '다운로드 단계별 워커 수', ['stage'],
+    multiprocess_mode='livesum'
+)
+DOWNLOADS = Counter(
+    'malgeuntube_downloads_total', '종료된 다운로드 작업 수', ['status']
+)
+
+
+def observe_extraction(kind):
+    """yt-dlp 추출 함수의 실행 시간 기록 (캐시 안쪽에 적용하면 미스만 측정됨)"""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                EXTRACTION_SECONDS.labels(kind).observe(elapsed)
+                record_span(f"extract_{kind}", elapsed)
+        return wrapper
+    return decorator
+
+
+def record_cache_lookup(layer, hit):
+    CACHE_REQUESTS.labels(layer, 'hit' if hit else 'miss').inc()
+
+
+def record_negative_cache_hit(layer):
+    """저장된 실패를 재시도 없이 돌려준 경우"""
+    CACHE_REQUESTS.labels(layer, 'negative_hit').inc()
+
+
+# ---------- 요청 구간 시간 (Server-Timing) ----------
+
+def record_span(name, seconds):
+    """현재 요청의 구간 시간 누적 (요청 밖 - 백그라운드 스레드 등 - 에서는 무시)"""
+    if not has_request_context():
+        return
+    spans = g.get('spans')
+    if spans is not None:
+        total, count = spans.get(name, (0.0, 0))
+        spans[name] = (total + seconds, count + 1)
+
+
+@contextmanager
+def span(name):
+    """with 블록 또는 데코레이터로 구간 시간 측정"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+
+def format_server_timing(spans, total):
+    """Server-Timing 헤더 값 (밀리초, 여러 번 실행된 구간은 횟수 표시)"""
+    parts = []
+    for name, (seconds, count) in spans.items():
+        entry = f"{name};dur={seconds * 1000:.1f}"
+        if count > 1:
+            entry += f';desc="x{count}"'
+        parts.append(entry)
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ', '.join(parts)
+
+
+class InstrumentedSimpleCache(SimpleCache):
+    """용량 초과로 밀려난 항목 수를 세는 SimpleCache (CACHE_TYPE으로 지정)
+
+    _prune은 만료된 항목을 먼저 지우고, 그래도 넘치면 _remove_older로 오래된 항목을 지움 - 뒤쪽만 셈
+    """
+
+    def _remove_older(self):
+        before = len(self._cache)
+        super()._remove_older()
+        removed = before - len(self._cache)
+        if removed > 0:
+            CACHE_EVICTIONS.inc(removed)
+
+
+def render_latest():
+    """Prometheus 텍스트 형식으로 현재 메트릭 반환 (본문, Content-Type)"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid):
+    """종료된 워커의 실시간 게이지 값 정리 (gunicorn child_exit 훅)"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,164 @@
+"""
+SQLite 기반 Rate Limit 저장소
+
+같은 서버의 여러 워커 프로세스가 하나의 카운터를 공유하도록 limits 저장소를 구현.
+import하면 'sqlite://' 스킴이 등록되어 RATELIMIT_STORAGE_URL에서 사용할 수 있음.
+
+    sqlite:///data/ratelimit.db          # 상대 경로
+    sqlite:////var/lib/malgeuntube/rl.db # 절대 경로
+"""
+import os
+import sqlite3
+import threading
+import time
+from math import floor
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+# 만료된 카운터 정리 주기 (초)
+PURGE_INTERVAL = 60
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """고정 윈도우/슬라이딩 윈도우 카운터를 SQLite 한 테이블에 저장
+
+    확인과 증가를 하나의 쓰기 트랜잭션(BEGIN IMMEDIATE)으로 처리하므로
+    워커 수와 관계없이 제한이 정확하게 적용됨
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        path = uri.split('://', 1)[1] if uri else 'ratelimit.db'
+        # SQLAlchemy와 같은 규칙: sqlite:///상대경로, sqlite:////절대경로
+        self.path = path[1:] if path.startswith('/') else path
+        self.timeout = float(options.get('timeout', 5))
+        self.local = threading.local()
+        self.last_purge = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def connection(self):
+        """스레드별 연결 (fork된 프로세스에서는 새로 연결)"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or self.local.pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS ratelimit_counters ('
+                'key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 - 다른 프로세스와 확인/증가가 섞이지 않도록"""
+        conn = self.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        return conn
+
+    def _read(self, conn, key, now):
+        row = conn.execute(
+            'SELECT count, expires_at FROM ratelimit_counters WHERE key = ? AND expires_at > ?',
+            (key, now)
+        ).fetchone()
+        return row if row else (0, now)
+
+    def _incr(self, conn, key, expiry, amount, now):
+        count, expires_at = self._read(conn, key, now)
+        if count == 0:
+            expires_at = now + expiry
+        conn.execute(
+            'INSERT OR REPLACE INTO ratelimit_counters (key, count, expires_at) VALUES (?, ?, ?)',
+            (key, count + amount, expires_at)
+        )
+        return count + amount
+
+    def _purge(self, conn, now):
+        """만료된 카운터를 주기적으로 삭제"""
+        if now - self.last_purge >= PURGE_INTERVAL:
+            self.last_purge = now
+            conn.execute('DELETE FROM ratelimit_counters WHERE expires_at <= ?', (now,))
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        conn = self.transaction()
+        try:
+            count = self._incr(conn, key, expiry, amount, now)
+            self._purge(conn, now)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return count
+
+    def get(self, key):
+        return self._read(self.connection(), key, time.time())[0]
+
+    def get_expiry(self, key):
+        now = time.time()
+        return self._read(self.connection(), key, now)[1]
+
+    def clear(self, key):
+        self.connection().execute('DELETE FROM ratelimit_counters WHERE key = ?', (key,))
+
+    def reset(self):
+        cursor = self.connection().execute('DELETE FROM ratelimit_counters')
+        return cursor.rowcount
+
+    def check(self):
+        try:
+            self.connection().execute('SELECT 1')
+            return True
+        except sqlite3.Error:
+            return False
+
+    # ---------- 슬라이딩 윈도우 카운터 ----------
+
+    def _sliding_window_info(self, conn, key, expiry, now):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._read(conn, previous_key, now)[0]
+        current_count = self._read(conn, current_key, now)[0]
+        if previous_count == 0:
+            previous_ttl = 0.0
+        else:
+            previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        now = time.time()
+        conn = self.transaction()
+        try:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window_info(
+                conn, key, expiry, now)
+            weighted_count = previous_count * previous_ttl / expiry + current_count
+            acquired = floor(weighted_count) + amount <= limit
+            if acquired:
+                # 현재 윈도우 카운터는 다음 윈도우의 '이전 윈도우'로도 쓰이므로 2배 동안 유지
+                _, current_key = self.sliding_window_keys(key, expiry, now)
+                self._incr(conn, current_key, 2 * expiry, amount, now)
+                self._purge(conn, now)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return acquired
+
+    def get_sliding_window(self, key, expiry):
+        return self._sliding_window_info(self.connection(), key, expiry, time.time())
+
+    def clear_sliding_window(self, key, expiry):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.connection().execute(
+            'DELETE FROM ratelimit_counters WHERE key IN (?, ?)', (previous_key, current_key))
@@ -0,0 +1,105 @@
+"""
+MalgeunTube 추출 결과 캐시
+
+성공 결과와 실패를 따로 저장:
+
+    {namespace}:{key}        # 성공 결과 (호출한 쪽이 정한 timeout)
+    {namespace}_error:{key}  # 실패 기록 {kind, message, failures, retry_at}
+
+실패는 오류 종류별 짧은 TTL(config의 NEGATIVE_CACHE_TTLS)로만 재사용하고, 같은 키가 연속으로 실패하면
+TTL을 두 배씩 늘림 (NEGATIVE_CACHE_MAX_TTL까지). TTL이 0인 종류(네트워크 오류 등
+바로 다시 시도하면 성공할 가능성이 높은 오류)는 저장한 실패를 돌려주지 않고 항상 다시 시도함
+"""
+import time
+
+import metrics
+from extractors import classify_error
+
+# TTL이 0인 실패 기록의 보관 시간 - 연속 실패 수만 잠깐 기억
+ZERO_TTL_RECORD_TIMEOUT = 60
+
+
+class CachedFailure(Exception):
+    """저장된 실패를 재시도 시각 전까지 그대로 돌려줌 (메시지는 원래 오류와 같음)"""
+
+    def __init__(self, failure):
+        super().__init__(failure['message'])
+        self.kind = failure['kind']
+        self.retry_after = max(0, int(failure['retry_at'] - time.time()))
+
+
+class ResultCache:
+    """Flask-Caching 캐시 위에 성공/실패 결과를 나눠 저장 (설정은 호출할 때마다 config에서 읽음)"""
+
+    def __init__(self, cache, config):
+        self.cache = cache
+        self.config = config
+
+    @staticmethod
+    def result_key(namespace, key):
+        return f"{namespace}:{key}"
+
+    @staticmethod
+    def failure_key(namespace, key):
+        return f"{namespace}_error:{key}"
+
+    def negative_ttl(self, kind, failures):
+        """실패 재사용 시간 - 오류 종류별 기본값 x 2^(연속 실패 수 - 1)"""
+        ttls = self.config.get('NEGATIVE_CACHE_TTLS', {})
+        base = ttls.get(kind, ttls.get('unknown', 0))
+        if base <= 0:
+            return 0
+        return min(base * 2 ** (failures - 1), self.config.get('NEGATIVE_CACHE_MAX_TTL', 900))
+
+    def get(self, namespace, key, compute, timeout=None, cached=True):
+        """캐시된 성공 결과, 재시도 시각 전인 실패(CachedFailure), 또는 compute() 결과
+
+        timeout이 None이면 성공 결과를 여기서 저장하지 않음 (compute가 직접 저장)
+        cached=False면 성공 결과를 캐시하지 않는 경로 - 성공 결과 조회와 조회 메트릭 생략
+        compute()가 실패하면 실패를 기록한 뒤 원래 예외를 그대로 올림
+        """
+        if cached:
+            value = self.cache.get(self.result_key(namespace, key))
+            if value is not None:
+                metrics.record_cache_lookup(namespace, True)
+                return value
+
+        failure = self.cache.get(self.failure_key(namespace, key))
+        if failure and failure['retry_at'] > time.time():
+            metrics.record_negative_cache_hit(namespace)
+            raise CachedFailure(failure)
+        if cached:
+            metrics.record_cache_lookup(namespace, False)
+
+        try:
+            value = compute()
+        except Exception as e:
+            self.record_failure(namespace, key, e, failure)
+            raise
+
+        if failure:
+            self.cache.delete(self.failure_key(namespace, key))
+        if cached and timeout is not None and value is not None:
+            self.cache.set(self.result_key(namespace, key), value, timeout=timeout)
+        return value
+
+    def record_failure(self, namespace, key, error, previous=None):
+        """실패 기록 - 재시도 시각이 지나도 기록은 남겨 두고 연속 실패 수를 백오프에 사용"""
+        kind = classify_error(error)
+        failures = (previous or {}).get('failures', 0) + 1
+        ttl = self.negative_ttl(kind, failures)
+        metrics.EXTRACTION_FAILURES.labels(namespace, kind).inc()
+        if ttl:
+            timeout = max(ttl * 2, self.config.get('NEGATIVE_CACHE_MAX_TTL', 900))
+        else:
+            timeout = ZERO_TTL_RECORD_TIMEOUT
+        self.cache.set(self.failure_key(namespace, key), {
+            'kind': kind,
+            'message': str(error),
+            'failures': failures,
+            'retry_at': time.time() + ttl,
+        }, timeout=timeout)
+
+    def forget_failure(self, namespace, key):
+        """다른 경로(다운로드 등)에서 추출에 성공했을 때 실패 기록 삭제"""
+        self.cache.delete(self.failure_key(namespace, key))
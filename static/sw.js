@@ -3,24 +3,24 @@
  * 오프라인 지원 및 캐싱 전략
  */
 
-// 캐시 버전 - 배포 시 업데이트
-const SW_VERSION = '1.0.0';
+// 캐시 버전 - 서버가 주입한 자산 매니페스트 해시 (정적 파일이 바뀌면 자동으로 바뀜)
+const ASSET_MANIFEST = self.ASSET_MANIFEST || {};
+const SW_VERSION = self.ASSET_VERSION || '1.0.0';
 const CACHE_NAME = `malgeuntube-${SW_VERSION}`;
 const STATIC_CACHE_NAME = `malgeuntube-static-${SW_VERSION}`;
 const DYNAMIC_CACHE_NAME = `malgeuntube-dynamic-${SW_VERSION}`;
 
-// 정적 리소스 캐시 목록
+// 정적 리소스 캐시 목록 - 해시 URL은 매니페스트에서 정확히 가져옴
 const STATIC_ASSETS = [
     '/',
-    '/static/css/style.css',
-    '/static/js/main.js',
-    '/static/manifest.json'
+    ...Object.values(ASSET_MANIFEST)
 ];
 
 // 캐시 전략 설정
 const CACHE_STRATEGIES = {
     // 정적 리소스: Cache First
     static: [
+        '/assets/',
         '/static/css/',
         '/static/js/',
         '/static/icons/',
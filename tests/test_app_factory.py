@@ -0,0 +1,61 @@
+"""
+앱 팩토리 테스트 - create_app()에 넘긴 설정이 풀/대역폭/Rate Limit에 반영되는지 확인
+
+앱은 프로세스당 한 번만 초기화되므로 별도 프로세스에서 create_app()을 호출함
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FACTORY_SCRIPT = textwrap.dedent('''
+    import json, os, sys
+    work_dir = sys.argv[1]
+    import app as app_module
+
+    flask_app = app_module.create_app({
+        'TESTING': True,
+        'DATA_DIR': os.path.join(work_dir, 'data'),
+        'DOWNLOAD_DIR': os.path.join(work_dir, 'downloads'),
+        'UPLOAD_FOLDER': os.path.join(work_dir, 'uploads'),
+        'LOGS_DIR': os.path.join(work_dir, 'logs'),
+        'LOG_LEVEL': 'ERROR',
+        'PRELOAD_YT_DLP': False,
+        'DOWNLOAD_NETWORK_WORKERS': 5,
+        'DOWNLOAD_POSTPROCESS_WORKERS': 2,
+        'DOWNLOAD_BANDWIDTH_LIMIT': 1234,
+        'HOME_SHELF_WORKERS': 7,
+        'RATELIMIT_ENABLED': True,
+        'RATELIMIT_STORAGE_URI': 'memory://',
+        'RATELIMIT_DOWNLOAD': '1 per minute',
+    })
+    app_module.save_profiles([{'id': 'p1', 'name': 'test'}])
+    client = flask_app.test_client()
+    with client.session_transaction() as sess:
+        sess['logged_in'] = True
+        sess['profile_id'] = 'p1'
+    statuses = [client.post('/api/download', json={}).status_code for _ in range(2)]
+    print(json.dumps({
+        'workers': {name: stage['workers'] for name, stage in app_module.pipeline_stages.items()},
+        'bandwidth': app_module.bandwidth_budget.limit,
+        'shelf_workers': app_module.shelf_executor._max_workers,
+        'download_statuses': statuses,
+    }))
+''')
+
+
+def test_create_app_applies_overrides(tmp_path):
+    result = subprocess.run(
+        [sys.executable, '-c', FACTORY_SCRIPT, str(tmp_path)],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    values = json.loads(result.stdout.strip().splitlines()[-1])
+    assert values['workers'] == {'network': 5, 'postprocess': 2}
+    assert values['bandwidth'] == 1234
+    assert values['shelf_workers'] == 7
+    # RATELIMIT_DOWNLOAD='1 per minute' - 두 번째 요청은 제한
+    assert values['download_statuses'] == [200, 429]
@@ -0,0 +1,55 @@
+"""
+해시 포함 정적 리소스 테스트 (매니페스트, /assets/ immutable 캐시, 서비스 워커 사전 캐싱 목록)
+"""
+import hashlib
+import os
+import re
+
+import pytest
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def test_manifest_hashes_file_contents(app_module, tmp_path):
+    (tmp_path / 'css').mkdir()
+    (tmp_path / 'css' / 'style.css').write_bytes(b'body{}')
+    (tmp_path / 'sw.js').write_bytes(b'')
+    (tmp_path / 'avatars').mkdir()
+    (tmp_path / 'avatars' / 'p1.png').write_bytes(b'png')
+
+    digest = hashlib.md5(b'body{}').hexdigest()[:10]
+    # 서비스 워커와 아바타는 고정 URL
+    assert app_module.build_asset_manifest(str(tmp_path)) == {'css/style.css': f"css/style.{digest}.css"}
+
+
+def test_asset_url_resolves_through_manifest(app_module):
+    hashed = app_module.asset_manifest['css/style.css']
+    assert re.fullmatch(r'css/style\.[0-9a-f]{10}\.css', hashed)
+    with app_module.app.test_request_context():
+        assert app_module.asset_url('css/style.css') == f"/assets/{hashed}"
+        # 매니페스트에 없는 파일은 일반 static URL
+        assert app_module.asset_url('sw.js') == '/static/sw.js'
+
+
+def test_hashed_asset_is_immutable(app_module, client):
+    hashed = app_module.asset_manifest['css/style.css']
+    response = client.get(f"/assets/{hashed}")
+    assert response.status_code == 200
+    assert response.cache_control.public and response.cache_control.immutable
+    assert response.cache_control.max_age == app_module.app.config['ASSET_MAX_AGE']
+    with open(os.path.join(app_module.app.static_folder, 'css', 'style.css'), 'rb') as f:
+        assert response.data == f.read()
+    response.close()
+
+
+def test_unknown_hash_is_404(client):
+    assert client.get('/assets/css/style.0000000000.css').status_code == 404
+
+
+def test_service_worker_precaches_hashed_urls(app_module, client):
+    script = client.get('/static/sw.js').get_data(as_text=True)
+    assert f'self.ASSET_VERSION = "{app_module.asset_version}";' in script
+    assert f"/assets/{app_module.asset_manifest['js/main.js']}" in script
@@ -0,0 +1,53 @@
+"""
+다운로드 대역폭 분배 테스트 (max-min 공정 분배)
+"""
+import pytest
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def budget(app_module):
+    budget = app_module.BandwidthBudget(30 * MB)
+    for job in 'abc':
+        budget.allocate(job, now=0)
+    return budget
+
+
+def measure(budget, job, rate):
+    """한 측정 구간 동안 rate(bytes/s)로 받은 것으로 기록"""
+    window = budget.RATE_WINDOW
+    budget.delay(job, 'f', int(rate * window), now=window)
+
+
+def test_split_equally_before_measuring(budget):
+    assert budget.allocations() == {'a': 10 * MB, 'b': 10 * MB, 'c': 10 * MB}
+
+
+def test_redistributes_slow_job_share(budget):
+    # 느린 작업은 측정 속도 x 여유만 받고 남는 몫은 나머지 작업이 나눔
+    measure(budget, 'a', 2 * MB)
+    measure(budget, 'b', 10 * MB)
+    allocations = budget.allocations()
+    assert allocations['a'] == pytest.approx(2.5 * MB)
+    # b도 남은 몫(13.75MB)보다 느리므로 측정 속도 x 여유(12.5MB)만, c가 나머지
+    assert allocations['b'] == pytest.approx(12.5 * MB)
+    assert allocations['c'] == pytest.approx(15 * MB)
+
+
+def test_release_returns_share(budget):
+    budget.release('c')
+    assert budget.allocations() == {'a': 15 * MB, 'b': 15 * MB}
+
+
+def test_delay_when_over_allocation(budget):
+    # 10MB/s 배정에서 0.5초 만에 10MB를 받으면 0.5초 더 기다려야 함
+    assert budget.delay('a', 'f', 10 * MB, now=0.5) == pytest.approx(0.5)
+    assert budget.delay('b', 'f', 1 * MB, now=0.5) == 0
+
+
+def test_unlimited_budget(app_module):
+    budget = app_module.BandwidthBudget(0)
+    budget.allocate('a')
+    assert budget.allocations() == {}
+    assert budget.delay('a', 'f', 10 * MB) == 0
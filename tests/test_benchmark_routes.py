@@ -0,0 +1,51 @@
+"""
+라우트 벤치마크 테스트 (합성 추출기, 통계 집계, 작은 프로필로 전체 실행)
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.routes import SyntheticExtractor, percent_change, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VIDEO_ID = 'dQw4w9WgXcQ'
+
+
+def test_synthetic_extractor_matches_url_kind():
+    extractor = SyntheticExtractor()
+    video = extractor.extract_info(f"https://www.youtube.com/watch?v={VIDEO_ID}", {})
+    assert video['id'] == VIDEO_ID
+    assert [f['height'] for f in video['formats']] == [360, 720, 1080]
+    # 같은 URL은 같은 응답
+    assert extractor.extract_info(f"https://www.youtube.com/watch?v={VIDEO_ID}", {}) == video
+
+    assert len(extractor.extract_info('ytsearch7:lofi', {})['entries']) == 7
+    assert len(extractor.extract_info('https://www.youtube.com/channel/UC1/videos', {})['entries']) == 20
+
+
+def test_summarize_and_percent_change():
+    stats = summarize([0.001 * i for i in range(1, 101)])
+    assert stats['iterations'] == 100
+    assert stats['p50_ms'] == pytest.approx(50.5)
+    assert stats['max_ms'] == 100.0
+    assert summarize([0.5])['p99_ms'] == 500.0
+
+    assert percent_change(100.0, 110.0) == '+10.0%'
+    assert percent_change(None, 1.0) == '-'
+
+
+def test_benchmark_runs_every_scenario():
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.routes', '--size', 'small', '-n', '2', '--warmup', '1', '--json'],
+        cwd=ROOT, capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout)
+    assert set(report['results']) == {
+        'index', 'watch', 'search', 'feed', 'channel_detail', 'progress_update', 'api_search',
+        'playlist_add', 'playlist_remove', 'playlist_reorder', 'playlist_move', 'playlist_create_delete',
+    }
+    assert all(stats['iterations'] == 2 for stats in report['results'].values())
@@ -0,0 +1,101 @@
+"""
+메모리 진단 테스트 (캐시 통계/삭제, 운영용 엔드포인트 접근 검사)
+"""
+import pytest
+from cachelib import SimpleCache
+
+import diagnostics
+
+
+@pytest.fixture
+def backend():
+    cache = SimpleCache(threshold=100)
+    cache.set('video_info:a', {'title': 'a'})
+    cache.set('video_info:b', {'title': 'b'})
+    cache.set('video_info_error:c', {'kind': 'unavailable'})
+    cache.set('shelf:related:a', ['x'])
+    cache.set('shelf:trending:KR', ['y'])
+    cache.set('legacy', 1)
+    return cache
+
+
+def test_cache_stats_groups_by_namespace(backend):
+    stats = diagnostics.cache_stats(backend)
+    assert stats['supported']
+    assert stats['entries'] == 6
+    assert {name: ns['entries'] for name, ns in stats['namespaces'].items()} == {
+        'video_info': 2, 'video_info_error': 1, 'shelf': 2, 'other': 1,
+    }
+
+
+def test_purge_cache_by_namespace(backend):
+    removed, freed = diagnostics.purge_cache(backend, namespace='video_info')
+    assert removed == 2
+    assert freed > 0
+    assert backend.get('video_info:a') is None
+    assert backend.get('video_info_error:c') is not None
+
+
+def test_purge_cache_by_prefix(backend):
+    removed, _ = diagnostics.purge_cache(backend, prefix='shelf:related:')
+    assert removed == 1
+    assert backend.get('shelf:trending:KR') == ['y']
+
+
+def test_purge_cache_all(backend):
+    removed, _ = diagnostics.purge_cache(backend)
+    assert removed == 6
+    assert diagnostics.cache_stats(backend)['entries'] == 0
+
+
+def test_purge_cache_unsupported_backend():
+    with pytest.raises(ValueError):
+        diagnostics.purge_cache(object(), namespace='video_info')
+
+
+@pytest.mark.parametrize('token, local_access, headers, login, status', [
+    (None, True, {}, False, 200),
+    (None, False, {}, False, 401),
+    (None, False, {}, True, 200),
+    ('secret', True, {}, False, 401),
+    ('secret', False, {'Authorization': 'Bearer secret'}, False, 200),
+])
+def test_admin_memory_access(app_module, monkeypatch, token, local_access, headers, login, status):
+    monkeypatch.setitem(app_module.app.config, 'METRICS_TOKEN', token)
+    monkeypatch.setitem(app_module.app.config, 'INTERNAL_LOCAL_ACCESS', local_access)
+    client = app_module.app.test_client()
+    if login:
+        with client.session_transaction() as sess:
+            sess['logged_in'] = True
+    assert client.get('/admin/memory', headers=headers).status_code == status
+
+
+@pytest.mark.parametrize('token, local_access, headers, status', [
+    (None, True, {}, 200),
+    (None, False, {}, 401),
+    ('secret', False, {'Authorization': 'Bearer secret'}, 200),
+])
+def test_metrics_requires_token_in_production(app_module, monkeypatch, token, local_access, headers, status):
+    monkeypatch.setitem(app_module.app.config, 'METRICS_TOKEN', token)
+    monkeypatch.setitem(app_module.app.config, 'INTERNAL_LOCAL_ACCESS', local_access)
+    client = app_module.app.test_client()
+    # 수집기는 로그인하지 않으므로 세션으로는 열리지 않음
+    with client.session_transaction() as sess:
+        sess['logged_in'] = True
+    assert client.get('/metrics', headers=headers).status_code == status
+
+
+def test_evictions_count_only_capacity_removals():
+    import metrics
+
+    cache = metrics.InstrumentedSimpleCache(threshold=2)
+    before = metrics.CACHE_EVICTIONS._value.get()
+    # 한도(2)를 넘은 상태에서 set하면 정리 - 만료된 a, b만 지워짐
+    for key in 'abc':
+        cache.set(key, 1, timeout=-1 if key in 'ab' else None)
+    cache.set('d', 1)
+    assert metrics.CACHE_EVICTIONS._value.get() == before
+    # 만료된 항목이 없으면 오래된 항목을 밀어냄
+    cache.set('e', 1)
+    cache.set('f', 1)
+    assert metrics.CACHE_EVICTIONS._value.get() == before + 1
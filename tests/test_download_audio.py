@@ -0,0 +1,29 @@
+"""
+오디오 다운로드 포맷 선택과 후처리 경로 테스트
+"""
+import pytest
+
+
+def test_audio_format_prefers_copyable_streams(app_module):
+    assert app_module.build_download_format('audio', 'best') == \
+        'bestaudio[ext=m4a]/bestaudio[ext=webm]/bestaudio/best'
+
+
+@pytest.mark.parametrize('ext, audio_format, path', [
+    ('m4a', 'original', 'passthrough'),
+    ('webm', 'original', 'remux'),
+    ('mp3', 'mp3', 'passthrough'),
+    ('m4a', 'mp3', 'transcode'),
+])
+def test_choose_audio_path(app_module, ext, audio_format, path):
+    assert app_module.choose_audio_path({'ext': ext}, audio_format) == path
+
+
+@pytest.mark.parametrize('codec, reencode', [
+    ('aac', False), ('opus', False), ('vorbis', False), ('ac3', True), (None, False),
+])
+def test_audio_reencode_needed(app_module, codec, reencode):
+    class FakePP:
+        def get_audio_codec(self, path):
+            return codec
+    assert app_module.audio_reencode_needed(FakePP(), 'a.webm') is reencode
@@ -0,0 +1,72 @@
+"""
+다운로드 취소 테스트 (대기 중 취소, 실행 중 취소 요청) 및 일괄 다운로드 ZIP 파일명
+"""
+from concurrent.futures import Future
+from urllib.parse import quote
+
+import pytest
+
+
+@pytest.fixture
+def downloads(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'download_progress', {})
+    monkeypatch.setattr(app_module, 'download_tasks', {})
+    monkeypatch.setattr(app_module, 'batch_downloads', {})
+    return app_module
+
+
+def add_job(module, running):
+    future = Future()
+    if running:
+        future.set_running_or_notify_cancel()
+    module.download_progress['job'] = {'status': 'downloading', 'progress': 10, 'timings': {}}
+    module.download_tasks['job'] = future
+    return future
+
+
+def cancel(module):
+    with module.app.test_request_context(method='POST'):
+        return module.api_download_cancel('job').get_json()
+
+
+def test_queued_download_is_cancelled(downloads):
+    future = add_job(downloads, running=False)
+    result = cancel(downloads)
+    assert result['success']
+    assert future.cancelled()
+    assert downloads.download_progress['job']['status'] == 'cancelled'
+
+
+def test_running_download_is_cancelled_by_progress_hook(downloads):
+    add_job(downloads, running=True)
+    result = cancel(downloads)
+    assert result['success']
+    progress = downloads.download_progress['job']
+    # 실행 중인 작업은 바로 'cancelled'가 되지 않고 작업 쪽에서 중단함
+    assert progress['status'] == 'downloading'
+    assert progress['cancel_requested']
+
+    with pytest.raises(downloads.DownloadCancelled):
+        downloads.progress_hook({'status': 'downloading', 'downloaded_bytes': 1}, 'job')
+
+
+def test_running_download_cancelled_before_postprocess(downloads):
+    add_job(downloads, running=True)
+    cancel(downloads)
+    downloads.download_postprocess_task({'files': [], 'file_id': None}, 'job')
+    assert downloads.download_progress['job']['status'] == 'cancelled'
+
+
+def test_batch_zip_keeps_korean_title(downloads):
+    downloads.batch_downloads['batch'] = {
+        'title': '한국어 재생목록',
+        'playlist_id': 'PL123',
+        'status': 'queued',
+        'options': ('video', 'best', 'original'),
+        'items': [],
+    }
+    with downloads.app.test_request_context():
+        response = downloads.serve_batch_download('batch')
+    disposition = response.headers['Content-Disposition']
+    assert 'filename="PL123.zip"' in disposition
+    assert f"filename*=UTF-8''{quote('한국어 재생목록.zip')}" in disposition
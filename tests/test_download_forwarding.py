@@ -0,0 +1,107 @@
+"""
+웹 워커 → 다운로드 서비스 전달 테스트 (SERVER_ROLE='web')
+
+앱은 프로세스당 한 번만 초기화되므로 별도 프로세스에서 web 역할 앱과 가짜 다운로드 서비스를 띄움
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FORWARD_SCRIPT = textwrap.dedent('''
+    import json, os, sys, threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    work_dir = sys.argv[1]
+    received = []
+
+    class DownloadService(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            received.append({'method': self.command, 'path': self.path, 'body': body.decode(),
+                             'request_id': self.headers.get('X-Request-ID')})
+            status = 404 if self.path.endswith('/missing') else 201
+            payload = json.dumps({'success': status == 201, 'from': 'downloads'}).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), DownloadService)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    import app as app_module
+    flask_app = app_module.create_app({
+        'TESTING': True,
+        'DATA_DIR': os.path.join(work_dir, 'data'),
+        'DOWNLOAD_DIR': os.path.join(work_dir, 'downloads'),
+        'UPLOAD_FOLDER': os.path.join(work_dir, 'uploads'),
+        'LOGS_DIR': os.path.join(work_dir, 'logs'),
+        'LOG_LEVEL': 'CRITICAL',
+        'PRELOAD_YT_DLP': False,
+        'RATELIMIT_ENABLED': False,
+        'CACHE_TYPE': 'SimpleCache',
+        'SERVER_ROLE': 'web',
+        'DOWNLOAD_SERVICE_URL': f"http://127.0.0.1:{server.server_port}",
+    })
+    app_module.save_profiles([{'id': 'p1', 'name': 'test'}])
+    client = flask_app.test_client()
+    with client.session_transaction() as sess:
+        sess['logged_in'] = True
+        sess['profile_id'] = 'p1'
+
+    def call(path, **kwargs):
+        response = client.post(path, **kwargs)
+        return {'status': response.status_code, 'body': response.get_json(),
+                'request_id': response.headers.get('X-Request-ID')}
+
+    results = {
+        'download': call('/api/download', json={'video_id': 'dQw4w9WgXcQ', 'type': 'audio'}),
+        'error': call('/api/download/cancel/missing', data=b'raw body'),
+    }
+    server.shutdown()
+    server.server_close()
+    results['unavailable'] = call('/api/download/cancel/abc')
+    results['received'] = received
+    print(json.dumps(results))
+''')
+
+
+@pytest.fixture(scope='module')
+def results(tmp_path_factory):
+    result = subprocess.run(
+        [sys.executable, '-c', FORWARD_SCRIPT, str(tmp_path_factory.mktemp('forwarding'))],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_web_role_forwards_download_requests(results):
+    download, error = results['received']
+
+    # 메서드/경로/본문이 그대로 전달되고 응답 상태와 본문이 그대로 돌아옴
+    assert download['method'] == 'POST'
+    assert download['path'] == '/api/download'
+    assert json.loads(download['body']) == {'video_id': 'dQw4w9WgXcQ', 'type': 'audio'}
+    assert results['download']['status'] == 201
+    assert results['download']['body'] == {'success': True, 'from': 'downloads'}
+    assert download['request_id'] == results['download']['request_id']
+
+    assert error['path'] == '/api/download/cancel/missing'
+    assert error['body'] == 'raw body'
+    assert results['error']['status'] == 404
+    assert results['error']['body'] == {'success': False, 'from': 'downloads'}
+
+
+def test_unreachable_download_service_returns_502(results):
+    assert results['unavailable']['status'] == 502
+    assert results['unavailable']['body']['success'] is False
@@ -0,0 +1,78 @@
+"""
+다운로드 작업 타이밍 테스트 (단계별 소요 시간, 집계) 및 Server-Timing 헤더
+"""
+from collections import deque
+
+import pytest
+
+import metrics
+
+
+@pytest.fixture
+def downloads(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'download_progress', {})
+    monkeypatch.setattr(app_module, 'download_metrics', deque(maxlen=10))
+    return app_module
+
+
+def timeline(**offsets):
+    return {'timings': {event: 100.0 + offset for event, offset in offsets.items()}}
+
+
+def test_download_phases_from_timeline(app_module):
+    progress = timeline(queued=0, extract_start=1, extract_end=3, transfer_start=3, transfer_end=7.5,
+                        postprocess_start=8, postprocess_end=10, finished=10)
+    assert app_module.get_download_phases(progress) == {
+        'queue_wait': 1.0,
+        'extraction': 2.0,
+        'transfer': 4.5,
+        'postprocess_wait': 0.5,
+        'postprocess': 2.0,
+        'total': 10.0,
+    }
+
+
+def test_missing_phases_are_none(app_module):
+    # 후처리 없이 끝난 작업
+    progress = timeline(queued=0, extract_start=0, extract_end=1, transfer_start=1, transfer_end=2, finished=2)
+    phases = app_module.get_download_phases(progress)
+    assert phases['postprocess'] is None
+    assert phases['postprocess_wait'] is None
+    assert phases['total'] == 2.0
+
+
+def test_summarize_durations(app_module):
+    assert app_module.summarize_durations([]) == {'count': 0}
+    summary = app_module.summarize_durations([None] + [float(i) for i in range(1, 21)])
+    assert summary == {'count': 20, 'avg': 10.5, 'p50': 11.0, 'p95': 19.0, 'max': 20.0}
+
+
+def test_metrics_endpoint_aggregates_finished_jobs(downloads):
+    for download_id, transfer in (('a', 2), ('b', 4)):
+        downloads.download_progress[download_id] = dict(
+            timeline(queued=0, extract_start=0, extract_end=1, transfer_start=1,
+                     transfer_end=1 + transfer, finished=1 + transfer),
+            status='completed', bytes=8 * transfer, throughput=8,
+        )
+        downloads.record_download_metrics(download_id)
+
+    with downloads.app.test_request_context():
+        result = downloads.api_download_metrics().get_json()
+    assert result['jobs'] == 2
+    assert result['status'] == {'completed': 2}
+    assert result['phases']['transfer'] == {'count': 2, 'avg': 3.0, 'p50': 2.0, 'p95': 4.0, 'max': 4.0}
+    assert result['bytes'] == 48
+    assert result['throughput'] == {'avg': 8, 'min': 8, 'max': 8}
+
+
+def test_format_server_timing():
+    value = metrics.format_server_timing({'extract': (0.25, 1), 'cache': (0.002, 3)}, 0.3)
+    assert value == 'extract;dur=250.0, cache;dur=2.0;desc="x3", total;dur=300.0'
+
+
+def test_server_timing_header(app_module):
+    response = app_module.app.test_client().get('/login')
+    entries = [entry.split(';')[0] for entry in response.headers['Server-Timing'].split(', ')]
+    # 템플릿 렌더링 구간과 전체 시간
+    assert 'render' in entries
+    assert entries[-1] == 'total'
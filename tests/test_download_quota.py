@@ -0,0 +1,84 @@
+"""
+다운로드 용량 관리 테스트 (크기 추정, 예약, 허용 여부, 정리)
+"""
+import os
+import time
+
+import pytest
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def downloads(app_module, monkeypatch):
+    """빈 다운로드 디렉토리와 작업 레지스트리, 100MB 한도"""
+    for name in os.listdir(app_module.DOWNLOAD_DIR):
+        os.remove(os.path.join(app_module.DOWNLOAD_DIR, name))
+    monkeypatch.setattr(app_module, 'download_progress', {})
+    monkeypatch.setitem(app_module.app.config, 'DOWNLOAD_DISK_QUOTA', 100 * MB)
+    monkeypatch.setitem(app_module.app.config, 'DOWNLOAD_JOB_RESERVE', 20 * MB)
+    return app_module
+
+
+def write_file(module, name, size, age=0):
+    path = os.path.join(module.DOWNLOAD_DIR, name)
+    with open(path, 'wb') as f:
+        f.truncate(size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_info_download_size_sums_requested_formats(app_module):
+    info = {
+        'filesize': None,
+        'duration': 100,
+        'requested_formats': [
+            {'format_id': '137', 'filesize': 30 * MB},
+            {'format_id': '140', 'filesize_approx': 2 * MB},
+        ],
+    }
+    assert app_module.info_download_size(info) == 32 * MB
+
+
+def test_info_download_size_uses_bitrate_and_unknown(app_module):
+    # 128kbps x 10초 = 160,000 바이트
+    assert app_module.info_download_size({'tbr': 128, 'duration': 10}) == 160000
+    assert app_module.info_download_size({'requested_formats': [{'filesize': 1}, {}]}) is None
+
+
+def test_admit_download_within_quota(downloads, monkeypatch):
+    # 정리 대상이 아닌 파일로 한도 계산만 확인
+    write_file(downloads, 'a.mp4', 50 * MB)
+    monkeypatch.setattr(downloads, 'get_protected_files', lambda: (set(), {'a.mp4'}))
+    assert downloads.admit_download(50 * MB)
+    assert not downloads.admit_download(51 * MB)
+
+
+def test_queued_jobs_do_not_reserve(downloads):
+    downloads.download_progress.update({
+        'running': {'status': 'downloading', 'reserved_bytes': 40 * MB},
+        'queued': {'status': 'queued', 'reserved_bytes': 40 * MB},
+        'done': {'status': 'completed', 'reserved_bytes': 40 * MB},
+    })
+    usage = downloads.get_download_usage()
+    assert usage['reserved_bytes'] == 40 * MB
+    assert downloads.admit_download(60 * MB)
+    assert not downloads.admit_download(61 * MB)
+
+
+def test_admit_download_sweeps_oldest_files(downloads):
+    write_file(downloads, 'old.mp4', 60 * MB, age=120)
+    write_file(downloads, 'new.mp4', 30 * MB, age=60)
+    assert downloads.admit_download(40 * MB)
+    assert sorted(os.listdir(downloads.DOWNLOAD_DIR)) == ['new.mp4']
+
+
+def test_sweep_keeps_pinned_files(downloads, monkeypatch):
+    monkeypatch.setitem(downloads.app.config, 'DOWNLOAD_ORPHAN_MAX_AGE', 60)
+    write_file(downloads, 'pinned.mp4', MB, age=3600)
+    write_file(downloads, 'orphan.mp4', MB, age=3600)
+    monkeypatch.setattr(downloads, 'get_protected_files', lambda: (set(), {'pinned.mp4'}))
+    downloads.sweep_download_dir()
+    assert sorted(os.listdir(downloads.DOWNLOAD_DIR)) == ['pinned.mp4']
+
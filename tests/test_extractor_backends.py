@@ -0,0 +1,33 @@
+"""
+추출기 팩토리 테스트 - EXTRACTOR_BACKEND 선택과 register_extractor()로 추가한 백엔드
+"""
+import pytest
+
+import extractors
+from extractors import FixtureExtractor, YtDlpExtractor, create_extractor, register_extractor
+
+
+def test_builtin_backends(tmp_path):
+    assert isinstance(create_extractor({}, None), YtDlpExtractor)
+    fixture = create_extractor({'EXTRACTOR_BACKEND': 'fixture', 'EXTRACTOR_FIXTURE_DIR': str(tmp_path)}, None)
+    assert isinstance(fixture, FixtureExtractor)
+    with pytest.raises(ValueError):
+        create_extractor({'EXTRACTOR_BACKEND': 'missing'}, None)
+
+
+def test_registered_backend_receives_config(monkeypatch):
+    monkeypatch.setattr(extractors, 'extractor_backends', {})
+    calls = []
+    register_extractor('custom', lambda config, load_module: calls.append(config) or 'custom-extractor')
+
+    config = {'EXTRACTOR_BACKEND': 'custom', 'EXTRACTOR_FIXTURE_LATENCY': 0.5}
+    assert create_extractor(config, None) == 'custom-extractor'
+    assert calls == [config]
+
+
+def test_benchmark_uses_synthetic_backend():
+    from benchmarks.routes import SyntheticExtractor
+
+    extractor = create_extractor({'EXTRACTOR_BACKEND': 'synthetic', 'EXTRACTOR_FIXTURE_LATENCY': 0.25}, None)
+    assert isinstance(extractor, SyntheticExtractor)
+    assert extractor.latency == 0.25
@@ -0,0 +1,47 @@
+"""
+영상 ID 정규화 테스트 (캐시 키로 쓰는 canonical_video_id)
+"""
+import pytest
+
+from extractors import canonical_video_id, canonical_video_url
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+
+
+@pytest.mark.parametrize('value', [
+    VIDEO_ID,
+    f'  {VIDEO_ID}  ',
+    f'https://www.youtube.com/watch?v={VIDEO_ID}',
+    f'https://www.youtube.com/watch?v={VIDEO_ID}&t=30s&list=PL123',
+    f'https://m.youtube.com/watch?feature=share&v={VIDEO_ID}',
+    f'https://music.youtube.com/watch?v={VIDEO_ID}',
+    f'http://youtube.com/watch?v={VIDEO_ID}',
+    f'www.youtube.com/watch?v={VIDEO_ID}',
+    f'https://youtu.be/{VIDEO_ID}',
+    f'https://youtu.be/{VIDEO_ID}?t=42',
+    f'https://www.youtube.com/shorts/{VIDEO_ID}',
+    f'https://www.youtube.com/embed/{VIDEO_ID}?autoplay=1',
+    f'https://www.youtube-nocookie.com/embed/{VIDEO_ID}',
+    f'https://www.youtube.com/live/{VIDEO_ID}',
+    f'https://www.youtube.com/v/{VIDEO_ID}',
+    canonical_video_url(VIDEO_ID),
+])
+def test_canonical_video_id(value):
+    assert canonical_video_id(value) == VIDEO_ID
+
+
+@pytest.mark.parametrize('value', [
+    None,
+    '',
+    'dQw4w9WgXc',
+    'dQw4w9WgXcQQ',
+    'https://www.youtube.com/playlist?list=PL1234567890',
+    'https://www.youtube.com/@channel',
+    'https://www.youtube.com/channel/UC1234567890',
+    'https://www.youtube.com/watch',
+    f'https://example.com/watch?v={VIDEO_ID}',
+    f'https://notyoutube.com/watch?v={VIDEO_ID}',
+    'https://youtu.be/',
+])
+def test_canonical_video_id_rejects_non_video(value):
+    assert canonical_video_id(value) is None
@@ -0,0 +1,74 @@
+"""
+홈 화면 선반 테스트 - 병렬 요청, 마감 시간, 늦게 도착한 결과의 캐시 재사용
+"""
+import threading
+import time
+
+import pytest
+
+
+def video(video_id):
+    return {'id': video_id, 'title': video_id, 'channel': 'test'}
+
+
+@pytest.fixture
+def shelves(app_module, monkeypatch):
+    """인기/관련 영상 추출을 대체 - release가 set될 때까지 blocked 선반은 응답하지 않음"""
+    state = {'blocked': set(), 'release': threading.Event()}
+
+    def trending(count, country=None):
+        if 'trending' in state['blocked']:
+            state['release'].wait(5)
+        return [video(f"trend-{country}-{i}") for i in range(count)]
+
+    def related(video_id, max_results=12, title=None, channel=None):
+        if 'related' in state['blocked']:
+            state['release'].wait(5)
+        return [video(f"{video_id}-rel{i}") for i in range(3)] + [video('seen')]
+
+    monkeypatch.setattr(app_module, 'get_trending_videos', trending)
+    monkeypatch.setattr(app_module, 'get_related_videos', related)
+    monkeypatch.setitem(app_module.app.config, 'HOME_SHELF_DEADLINE', 0.2)
+    yield state
+    state['release'].set()
+
+
+def build(app_module, history, country):
+    with app_module.app.app_context():
+        return app_module.build_home_shelves(history, country)
+
+
+def test_shelves_within_deadline(app_module, shelves):
+    result = build(app_module, [video('seen'), video('fast1')], 'KR-fast')
+    assert result['pending_shelves'] == []
+    assert len(result['trending']) == 8
+    ids = {v['id'] for v in result['recommended']}
+    # 이미 본 영상은 추천에서 제외
+    assert ids == {f"{source}-rel{i}" for source in ('seen', 'fast1') for i in range(3)}
+
+
+def test_slow_shelves_become_placeholders(app_module, shelves):
+    shelves['blocked'] = {'trending', 'related'}
+    started = time.perf_counter()
+    result = build(app_module, [video('slow1')], 'KR-slow')
+    assert time.perf_counter() - started < 2
+    assert result['trending'] == []
+    assert result['recommended'] == []
+    assert result['pending_shelves'] == ['trending', 'recommended']
+
+
+def test_late_results_are_cached_for_next_request(app_module, shelves):
+    shelves['blocked'] = {'trending'}
+    assert build(app_module, [], 'KR-late')['pending_shelves'] == ['trending']
+
+    # 마감 이후에 도착한 결과도 캐시되어 다음 요청은 기다리지 않고 사용
+    shelves['release'].set()
+    with app_module.app.app_context():
+        for _ in range(50):
+            if app_module.cache.get(app_module.shelf_cache_key('trending', 'KR-late')):
+                break
+            time.sleep(0.05)
+    shelves['release'].clear()
+    result = build(app_module, [], 'KR-late')
+    assert result['pending_shelves'] == []
+    assert result['trending'][0]['id'] == 'trend-KR-late-0'
@@ -0,0 +1,45 @@
+"""
+응답 후처리 테스트 - 약한 ETag/304, Cache-Control, Accept-Encoding 협상
+"""
+import gzip
+
+import pytest
+
+
+@pytest.fixture
+def client(app_module, monkeypatch):
+    # brotli 설치 여부와 관계없이 gzip 경로를 확인
+    monkeypatch.setattr(app_module, 'BROTLI_AVAILABLE', False)
+    return app_module.app.test_client()
+
+
+def test_html_gets_weak_etag_and_304(client):
+    response = client.get('/login')
+    assert response.status_code == 200
+    etag, weak = response.get_etag()
+    assert etag and weak
+    assert response.cache_control.private and response.cache_control.no_cache
+
+    cached = client.get('/login', headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+    assert cached.data == b''
+
+
+def test_explicit_cache_policy_is_kept(client):
+    response = client.get('/static/sw.js')
+    assert response.get_etag()[0]
+    assert response.cache_control.no_cache
+    assert not response.cache_control.private
+
+
+def test_gzip_negotiation(client):
+    plain = client.get('/login')
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    compressed = client.get('/login', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == plain.data
+
+    identity = client.get('/login', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in identity.headers
@@ -0,0 +1,48 @@
+"""
+부하 테스트 하네스 테스트 (세션 비율, 결과 집계, 합성 서버로 짧게 실행)
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.loadtest import parse_mix, summarize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_parse_mix():
+    assert parse_mix('viewer=70,scroller=20,downloader') == [
+        ('viewer', 70.0), ('scroller', 20.0), ('downloader', 1.0)]
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix('viewer=1,lurker=2')
+
+
+def test_summarize_counts_errors():
+    samples = [(0.01 * i, i % 4 != 0) for i in range(1, 101)]
+    stats = summarize(samples, elapsed=10)
+    assert stats['requests'] == 100
+    assert stats['rps'] == 10.0
+    assert stats['error_rate'] == 0.25
+    assert stats['max_ms'] == 1000.0
+    assert summarize([(0.2, True)], elapsed=1)['p99_ms'] == 200.0
+
+
+def test_loadtest_against_synthetic_server():
+    result = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.loadtest', 'run', '--users', '3', '--stage-duration', '2',
+         '--ramp-seconds', '0.3', '--time-scale', '0.05', '--size', 'small', '--profiles', '1',
+         '--latency', '0', '--download-seconds', '1', '--timeout', '10', '--json'],
+        cwd=ROOT, capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout)
+    stage, = report['stages']
+    assert stage['users'] == 3
+    # 모든 세션은 로그인 후 프로필 전환으로 시작
+    assert stage['endpoints']['login']['requests'] == 3
+    assert stage['endpoints']['profile_switch']['requests'] == 3
+    assert stage['total']['error_rate'] == 0
@@ -0,0 +1,87 @@
+"""
+합성 프로필 생성기 테스트 (결정성, 크기, JSON/SQLite 출력)
+"""
+import argparse
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from benchmarks.profiles import (
+    PROFILE_SIZES, STORE_FILES, add_size_arguments, generate_profile, resolve_size, write_json, write_sqlite
+)
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+SMALL = PROFILE_SIZES['small']
+
+
+@pytest.fixture(scope='module')
+def generated():
+    return generate_profile(0, SMALL, seed=1, now=NOW)
+
+
+def test_same_seed_gives_same_profile(generated):
+    assert generate_profile(0, SMALL, seed=1, now=NOW) == generated
+    assert generate_profile(0, SMALL, seed=2, now=NOW) != generated
+
+
+def test_profile_sizes(generated):
+    assert len(generated['history']) == SMALL['history']
+    assert len(generated['channels']) == SMALL['channels']
+    assert len(generated['playlists']) == SMALL['playlists']
+    assert len(generated['watch_later']) == SMALL['watch_later']
+    assert len(generated['progress']) == SMALL['progress']
+    assert len(generated['search_history']) == SMALL['search_history']
+
+
+def test_profile_values_look_like_app_data(generated):
+    video_ids = [v['id'] for v in generated['history'] + generated['watch_later']]
+    assert len(set(video_ids)) == len(video_ids)
+    assert all(len(video_id) == 11 for video_id in video_ids)
+
+    playlist_ids = [pl['id'] for pl in generated['playlists']]
+    assert len(set(playlist_ids)) == len(playlist_ids)
+    assert all(pl_id.startswith('pl_') for pl_id in playlist_ids)
+
+    # 앱은 5% ~ 95% 진행률만 저장
+    assert all(5 <= p['percentage'] <= 95 for p in generated['progress'])
+    # 최근 항목이 앞에 오도록 시각이 감소
+    watched = [h['watched_at'] for h in generated['history']]
+    assert watched == sorted(watched, reverse=True)
+
+    queries = [s['query'].lower() for s in generated['search_history']]
+    assert len(set(queries)) == len(queries)
+
+
+def test_size_arguments_override_preset():
+    parser = argparse.ArgumentParser()
+    add_size_arguments(parser)
+    size = resolve_size(parser.parse_args(['--size', 'large', '--watch-later', '5']))
+    assert size == dict(PROFILE_SIZES['large'], watch_later=5)
+
+
+def test_write_json_uses_app_file_names(generated, tmp_path):
+    write_json(str(tmp_path), [generated])
+    profile_id = generated['profile']['id']
+    with open(tmp_path / 'profiles.json', encoding='utf-8') as f:
+        assert json.load(f) == [generated['profile']]
+    for store, filename in STORE_FILES.items():
+        with open(tmp_path / filename.format(profile_id), encoding='utf-8') as f:
+            assert json.load(f) == generated[store]
+
+
+def test_write_sqlite_rows(generated, tmp_path):
+    db_path = tmp_path / 'bench.db'
+    write_sqlite(str(db_path), [generated])
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        counts = {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+    finally:
+        conn.close()
+    assert sum(counts.values()) == (
+        1 + SMALL['history'] + SMALL['channels'] + SMALL['playlists']
+        + sum(len(pl['videos']) for pl in generated['playlists'])
+        + SMALL['watch_later'] + SMALL['progress'] + SMALL['search_history']
+    )
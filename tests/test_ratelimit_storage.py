@@ -0,0 +1,114 @@
+"""
+SQLite Rate Limit 저장소 테스트 - limits 전략을 통해 카운터/슬라이딩 윈도우/프로세스 간 공유 확인
+"""
+import os
+import subprocess
+import sys
+import textwrap
+from types import SimpleNamespace
+
+import pytest
+from limits import RateLimitItemPerMinute
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+
+import ratelimit_storage
+from ratelimit_storage import SQLiteStorage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INCR_SCRIPT = textwrap.dedent('''
+    import sys
+    from ratelimit_storage import SQLiteStorage
+    storage = SQLiteStorage(sys.argv[1])
+    for _ in range(3):
+        storage.incr('shared', 60)
+''')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 윈도우 경계에 맞춘 고정 시각 (60초 윈도우의 시작)
+    now = SimpleNamespace(value=600.0)
+    monkeypatch.setattr(ratelimit_storage, 'time', SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def uri(tmp_path):
+    # sqlite:////절대경로
+    return f"sqlite:///{tmp_path / 'ratelimit.db'}"
+
+
+@pytest.fixture
+def limiter(uri):
+    return SlidingWindowCounterRateLimiter(SQLiteStorage(uri))
+
+
+def test_scheme_is_registered(uri):
+    storage = storage_from_string(uri)
+    assert isinstance(storage, SQLiteStorage)
+    assert storage.check()
+
+
+def test_incr_get_and_expiry(uri, clock):
+    storage = SQLiteStorage(uri)
+    assert storage.incr('key', 60) == 1
+    assert storage.incr('key', 60, amount=2) == 3
+    assert storage.get('key') == 3
+    assert storage.get_expiry('key') == 660.0
+
+    clock.value = 660.0
+    assert storage.get('key') == 0
+    assert storage.incr('key', 60) == 1
+
+
+def test_sliding_window_weights_previous_window(limiter, clock):
+    item = RateLimitItemPerMinute(2)
+    assert limiter.hit(item, 'user')
+    assert limiter.hit(item, 'user')
+    assert not limiter.hit(item, 'user')
+    assert limiter.get_window_stats(item, 'user').remaining == 0
+
+    # 다음 윈도우의 절반 지점: 이전 윈도우 2회의 절반(1회)만 반영됨
+    clock.value = 690.0
+    assert limiter.get_window_stats(item, 'user').remaining == 1
+    assert limiter.hit(item, 'user')
+    assert not limiter.hit(item, 'user')
+
+    # 다음 윈도우 시작 시점: 직전 윈도우의 1회는 온전히 반영되고 그 이전 윈도우는 빠짐
+    clock.value = 720.0
+    assert limiter.get_window_stats(item, 'user').remaining == 1
+    clock.value = 780.0
+    assert limiter.get_window_stats(item, 'user').remaining == 2
+
+
+def test_counters_shared_across_processes(uri, limiter):
+    subprocess.run([sys.executable, '-c', INCR_SCRIPT, uri], cwd=ROOT, check=True, timeout=60)
+    assert SQLiteStorage(uri).get('shared') == 3
+
+    item = RateLimitItemPerMinute(1)
+    assert limiter.hit(item, 'user')
+    # 새 연결(다른 워커)에서도 같은 카운터를 봄
+    other = SlidingWindowCounterRateLimiter(SQLiteStorage(uri))
+    assert not other.hit(item, 'user')
+
+
+def test_clear_and_reset(uri, limiter, clock):
+    item = RateLimitItemPerMinute(1)
+    assert limiter.hit(item, 'a')
+    assert limiter.hit(item, 'b')
+    assert not limiter.hit(item, 'a')
+
+    limiter.clear(item, 'a')
+    assert limiter.hit(item, 'a')
+    assert not limiter.hit(item, 'b')
+
+    storage = limiter.storage
+    storage.incr('plain', 60)
+    storage.clear('plain')
+    assert storage.get('plain') == 0
+
+    assert storage.reset() == 2
+    assert limiter.hit(item, 'a')
+    assert limiter.hit(item, 'b')
@@ -0,0 +1,121 @@
+"""
+추출 결과 캐시 테스트 (오류 분류, 실패 재사용과 백오프)
+"""
+import time
+
+import pytest
+from cachelib import SimpleCache
+
+from config import Config
+from extractors import ExtractorError, classify_error
+from result_cache import ZERO_TTL_RECORD_TIMEOUT, CachedFailure, ResultCache
+
+
+@pytest.mark.parametrize('message, kind', [
+    ("Sign in to confirm you're not a bot", 'bot_check'),
+    ('Sign in to confirm your age. This video may be inappropriate for some users.', 'unavailable'),
+    ('HTTP Error 429: Too Many Requests', 'rate_limited'),
+    ('This video is not available in your country', 'geo_blocked'),
+    ('Video unavailable. This video is private', 'unavailable'),
+    ('Read timed out', 'network'),
+    ('HTTP Error 503: Service Unavailable', 'network'),
+    ('something else', 'unknown'),
+])
+def test_classify_error(message, kind):
+    assert classify_error(ExtractorError(message)) == kind
+
+
+def test_classify_error_exception_types():
+    assert classify_error(TimeoutError()) == 'network'
+    assert classify_error(ConnectionResetError()) == 'network'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr('result_cache.time.time', clock)
+    return clock
+
+
+@pytest.fixture
+def results():
+    config = {
+        'NEGATIVE_CACHE_TTLS': dict(Config.NEGATIVE_CACHE_TTLS),
+        'NEGATIVE_CACHE_MAX_TTL': 100,
+    }
+    return ResultCache(SimpleCache(), config)
+
+
+def failing(message):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        raise ExtractorError(message)
+    return compute, calls
+
+
+def test_negative_ttl_backoff(results):
+    assert [results.negative_ttl('bot_check', n) for n in (1, 2, 3, 4)] == [30, 60, 100, 100]
+    assert results.negative_ttl('network', 5) == 0
+    assert results.negative_ttl('something', 1) == results.negative_ttl('unknown', 1)
+
+
+def test_success_is_cached(results):
+    assert results.get('search', 'q', lambda: ['a'], timeout=60) == ['a']
+    assert results.get('search', 'q', lambda: pytest.fail('recomputed'), timeout=60) == ['a']
+
+
+def test_failure_reused_until_retry_at(results, clock):
+    compute, calls = failing("Sign in to confirm you're not a bot")
+    with pytest.raises(ExtractorError):
+        results.get('playlist', 'p', compute)
+    with pytest.raises(CachedFailure) as e:
+        results.get('playlist', 'p', compute)
+    assert e.value.kind == 'bot_check'
+    assert e.value.retry_after == 30
+    assert len(calls) == 1
+
+    # 재시도 시각이 지나면 다시 추출하고, 연속 실패라 TTL이 두 배가 됨
+    clock.now += 31
+    with pytest.raises(ExtractorError):
+        results.get('playlist', 'p', compute)
+    assert len(calls) == 2
+    with pytest.raises(CachedFailure) as e:
+        results.get('playlist', 'p', compute)
+    assert e.value.retry_after == 60
+
+
+def test_success_clears_failure(results, clock):
+    compute, _ = failing('HTTP Error 429')
+    with pytest.raises(ExtractorError):
+        results.get('search', 'q', compute)
+    clock.now += 61
+    assert results.get('search', 'q', lambda: ['a'], timeout=60) == ['a']
+    assert results.cache.get(results.failure_key('search', 'q')) is None
+
+
+def test_zero_ttl_failure_always_retries(results):
+    compute, calls = failing('Read timed out')
+    for _ in range(2):
+        with pytest.raises(ExtractorError):
+            results.get('video_info', 'v', compute)
+    assert len(calls) == 2
+
+    # 연속 실패 수만 잠깐 기억 (NEGATIVE_CACHE_MAX_TTL 동안 남기지 않음)
+    expires, _ = results.cache._cache[results.failure_key('video_info', 'v')]
+    assert expires - time.time() <= ZERO_TTL_RECORD_TIMEOUT
+    assert results.cache.get(results.failure_key('video_info', 'v'))['failures'] == 2
+
+
+def test_uncached_path_skips_result_lookup(results):
+    results.cache.set(results.result_key('channel', 'c'), ['stale'])
+    assert results.get('channel', 'c', lambda: ['fresh'], cached=False) == ['fresh']
@@ -0,0 +1,40 @@
+"""
+스트리밍 페이지 테스트 - 추출 전에 <head>와 네비게이션이 먼저 나가는지 확인
+"""
+import json
+
+import pytest
+
+
+@pytest.fixture
+def client(app_module):
+    app_module.save_profiles([{'id': 'p1', 'name': 'test'}])
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+        session['profile_id'] = 'p1'
+    return client
+
+
+def test_channel_shell_flushes_before_extraction(app_module, client, monkeypatch):
+    events = []
+
+    def fake_channel_videos(channel_url, max_videos=30):
+        events.append('load')
+        return {'channel': '말근 채널', 'videos': []}
+
+    monkeypatch.setattr(app_module, 'get_channel_videos', fake_channel_videos)
+
+    response = client.get('/channel/UC123', buffered=False)
+    html = ''
+    for chunk in response.response:
+        html += chunk.decode() if isinstance(chunk, bytes) else chunk
+        if '</head>' in html:
+            break
+    assert events == []
+    assert '<title>채널 - MalgeunTube</title>' in html
+
+    html += ''.join(c.decode() if isinstance(c, bytes) else c for c in response.response)
+    response.close()
+    assert events == ['load']
+    assert f"document.title = {json.dumps('말근 채널 - MalgeunTube')};" in html
@@ -0,0 +1,62 @@
+"""
+watch 페이지 테스트 - 관련 영상/원격 플레이리스트/시청 기록을 기다리지 않고 렌더링
+"""
+import threading
+
+import pytest
+
+VIDEO_ID = 'dQw4w9WgXcQ'
+
+
+@pytest.fixture
+def client(app_module):
+    app_module.save_profiles([{'id': 'p1', 'name': 'test'}])
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+        session['profile_id'] = 'p1'
+    return client
+
+
+@pytest.fixture
+def sidebar(app_module, monkeypatch):
+    """영상 정보는 바로 반환하고, 관련 영상은 release될 때까지 응답하지 않음"""
+    state = {'release': threading.Event(), 'history': [], 'playlist_calls': []}
+
+    def video_info(url):
+        return {'id': VIDEO_ID, 'title': '테스트 영상', 'channel': 'test', 'channel_id': 'UC1',
+                'thumbnail': '', 'duration': 60, 'description': '', 'formats': []}
+
+    def related(video_id, max_results=12, title=None, channel=None):
+        state['release'].wait(5)
+        return [{'id': 'related0001', 'title': 'related'}]
+
+    monkeypatch.setattr(app_module, 'get_video_info', video_info)
+    monkeypatch.setattr(app_module, 'get_related_videos', related)
+    monkeypatch.setattr(app_module, 'get_playlist_info', lambda url: state['playlist_calls'].append(url))
+    monkeypatch.setattr(app_module, 'add_to_history', lambda entry, path: state['history'].append(entry['id']))
+    with app_module.app.app_context():
+        app_module.cache.delete(app_module.shelf_cache_key('related', VIDEO_ID))
+    yield state
+    state['release'].set()
+
+
+def test_watch_renders_without_sidebar_data(app_module, client, sidebar):
+    response = client.get(f"/watch?v={VIDEO_ID}&list=PLremote")
+    html = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert '테스트 영상' in html
+    # 관련 영상은 아직 도착하지 않았고 원격 플레이리스트는 페이지에서 API로 요청
+    assert 'related0001' not in html
+    assert sidebar['playlist_calls'] == []
+    assert 'PLremote' in html
+
+    app_module.background_executor.submit(lambda: None).result(timeout=5)
+    assert sidebar['history'] == [VIDEO_ID]
+
+
+def test_related_api_waits_for_prefetched_shelf(client, sidebar):
+    assert client.get(f"/watch?v={VIDEO_ID}").status_code == 200
+    sidebar['release'].set()
+    result = client.get(f"/api/related/{VIDEO_ID}").get_json()
+    assert result == {'success': True, 'videos': [{'id': 'related0001', 'title': 'related'}]}